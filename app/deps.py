@@ -8,12 +8,12 @@ from typing import Annotated
 
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.error_domain import AppError
 from domains.user_domain import UserRole
 from infrastructures.db.orm.orm_deps import get_db
-from infrastructures.db.orm.user_orm import MetaUsersORM
 from services.auth_service import AuthService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
@@ -24,7 +24,7 @@ _auth_service = AuthService()
 async def get_current_user(
         token: Annotated[str | None, Depends(oauth2_scheme)],
         db: AsyncSession = Depends(get_db),
-) -> MetaUsersORM:
+) -> Row:
     if token is None or token.strip() == "":
         raise AppError(code="auth.missing_token", message="Missing bearer token", http_status=401)
 
@@ -32,8 +32,8 @@ async def get_current_user(
 
 
 async def get_current_admin(
-        current_user: Annotated[MetaUsersORM, Depends(get_current_user)],
-) -> MetaUsersORM:
+        current_user: Annotated[Row, Depends(get_current_user)],
+) -> Row:
     if current_user.role != UserRole.admin.value:
         raise AppError(code="auth.not_admin", message="Admin privileges required", http_status=403)
     return current_user
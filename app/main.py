@@ -12,11 +12,13 @@ from starlette.responses import JSONResponse, RedirectResponse
 from app.routers import auth_router, rag_router, voc_router
 from app.routers import llm_models_router
 from domains.error_domain import AppError
+from domains.llm_model_domain import LlmProvider
 from infrastructures.db.orm.orm_base import AsyncSessionFactory, init_db, close_db_engine
-from infrastructures.llm.provider_registry import close_provider_registry
+from infrastructures.llm.provider_registry import close_provider_registry, warm_provider_registry
 from infrastructures.db.repository.rag_repository import RagRepository
+from infrastructures.index.index_router import create_es_index
 from infrastructures.vconfig import vconfig
-from infrastructures.vlogger import vlogger
+from infrastructures.vlogger import init_logging, vlogger
 from services.auth_service import AuthService
 
 
@@ -42,17 +44,31 @@ async def lifespan(_app: FastAPI):
                                         enabled=1, status=1)
     vlogger.info("default space ensured")
 
+    # 4) 预热本地 LLM 连接池（Ollama 未配置时跳过）
+    if vconfig.enable_llm and str(vconfig.ollama_base_url or "").strip():
+        await warm_provider_registry([LlmProvider.ollama.value])
+        vlogger.info("llm connection pools warmed")
+
+    # 5) 预热 ES 客户端与默认 space 检索路径（首个检索不再承担驱动加载/建连/index 存在性检查）
+    if vconfig.es_enabled and vconfig.es_prewarm:
+        if await create_es_index().warmup("default"):
+            vlogger.info("elasticsearch warmed")
+
     try:
         yield
     finally:
         # Best-effort shutdown cleanup: close provider HTTP connection pools.
         await close_provider_registry()
+        if vconfig.es_enabled:
+            await create_es_index().close()
         # Close DB engine to release connections cleanly.
         await close_db_engine()
         vlogger.info("application shutdown")
 
 
 def create_app() -> FastAPI:
+    init_logging(vconfig.log_level, fmt=vconfig.log_format)
+
     app = FastAPI(
         title="Multi-Agent Hub",
         version="0.1.0",
@@ -9,11 +9,11 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, Field
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.deps import get_current_user
 from infrastructures.db.orm.orm_deps import get_db
-from infrastructures.db.orm.user_orm import MetaUsersORM
 from services.auth_service import AuthService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -70,7 +70,7 @@ async def login_json(
 
 @router.get("/me", response_model=MeResponse)
 async def get_me(
-        current_user: Annotated[MetaUsersORM, Depends(get_current_user)],
+        current_user: Annotated[Row, Depends(get_current_user)],
 ) -> MeResponse:
     return MeResponse(
         user_id=current_user.user_id,
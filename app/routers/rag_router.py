@@ -15,11 +15,9 @@ from domains.error_domain import AppError
 from domains.rag_domain import SearchResponse, SearchRequest
 from infrastructures.db.orm.orm_deps import get_db
 from infrastructures.db.repository.rag_repository import RagRepository
-from infrastructures.embedding.embedder_router import create_embedder
-from infrastructures.index.index_router import create_milvus_index, create_es_index
 from infrastructures.storage.storage_router import get_storage
 from services.rag.rag_service import RagService
-from services.rag.search_service import SearchService
+from services.rag.search_service import create_search_service
 
 router = APIRouter(prefix="/rag", tags=["rag"])
 
@@ -27,20 +25,6 @@ _repo = RagRepository()
 _storage = get_storage()
 _service = RagService(repo=_repo, storage=_storage)
 
-_search_service: Optional[SearchService] = None
-
-
-def _get_search_service() -> SearchService:
-    global _search_service
-    if _search_service is None:
-        _search_service = SearchService(
-            repo=_repo,
-            embedder=create_embedder(),
-            milvus_index=create_milvus_index(),
-            es_index=create_es_index(),
-        )
-    return _search_service
-
 
 class SpaceResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -300,4 +284,4 @@ async def search(
         db: AsyncSession = Depends(get_db),
         _admin=Depends(get_current_admin),
 ) -> SearchResponse:
-    return await _get_search_service().search(db, req=body)
+    return await create_search_service().search(db, req=body)
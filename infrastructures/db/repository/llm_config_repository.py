@@ -4,7 +4,7 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Optional, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -39,13 +39,13 @@ class LlmConfigRepository:
         enabled_only: bool = True,
         limit: int = 500,
         offset: int = 0,
-    ) -> List[LlmModelProfilesORM]:
+    ) -> Sequence[LlmModelProfilesORM]:
         stmt = select(LlmModelProfilesORM)
         if enabled_only:
             stmt = stmt.where(LlmModelProfilesORM.is_enabled == 1)
         stmt = stmt.order_by(LlmModelProfilesORM.profile_id.asc()).offset(int(offset)).limit(int(limit))
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.scalars().all()
 
     @staticmethod
     async def get_model_profile(db: AsyncSession, *, profile_id: str) -> Optional[LlmModelProfilesORM]:
@@ -63,10 +63,10 @@ class LlmConfigRepository:
         *,
         limit: int = 200,
         offset: int = 0,
-    ) -> List[LlmFlowPoliciesORM]:
+    ) -> Sequence[LlmFlowPoliciesORM]:
         stmt = select(LlmFlowPoliciesORM).order_by(LlmFlowPoliciesORM.flow_code.asc()).offset(int(offset)).limit(int(limit))
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.scalars().all()
 
     @staticmethod
     async def get_flow_policy(db: AsyncSession, *, flow_code: str) -> Optional[LlmFlowPoliciesORM]:
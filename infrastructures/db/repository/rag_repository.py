@@ -5,15 +5,51 @@
 from __future__ import annotations
 
 import hashlib
-from typing import Optional, List, Dict, Any, Sequence
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 
-from sqlalchemy import select, update, or_, and_, delete
+from sqlalchemy import select, update, or_, and_, delete, insert, Row, bindparam
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.rag_domain import DocumentStatus, JobStatus
 from infrastructures.db.orm.rag_orm import MetaRagSpacesORM, MetaRagDocumentsORM, OpsRagIngestJobsORM, StgRagChunksORM
-from infrastructures.db.repository.repository_base import now_ts
+from infrastructures.db.repository.repository_base import chunked, now_ts
+
+
+# Hot point lookups, built once at import; calls only bind parameters.
+_STMT_SPACE = select(MetaRagSpacesORM).where(MetaRagSpacesORM.kb_space == bindparam("kb_space"))
+_STMT_DOCUMENT = select(MetaRagDocumentsORM).where(MetaRagDocumentsORM.document_id == bindparam("document_id"))
+_STMT_LIVE_DOCUMENT = _STMT_DOCUMENT.where(MetaRagDocumentsORM.status != DocumentStatus.DELETED)
+_STMT_JOB = select(OpsRagIngestJobsORM).where(OpsRagIngestJobsORM.job_id == bindparam("job_id"))
+_STMT_JOB_WITH_DOCUMENT = (
+    select(OpsRagIngestJobsORM, MetaRagDocumentsORM)
+    .outerjoin(MetaRagDocumentsORM, MetaRagDocumentsORM.document_id == OpsRagIngestJobsORM.document_id)
+    .where(OpsRagIngestJobsORM.job_id == bindparam("job_id"))
+)
+
+# id 列表查询：expanding bindparam 让语句结构与 id 个数无关，编译结果只缓存一份
+_STMT_CHUNKS_BY_IDS = select(StgRagChunksORM).where(
+    StgRagChunksORM.chunk_id.in_(bindparam("chunk_ids", expanding=True))
+)
+_STMT_SPACE_CHUNKS_BY_IDS = _STMT_CHUNKS_BY_IDS.where(StgRagChunksORM.kb_space == bindparam("kb_space"))
+_STMT_SEARCHABLE_CHUNKS = (
+    select(
+        StgRagChunksORM.chunk_id,
+        StgRagChunksORM.document_id,
+        StgRagChunksORM.kb_space,
+        StgRagChunksORM.index_version,
+        StgRagChunksORM.content,
+        StgRagChunksORM.locator,
+    )
+    .join(MetaRagDocumentsORM, MetaRagDocumentsORM.document_id == StgRagChunksORM.document_id)
+    .where(StgRagChunksORM.chunk_id.in_(bindparam("chunk_ids", expanding=True)))
+    .where(StgRagChunksORM.kb_space == bindparam("kb_space"))
+    .where(MetaRagDocumentsORM.kb_space == bindparam("kb_space"))
+    .where(MetaRagDocumentsORM.status == int(DocumentStatus.INDEXED))
+    .where(MetaRagDocumentsORM.status != int(DocumentStatus.DELETED))
+    .where(MetaRagDocumentsORM.active_index_version.is_not(None))
+    .where(StgRagChunksORM.index_version == MetaRagDocumentsORM.active_index_version)
+)
 
 
 class RagRepository:
@@ -42,8 +78,7 @@ class RagRepository:
 
     @staticmethod
     async def get_space(db: AsyncSession, *, kb_space: str) -> Optional[MetaRagSpacesORM]:
-        stmt = select(MetaRagSpacesORM).where(MetaRagSpacesORM.kb_space == kb_space)
-        res = await db.execute(stmt)
+        res = await db.execute(_STMT_SPACE, {"kb_space": kb_space})
         return res.scalars().first()
 
     @staticmethod
@@ -54,7 +89,7 @@ class RagRepository:
             status: Optional[int] = None,
             limit: int = 50,
             offset: int = 0,
-    ) -> List[MetaRagSpacesORM]:
+    ) -> Sequence[MetaRagSpacesORM]:
         stmt = select(MetaRagSpacesORM)
         if enabled is not None:
             stmt = stmt.where(MetaRagSpacesORM.enabled == int(enabled))
@@ -63,7 +98,7 @@ class RagRepository:
         stmt = stmt.offset(int(offset)).limit(int(limit))
 
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.scalars().all()
 
     @staticmethod
     async def update_space(
@@ -138,10 +173,8 @@ class RagRepository:
             document_id: int,
             include_deleted: bool = False,
     ) -> Optional[MetaRagDocumentsORM]:
-        stmt = select(MetaRagDocumentsORM).where(MetaRagDocumentsORM.document_id == int(document_id))
-        if not include_deleted:
-            stmt = stmt.where(MetaRagDocumentsORM.status != DocumentStatus.DELETED)
-        res = await db.execute(stmt)
+        stmt = _STMT_DOCUMENT if include_deleted else _STMT_LIVE_DOCUMENT
+        res = await db.execute(stmt, {"document_id": int(document_id)})
         return res.scalars().first()
 
     @staticmethod
@@ -153,8 +186,10 @@ class RagRepository:
             statuses: Optional[List[int]] = None,
             limit: int = 50,
             offset: int = 0,
-    ) -> List[MetaRagDocumentsORM]:
-        stmt = select(MetaRagDocumentsORM)
+    ) -> Sequence[Row]:
+        """Read-only listing: plain column rows (attribute access), no ORM instances."""
+
+        stmt = select(*MetaRagDocumentsORM.__table__.c)
 
         if kb_space is not None:
             stmt = stmt.where(MetaRagDocumentsORM.kb_space == kb_space)
@@ -168,7 +203,7 @@ class RagRepository:
 
         stmt = stmt.offset(int(offset)).limit(int(limit))
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.all()
 
     @staticmethod
     async def update_document_status(
@@ -211,12 +246,15 @@ class RagRepository:
             *,
             document_id: int,
             filename: str,
+            include_deleted: bool = True,
     ) -> int:
         stmt = (
             update(MetaRagDocumentsORM)
             .where(MetaRagDocumentsORM.document_id == int(document_id))
             .values(filename=str(filename), updated_at=now_ts())
         )
+        if not include_deleted:
+            stmt = stmt.where(MetaRagDocumentsORM.status != DocumentStatus.DELETED)
         res = await db.execute(stmt)
         return int(res.rowcount or 0)
 
@@ -263,10 +301,23 @@ class RagRepository:
 
     @staticmethod
     async def get_job(db: AsyncSession, *, job_id: int) -> Optional[OpsRagIngestJobsORM]:
-        stmt = select(OpsRagIngestJobsORM).where(OpsRagIngestJobsORM.job_id == int(job_id))
-        res = await db.execute(stmt)
+        res = await db.execute(_STMT_JOB, {"job_id": int(job_id)})
         return res.scalars().first()
 
+    @staticmethod
+    async def get_job_with_document(
+            db: AsyncSession,
+            *,
+            job_id: int,
+    ) -> Tuple[Optional[OpsRagIngestJobsORM], Optional[MetaRagDocumentsORM]]:
+        """
+        job + 其文档一次取回（LEFT JOIN，文档含已删除），供 worker 执行路径省去第二次查询
+        """
+        row = (await db.execute(_STMT_JOB_WITH_DOCUMENT, {"job_id": int(job_id)})).first()
+        if row is None:
+            return None, None
+        return row[0], row[1]
+
     @staticmethod
     async def get_job_by_idempotency_key(db: AsyncSession, *, idempotency_key: str) -> Optional[OpsRagIngestJobsORM]:
         stmt = select(OpsRagIngestJobsORM).where(OpsRagIngestJobsORM.idempotency_key == idempotency_key)
@@ -282,8 +333,10 @@ class RagRepository:
             statuses: Optional[List[int]] = None,
             limit: int = 50,
             offset: int = 0,
-    ) -> List[OpsRagIngestJobsORM]:
-        stmt = select(OpsRagIngestJobsORM)
+    ) -> Sequence[Row]:
+        """Read-only listing: plain column rows (attribute access), no ORM instances."""
+
+        stmt = select(*OpsRagIngestJobsORM.__table__.c)
 
         if kb_space is not None:
             stmt = stmt.where(OpsRagIngestJobsORM.kb_space == kb_space)
@@ -295,7 +348,7 @@ class RagRepository:
 
         stmt = stmt.order_by(OpsRagIngestJobsORM.job_id.desc()).offset(int(offset)).limit(int(limit))
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.all()
 
     @staticmethod
     async def allocate_index_version(db: AsyncSession, *, document_id: int) -> int:
@@ -322,8 +375,12 @@ class RagRepository:
             kb_space: str,
             pipeline_version: str = "v1",
             max_retries: int = 3,
+            index_version: Optional[int] = None,
     ) -> OpsRagIngestJobsORM:
-        index_version = await self.allocate_index_version(db, document_id=document_id)
+        # Callers that already hold the document row (e.g. just inserted it) pass
+        # index_version and skip the SELECT .. FOR UPDATE round-trip.
+        if index_version is None:
+            index_version = await self.allocate_index_version(db, document_id=document_id)
         idem = self._make_idempotency_key(
             document_id=document_id, pipeline_version=pipeline_version, index_version=index_version
         )
@@ -371,8 +428,13 @@ class RagRepository:
             ),
         )
 
+        # The leading status IN (...) is implied by `claimable`; it gives MySQL a range on
+        # ix_rij_lock (status, locked_until) so the poll only touches live jobs instead of
+        # walking the PK through every SUCCEEDED/CANCELLED row to satisfy ORDER BY job_id.
         stmt = (
             select(OpsRagIngestJobsORM)
+            .with_hint(OpsRagIngestJobsORM, "USE INDEX (ix_rij_lock)", dialect_name="mysql")
+            .where(OpsRagIngestJobsORM.status.in_([JobStatus.PENDING, JobStatus.FAILED, JobStatus.RUNNING]))
             .where(claimable)
             .order_by(OpsRagIngestJobsORM.job_id.asc())
             .limit(1)
@@ -478,15 +540,17 @@ class RagRepository:
         if not chunks:
             return 0
 
-        objs = []
+        # One executemany INSERT (batched into multi-row VALUES by the dialect) instead of
+        # building ORM instances and flushing them through the unit of work.
+        # chunk_id is computed client-side, so no PKs need to be read back.
+        rows = []
         for c in chunks:
             item = dict(c)
             item.pop("created_at", None)
-            objs.append(StgRagChunksORM(**item))
+            rows.append(item)
 
-        db.add_all(objs)
-        await db.flush()
-        return len(objs)
+        await db.execute(insert(StgRagChunksORM), rows)
+        return len(rows)
 
     @staticmethod
     async def delete_chunks_by_document_version(
@@ -522,9 +586,11 @@ class RagRepository:
             index_version: int,
             limit: int = 200,
             offset: int = 0,
-    ) -> List[StgRagChunksORM]:
+    ) -> Sequence[Row]:
+        """Read-only listing: plain column rows (attribute access), no ORM instances."""
+
         stmt = (
-            select(StgRagChunksORM)
+            select(*StgRagChunksORM.__table__.c)
             .where(StgRagChunksORM.document_id == int(document_id))
             .where(StgRagChunksORM.index_version == int(index_version))
             .order_by(StgRagChunksORM.chunk_index.asc())
@@ -532,7 +598,7 @@ class RagRepository:
             .limit(int(limit))
         )
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.all()
 
     @staticmethod
     async def get_chunks_by_ids(
@@ -544,12 +610,14 @@ class RagRepository:
         if not chunk_ids:
             return []
 
-        stmt = select(StgRagChunksORM).where(StgRagChunksORM.chunk_id.in_(list(chunk_ids)))
-        if kb_space:
-            stmt = stmt.where(StgRagChunksORM.kb_space == kb_space)
-
-        rows = (await db.execute(stmt)).scalars().all()
-        return list(rows)
+        stmt = _STMT_SPACE_CHUNKS_BY_IDS if kb_space else _STMT_CHUNKS_BY_IDS
+        out: List[StgRagChunksORM] = []
+        for ids in chunked(list(chunk_ids)):
+            params: Dict[str, Any] = {"chunk_ids": ids}
+            if kb_space:
+                params["kb_space"] = kb_space
+            out.extend((await db.execute(stmt, params)).scalars())
+        return out
 
     @staticmethod
     async def get_searchable_chunks_by_ids(
@@ -557,9 +625,9 @@ class RagRepository:
             *,
             chunk_ids: Sequence[str],
             kb_space: str,
-    ) -> List[StgRagChunksORM]:
+    ) -> List[Row]:
         """
-        Search 专用：只返回“可检索”的 chunk
+        Search 专用：只返回“可检索”的 chunk（chunks JOIN documents 一次取回，仅含命中组装所需列）
         判定规则：
         - documents.status == INDEXED
         - documents.status != DELETED
@@ -570,17 +638,7 @@ class RagRepository:
         if not chunk_ids:
             return []
 
-        stmt = (
-            select(StgRagChunksORM)
-            .join(MetaRagDocumentsORM, MetaRagDocumentsORM.document_id == StgRagChunksORM.document_id)
-            .where(StgRagChunksORM.chunk_id.in_(list(chunk_ids)))
-            .where(StgRagChunksORM.kb_space == kb_space)
-            .where(MetaRagDocumentsORM.kb_space == kb_space)
-            .where(MetaRagDocumentsORM.status == int(DocumentStatus.INDEXED))
-            .where(MetaRagDocumentsORM.status != int(DocumentStatus.DELETED))
-            .where(MetaRagDocumentsORM.active_index_version.is_not(None))
-            .where(StgRagChunksORM.index_version == MetaRagDocumentsORM.active_index_version)
-        )
-
-        rows = (await db.execute(stmt)).scalars().all()
-        return list(rows)
+        out: List[Row] = []
+        for ids in chunked(list(chunk_ids)):
+            out.extend(await db.execute(_STMT_SEARCHABLE_CHUNKS, {"chunk_ids": ids, "kb_space": kb_space}))
+        return out
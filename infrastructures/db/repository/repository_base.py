@@ -3,7 +3,24 @@
 # @Description:
 
 import time
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+# Upper bound for the bind parameters of one `IN (...)` list.
+IN_CHUNK_SIZE = 500
 
 
 def now_ts() -> int:
     return int(time.time())
+
+
+def chunked(items: Iterable[T], chunk_size: int = IN_CHUNK_SIZE) -> Iterator[List[T]]:
+    buf: List[T] = []
+    for x in items:
+        buf.append(x)
+        if len(buf) >= chunk_size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
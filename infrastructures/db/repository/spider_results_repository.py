@@ -5,9 +5,10 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import Row, Subquery, and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.voc_domain import (
@@ -36,6 +37,7 @@ from infrastructures.db.spider_orm.spider_results_orm import (
     AmazonReviewOptionsORM,
     SpiderRunsORM,
 )
+from infrastructures.db.repository.repository_base import chunked
 
 
 # -----------------------------------------------------------------------------
@@ -43,24 +45,21 @@ from infrastructures.db.spider_orm.spider_results_orm import (
 # -----------------------------------------------------------------------------
 
 
-def _chunked(items: Iterable[str], chunk_size: int) -> List[List[str]]:
-    buf: List[str] = []
-    out: List[List[str]] = []
-    for x in items:
-        buf.append(str(x))
-        if len(buf) >= chunk_size:
-            out.append(buf)
-            buf = []
-    if buf:
-        out.append(buf)
-    return out
-
-
 def _day_from_epoch_utc(ts: int) -> str:
     # v1.0 freezes captured_day derivation to UTC day.
     return datetime.fromtimestamp(int(ts), tz=timezone.utc).strftime("%Y-%m-%d")
 
 
+def _utc_day_bucket(col):
+    # SQL twin of _day_from_epoch_utc: epoch seconds -> UTC day number.
+    return func.floor(col / 86400)
+
+
+def _unranked_columns(ranked: Subquery) -> List[Any]:
+    # Entity columns of a ROW_NUMBER() subquery, without the rank itself.
+    return [c for c in ranked.c if c.key != "rn"]
+
+
 def _day_bounds_epoch_utc(day: str) -> Tuple[int, int]:
     # [start, end) in epoch seconds
     dt = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
@@ -78,6 +77,28 @@ def _maybe_float(v) -> Optional[float]:
         return None
 
 
+# ORM column names copied 1:1 into the domain models. Column types already match the
+# domain field types, so rows are read with one C-level zip/attrgetter call and validated
+# by pydantic-core instead of per-field Python str()/int() casts.
+# Dataset loaders select plain columns (Row tuples) rather than ORM entities: these rows
+# are read once and never written back, so identity-map bookkeeping is pure overhead.
+_REVIEW_FIELDS: Tuple[str, ...] = (
+    "review_id", "site_code", "asin", "review_external_id", "item_fingerprint", "stars",
+    "review_title", "review_body", "language_code", "reviewer_name", "review_location",
+    "review_time", "helpful_votes", "verified_purchase", "options_text", "review_url",
+    "created_at", "updated_at",
+)
+_REVIEW_COLUMNS = tuple(getattr(AmazonReviewItemsORM, f) for f in _REVIEW_FIELDS)
+
+_LISTING_FIELDS: Tuple[str, ...] = (
+    "listing_id", "task_id", "run_id", "captured_at", "site_code", "asin", "parent_asin",
+    "brand_name", "title", "about_text", "product_information_text", "main_image_url",
+    "price_currency", "ratings_count", "review_count", "bought_past_month",
+    "availability_text", "seller_name", "variation_summary", "category_path",
+)
+_listing_getter = attrgetter(*_LISTING_FIELDS)
+
+
 # -----------------------------------------------------------------------------
 # Repository
 # -----------------------------------------------------------------------------
@@ -124,7 +145,7 @@ class SpiderResultsRepository:
         limit: int = 1000,
         offset: int = 0,
         order_by_position: bool = True,
-    ) -> List[AmazonReviewItemsORM]:
+    ) -> Sequence[AmazonReviewItemsORM]:
         """List review items observed in a run, ordered by (page_num, position)."""
 
         obs = AmazonReviewObservationsORM
@@ -140,30 +161,42 @@ class SpiderResultsRepository:
             stmt = stmt.order_by(itm.review_id.asc())
         stmt = stmt.limit(int(limit)).offset(int(offset))
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.scalars().all()
 
     @staticmethod
-    async def list_review_media(db: AsyncSession, *, review_ids: Sequence[int], chunk_size: int = 500) -> List[AmazonReviewMediaORM]:
+    async def list_review_media(db: AsyncSession, *, review_ids: Sequence[int], chunk_size: int = 500) -> List[Row]:
+        """(review_id, media_type, media_url, thumb_url, created_at) rows."""
+
         if not review_ids:
             return []
-        out: List[AmazonReviewMediaORM] = []
-        for chunk in _chunked([str(x) for x in review_ids], chunk_size):
-            ids = [int(x) for x in chunk]
-            stmt = select(AmazonReviewMediaORM).where(AmazonReviewMediaORM.review_id.in_(ids)).order_by(AmazonReviewMediaORM.review_id.asc(), AmazonReviewMediaORM.media_id.asc())
+        m = AmazonReviewMediaORM
+        out: List[Row] = []
+        for ids in chunked([int(x) for x in review_ids], chunk_size):
+            stmt = (
+                select(m.review_id, m.media_type, m.media_url, m.thumb_url, m.created_at)
+                .where(m.review_id.in_(ids))
+                .order_by(m.review_id.asc(), m.media_id.asc())
+            )
             res = await db.execute(stmt)
-            out.extend(list(res.scalars().all()))
+            out.extend(res)
         return out
 
     @staticmethod
-    async def list_review_options(db: AsyncSession, *, review_ids: Sequence[int], chunk_size: int = 500) -> List[AmazonReviewOptionsORM]:
+    async def list_review_options(db: AsyncSession, *, review_ids: Sequence[int], chunk_size: int = 500) -> List[Row]:
+        """(review_id, option_name, option_value) rows."""
+
         if not review_ids:
             return []
-        out: List[AmazonReviewOptionsORM] = []
-        for chunk in _chunked([str(x) for x in review_ids], chunk_size):
-            ids = [int(x) for x in chunk]
-            stmt = select(AmazonReviewOptionsORM).where(AmazonReviewOptionsORM.review_id.in_(ids)).order_by(AmazonReviewOptionsORM.review_id.asc(), AmazonReviewOptionsORM.option_id.asc())
+        o = AmazonReviewOptionsORM
+        out: List[Row] = []
+        for ids in chunked([int(x) for x in review_ids], chunk_size):
+            stmt = (
+                select(o.review_id, o.option_name, o.option_value)
+                .where(o.review_id.in_(ids))
+                .order_by(o.review_id.asc(), o.option_id.asc())
+            )
             res = await db.execute(stmt)
-            out.extend(list(res.scalars().all()))
+            out.extend(res)
         return out
 
     @staticmethod
@@ -192,7 +225,7 @@ class SpiderResultsRepository:
         itm = AmazonReviewItemsORM
         obs = AmazonReviewObservationsORM
 
-        stmt = select(itm).where(itm.site_code == site_code, itm.asin.in_(asins))
+        stmt = select(*_REVIEW_COLUMNS).where(itm.site_code == site_code, itm.asin.in_(asins))
 
         if preferred_run_id is not None or preferred_task_id is not None:
             conds = [obs.site_code == site_code, obs.asin.in_(asins)]
@@ -200,7 +233,7 @@ class SpiderResultsRepository:
                 conds.append(obs.run_id == int(preferred_run_id))
             if preferred_task_id is not None:
                 conds.append(obs.task_id == int(preferred_task_id))
-            stmt = select(itm).join(obs, obs.review_id == itm.review_id).where(and_(*conds))
+            stmt = select(*_REVIEW_COLUMNS).join(obs, obs.review_id == itm.review_id).where(and_(*conds))
 
         if review_time_from is not None or review_time_to is not None:
             # enforce spec: unknown review_time can't be placed into window => exclude
@@ -211,7 +244,7 @@ class SpiderResultsRepository:
                 stmt = stmt.where(itm.review_time <= int(review_time_to))
 
         res = await db.execute(stmt)
-        rows = list(res.scalars().all())
+        rows = res.all()
 
         review_ids = [r.review_id for r in rows]
         media_rows = await SpiderResultsRepository.list_review_media(db, review_ids=review_ids, chunk_size=chunk_size)
@@ -234,30 +267,12 @@ class SpiderResultsRepository:
 
         reviews: List[Review] = []
         for r in rows:
-            reviews.append(
-                Review(
-                    review_id=int(r.review_id),
-                    site_code=str(r.site_code),
-                    asin=str(r.asin),
-                    review_external_id=str(r.review_external_id) if r.review_external_id is not None else None,
-                    item_fingerprint=str(r.item_fingerprint),
-                    stars=int(r.stars),
-                    review_title=str(r.review_title) if r.review_title is not None else None,
-                    review_body=str(r.review_body) if r.review_body is not None else None,
-                    language_code=str(r.language_code) if r.language_code is not None else None,
-                    reviewer_name=str(r.reviewer_name) if r.reviewer_name is not None else None,
-                    review_location=str(r.review_location) if r.review_location is not None else None,
-                    review_time=int(r.review_time) if r.review_time is not None else None,
-                    helpful_votes=int(r.helpful_votes or 0),
-                    verified_purchase=int(r.verified_purchase or 0),
-                    options_text=str(r.options_text) if r.options_text is not None else None,
-                    review_url=str(r.review_url) if r.review_url is not None else None,
-                    created_at=int(r.created_at) if r.created_at is not None else None,
-                    updated_at=int(r.updated_at) if r.updated_at is not None else None,
-                    options=opts_by_review.get(int(r.review_id), []),
-                    media=media_by_review.get(int(r.review_id), []),
-                )
-            )
+            d = dict(zip(_REVIEW_FIELDS, r))
+            d["helpful_votes"] = d["helpful_votes"] or 0
+            d["verified_purchase"] = d["verified_purchase"] or 0
+            d["options"] = opts_by_review.get(r.review_id, [])
+            d["media"] = media_by_review.get(r.review_id, [])
+            reviews.append(Review.model_validate(d))
 
         return ReviewDataset(
             site_code=site_code,
@@ -280,7 +295,7 @@ class SpiderResultsRepository:
         )
         res = await db.execute(stmt)
         out: Dict[str, int] = {}
-        for asin, ts in res.all():
+        for asin, ts in res:
             if ts is not None:
                 out[str(asin)] = int(ts)
         return out
@@ -353,84 +368,69 @@ class SpiderResultsRepository:
         else:
             raise ValueError(f"Unsupported mode: {mode}")
 
-        # order newest first so we can dedup by (asin, captured_day)
-        base_stmt = base_stmt.order_by(AmazonListingItemsORM.captured_at.desc(), AmazonListingItemsORM.listing_id.desc())
-        res = await db.execute(base_stmt)
-        rows = list(res.scalars().all())
-
-        # Dedup: keep latest per (asin, captured_day)
-        chosen: Dict[Tuple[str, str], AmazonListingItemsORM] = {}
-        for r in rows:
-            d = _day_from_epoch_utc(int(r.captured_at))
-            key = (str(r.asin), d)
-            if key not in chosen:
-                chosen[key] = r
-
-        chosen_rows = list(chosen.values())
+        # Dedup in SQL: keep latest per (asin, captured_day), newest first.
+        itm = AmazonListingItemsORM
+        rn = func.row_number().over(
+            partition_by=(itm.asin, _utc_day_bucket(itm.captured_at)),
+            order_by=(itm.captured_at.desc(), itm.listing_id.desc()),
+        ).label("rn")
+        ranked = base_stmt.add_columns(rn).subquery()
+        stmt = (
+            select(*_unranked_columns(ranked))
+            .where(ranked.c.rn == 1)
+            .order_by(ranked.c.captured_at.desc(), ranked.c.listing_id.desc())
+        )
+        res = await db.execute(stmt)
+        chosen_rows = res.all()
         listing_ids = [int(r.listing_id) for r in chosen_rows]
 
         attrs_by_listing: Dict[int, List[ListingAttribute]] = {}
         bullets_by_listing: Dict[int, List[ListingBullet]] = {}
         media_by_listing: Dict[int, List[ListingMedia]] = {}
 
-        if listing_ids:
+        # Each listing's rows land in a single chunk, so per-listing order is preserved.
+        for ids in chunked(listing_ids):
             # attributes
-            stmt = select(AmazonListingAttributesORM).where(AmazonListingAttributesORM.listing_id.in_(listing_ids))
+            la = AmazonListingAttributesORM
+            stmt = select(la.listing_id, la.attr_name, la.attr_value).where(la.listing_id.in_(ids))
             res = await db.execute(stmt)
-            for a in res.scalars().all():
+            for a in res:
                 attrs_by_listing.setdefault(int(a.listing_id), []).append(ListingAttribute(attr_name=str(a.attr_name), attr_value=str(a.attr_value)))
 
             # bullets
-            stmt = select(AmazonListingBulletsORM).where(AmazonListingBulletsORM.listing_id.in_(listing_ids)).order_by(
-                AmazonListingBulletsORM.listing_id.asc(), AmazonListingBulletsORM.bullet_index.asc()
+            lb = AmazonListingBulletsORM
+            stmt = (
+                select(lb.listing_id, lb.bullet_index, lb.bullet_text)
+                .where(lb.listing_id.in_(ids))
+                .order_by(lb.listing_id.asc(), lb.bullet_index.asc())
             )
             res = await db.execute(stmt)
-            for b in res.scalars().all():
+            for b in res:
                 bullets_by_listing.setdefault(int(b.listing_id), []).append(ListingBullet(bullet_index=int(b.bullet_index), bullet_text=str(b.bullet_text)))
 
             # media
-            stmt = select(AmazonListingMediaORM).where(AmazonListingMediaORM.listing_id.in_(listing_ids)).order_by(
-                AmazonListingMediaORM.listing_id.asc(), AmazonListingMediaORM.position.asc(), AmazonListingMediaORM.media_id.asc()
+            lm = AmazonListingMediaORM
+            stmt = (
+                select(lm.listing_id, lm.media_type, lm.media_url, lm.position)
+                .where(lm.listing_id.in_(ids))
+                .order_by(lm.listing_id.asc(), lm.position.asc(), lm.media_id.asc())
             )
             res = await db.execute(stmt)
-            for m in res.scalars().all():
+            for m in res:
                 media_by_listing.setdefault(int(m.listing_id), []).append(
                     ListingMedia(media_type=str(m.media_type), media_url=str(m.media_url), position=int(m.position or 0))
                 )
 
         snapshots: List[ListingSnapshot] = []
         for r in chosen_rows:
-            d = _day_from_epoch_utc(int(r.captured_at))
-            snapshots.append(
-                ListingSnapshot(
-                    listing_id=int(r.listing_id),
-                    task_id=int(r.task_id),
-                    run_id=int(r.run_id),
-                    captured_at=int(r.captured_at),
-                    captured_day=d,
-                    site_code=str(r.site_code),
-                    asin=str(r.asin),
-                    parent_asin=str(r.parent_asin) if r.parent_asin is not None else None,
-                    brand_name=str(r.brand_name) if r.brand_name is not None else None,
-                    title=str(r.title) if r.title is not None else None,
-                    about_text=str(r.about_text) if r.about_text is not None else None,
-                    product_information_text=str(r.product_information_text) if r.product_information_text is not None else None,
-                    main_image_url=str(r.main_image_url) if r.main_image_url is not None else None,
-                    price_amount=_maybe_float(r.price_amount),
-                    price_currency=str(r.price_currency) if r.price_currency is not None else None,
-                    stars=_maybe_float(r.stars),
-                    ratings_count=int(r.ratings_count) if r.ratings_count is not None else None,
-                    review_count=int(r.review_count) if r.review_count is not None else None,
-                    bought_past_month=int(r.bought_past_month) if r.bought_past_month is not None else None,
-                    availability_text=str(r.availability_text) if r.availability_text is not None else None,
-                    seller_name=str(r.seller_name) if r.seller_name is not None else None,
-                    variation_summary=str(r.variation_summary) if r.variation_summary is not None else None,
-                    category_path=str(r.category_path) if r.category_path is not None else None,
-                    attributes=attrs_by_listing.get(int(r.listing_id), []),
-                    bullets=bullets_by_listing.get(int(r.listing_id), []),
-                    media=media_by_listing.get(int(r.listing_id), []),
-                )
-            )
+            d = dict(zip(_LISTING_FIELDS, _listing_getter(r)))
+            d["captured_day"] = _day_from_epoch_utc(int(r.captured_at))
+            d["price_amount"] = _maybe_float(r.price_amount)
+            d["stars"] = _maybe_float(r.stars)
+            d["attributes"] = attrs_by_listing.get(int(r.listing_id), [])
+            d["bullets"] = bullets_by_listing.get(int(r.listing_id), [])
+            d["media"] = media_by_listing.get(int(r.listing_id), [])
+            snapshots.append(ListingSnapshot.model_validate(d))
 
         return ListingDataset(site_code=site_code, asins=asins, start_day=chosen_start_day, end_day=chosen_end_day, snapshots=snapshots)
 
@@ -447,7 +447,7 @@ class SpiderResultsRepository:
         )
         res = await db.execute(stmt)
         out: Dict[str, int] = {}
-        for kw, ts in res.all():
+        for kw, ts in res:
             if ts is not None:
                 out[str(kw)] = int(ts)
         return out
@@ -515,20 +515,23 @@ class SpiderResultsRepository:
         if max_page_num is not None:
             stmt = stmt.where(AmazonKeywordSearchItemsORM.page_num <= int(max_page_num))
 
-        # newest first for dedup by (kw, day, page, position)
-        stmt = stmt.order_by(AmazonKeywordSearchItemsORM.captured_at.desc(), AmazonKeywordSearchItemsORM.kw_item_id.desc())
+        # Dedup in SQL: keep latest per (kw, day, page, position), newest first.
+        kw = AmazonKeywordSearchItemsORM
+        rn = func.row_number().over(
+            partition_by=(kw.keyword, _utc_day_bucket(kw.captured_at), kw.page_num, kw.position),
+            order_by=(kw.captured_at.desc(), kw.kw_item_id.desc()),
+        ).label("rn")
+        ranked = stmt.add_columns(rn).subquery()
+        stmt = (
+            select(*_unranked_columns(ranked))
+            .where(ranked.c.rn == 1)
+            .order_by(ranked.c.captured_at.desc(), ranked.c.kw_item_id.desc())
+        )
         res = await db.execute(stmt)
-        rows = list(res.scalars().all())
-
-        chosen: Dict[Tuple[str, str, int, int], AmazonKeywordSearchItemsORM] = {}
-        for r in rows:
-            d = _day_from_epoch_utc(int(r.captured_at))
-            key = (str(r.keyword), d, int(r.page_num), int(r.position))
-            if key not in chosen:
-                chosen[key] = r
+        chosen_rows = res.all()
 
         items: List[SerpItem] = []
-        for r in chosen.values():
+        for r in chosen_rows:
             d = _day_from_epoch_utc(int(r.captured_at))
             items.append(
                 SerpItem(
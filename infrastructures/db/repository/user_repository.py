@@ -6,14 +6,38 @@ from __future__ import annotations
 
 from typing import Optional, Union
 
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.user_domain import UserRole
 from infrastructures.db.orm.user_orm import MetaUsersORM
 
 
+# Columns the auth path reads; selected as plain rows so token checks skip ORM instances.
+_AUTH_COLUMNS = (MetaUsersORM.user_id, MetaUsersORM.username, MetaUsersORM.role, MetaUsersORM.status)
+
+# Built once at import; calls only bind parameters (per-request path, no expression assembly).
+_STMT_AUTH_BY_ID = select(*_AUTH_COLUMNS).where(MetaUsersORM.user_id == bindparam("user_id")).limit(1)
+_STMT_LOGIN_BY_USERNAME = (
+    select(*_AUTH_COLUMNS, MetaUsersORM.password_hash).where(MetaUsersORM.username == bindparam("username")).limit(1)
+)
+
+
 class UserRepository:
+    @staticmethod
+    async def get_auth_row_by_id(db: AsyncSession, user_id: int) -> Optional[Row]:
+        """(user_id, username, role, status) row, or None."""
+
+        res = await db.execute(_STMT_AUTH_BY_ID, {"user_id": int(user_id)})
+        return res.first()
+
+    @staticmethod
+    async def get_login_row(db: AsyncSession, username: str) -> Optional[Row]:
+        """(user_id, username, role, status, password_hash) row, or None."""
+
+        res = await db.execute(_STMT_LOGIN_BY_USERNAME, {"username": str(username)})
+        return res.first()
+
     @staticmethod
     async def get_by_id(db: AsyncSession, user_id: int) -> Optional[MetaUsersORM]:
         stmt = select(MetaUsersORM).where(MetaUsersORM.user_id == user_id)
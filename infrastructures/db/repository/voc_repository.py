@@ -4,17 +4,25 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Sequence, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import Row, bindparam, delete, func, insert, select, update
 from sqlalchemy import and_, or_
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from infrastructures.db.orm.voc_orm import MetaVocJobsORM, StgVocOutputsORM, StgVocEvidenceORM
 from infrastructures.db.repository.repository_base import now_ts
 
 
+# Hot point lookups, built once at import; calls only bind parameters.
+_STMT_JOB = select(MetaVocJobsORM).where(MetaVocJobsORM.job_id == bindparam("job_id"))
+_STMT_OUTPUT = select(StgVocOutputsORM).where(
+    StgVocOutputsORM.job_id == bindparam("job_id"),
+    StgVocOutputsORM.module_code == bindparam("module_code"),
+)
+
+
 class VocRepository:
     # -----------------------------
     # Jobs
@@ -112,8 +120,7 @@ class VocRepository:
 
     @staticmethod
     async def get_job(db: AsyncSession, *, job_id: int) -> Optional[MetaVocJobsORM]:
-        stmt = select(MetaVocJobsORM).where(MetaVocJobsORM.job_id == int(job_id))
-        res = await db.execute(stmt)
+        res = await db.execute(_STMT_JOB, {"job_id": int(job_id)})
         return res.scalars().first()
 
     @staticmethod
@@ -132,7 +139,14 @@ class VocRepository:
         error_code: Optional[str] = None,
         error_message: Optional[str] = None,
         failed_stage: Optional[str] = None,
+        params_json: Optional[Dict[str, Any]] = None,
     ) -> int:
+        """Set status (+ optional stage/error fields).
+
+        params_json, when given, is written in the same UPDATE so a params change that
+        accompanies a status transition costs one round-trip, not two.
+        """
+
         values: Dict[str, Any] = {"status": int(status), "updated_at": now_ts()}
         if stage is not None:
             values["stage"] = stage
@@ -142,7 +156,42 @@ class VocRepository:
             values["error_message"] = error_message
         if failed_stage is not None:
             values["failed_stage"] = failed_stage
+        if params_json is not None:
+            values["params_json"] = dict(params_json)
+
+        stmt = update(MetaVocJobsORM).where(MetaVocJobsORM.job_id == int(job_id)).values(**values)
+        res = await db.execute(stmt)
+        return int(res.rowcount or 0)
+
+    @staticmethod
+    async def update_job_params_json(db: AsyncSession, *, job_id: int, params_json: Dict[str, Any]) -> int:
+        stmt = (
+            update(MetaVocJobsORM)
+            .where(MetaVocJobsORM.job_id == int(job_id))
+            .values(params_json=dict(params_json or {}), updated_at=now_ts())
+        )
+        res = await db.execute(stmt)
+        return int(res.rowcount or 0)
+
+    @staticmethod
+    async def set_preferred_spider_ids(
+        db: AsyncSession,
+        *,
+        job_id: int,
+        preferred_task_id: Optional[int] = None,
+        preferred_run_id: Optional[int] = None,
+    ) -> int:
+        """Record spider task/run pointers; ids that are None are left unchanged."""
+
+        values: Dict[str, Any] = {}
+        if preferred_task_id is not None:
+            values["preferred_task_id"] = int(preferred_task_id)
+        if preferred_run_id is not None:
+            values["preferred_run_id"] = int(preferred_run_id)
+        if not values:
+            return 0
 
+        values["updated_at"] = now_ts()
         stmt = update(MetaVocJobsORM).where(MetaVocJobsORM.job_id == int(job_id)).values(**values)
         res = await db.execute(stmt)
         return int(res.rowcount or 0)
@@ -159,50 +208,70 @@ class VocRepository:
         module_code: str,
         payload_json: Dict[str, Any],
         schema_version: int = 1,
-    ) -> StgVocOutputsORM:
-        # Fast path: try update first
-        stmt = (
-            update(StgVocOutputsORM)
-            .where(StgVocOutputsORM.job_id == int(job_id), StgVocOutputsORM.module_code == str(module_code))
-            .values(payload_json=dict(payload_json or {}), schema_version=int(schema_version), updated_at=now_ts())
-        )
-        res = await db.execute(stmt)
-        if int(res.rowcount or 0) > 0:
-            # reload
-            got = await VocRepository.get_output(db, job_id=int(job_id), module_code=str(module_code))
-            assert got is not None
-            return got
-
-        # Insert
-        out = StgVocOutputsORM(
+    ) -> None:
+        await VocRepository.upsert_outputs(
+            db,
             job_id=int(job_id),
-            module_code=str(module_code),
-            payload_json=dict(payload_json or {}),
-            schema_version=int(schema_version),
+            outputs=[(str(module_code), payload_json, int(schema_version))],
         )
-        db.add(out)
-        try:
-            await db.flush()
-            return out
-        except IntegrityError:
-            # concurrent insert -> retry as update
-            await db.rollback()
-            got = await VocRepository.get_output(db, job_id=int(job_id), module_code=str(module_code))
-            if got is not None:
-                return got
-            raise
+
+    @staticmethod
+    async def upsert_outputs(
+        db: AsyncSession,
+        *,
+        job_id: int,
+        outputs: Sequence[Tuple[str, Dict[str, Any], int]],
+    ) -> None:
+        """Upsert (module_code, payload_json, schema_version) outputs for one job.
+
+        One INSERT .. ON DUPLICATE KEY UPDATE on uk_voc_output_job_module for all modules
+        (executemany, folded into a multi-row VALUES); concurrent writers cannot race into
+        an IntegrityError.
+        """
+
+        if not outputs:
+            return
+        ts = now_ts()
+        rows = [
+            {
+                "job_id": int(job_id),
+                "module_code": str(module_code),
+                "payload_json": dict(payload_json or {}),
+                "schema_version": int(schema_version),
+                "created_at": ts,
+                "updated_at": ts,
+            }
+            for module_code, payload_json, schema_version in outputs
+        ]
+        stmt = mysql_insert(StgVocOutputsORM)
+        stmt = stmt.on_duplicate_key_update(
+            payload_json=stmt.inserted.payload_json,
+            schema_version=stmt.inserted.schema_version,
+            updated_at=stmt.inserted.updated_at,
+        )
+        await db.execute(stmt, rows)
 
     @staticmethod
     async def get_output(db: AsyncSession, *, job_id: int, module_code: str) -> Optional[StgVocOutputsORM]:
+        res = await db.execute(_STMT_OUTPUT, {"job_id": int(job_id), "module_code": str(module_code)})
+        return res.scalars().first()
+
+    @staticmethod
+    async def get_outputs(db: AsyncSession, *, job_id: int, module_codes: Sequence[str]) -> Sequence[StgVocOutputsORM]:
+        """get_output for several modules in one query (missing modules are simply absent)."""
+
+        if not module_codes:
+            return []
+
         stmt = select(StgVocOutputsORM).where(
             StgVocOutputsORM.job_id == int(job_id),
-            StgVocOutputsORM.module_code == str(module_code),
+            StgVocOutputsORM.module_code.in_([str(m) for m in module_codes]),
         )
         res = await db.execute(stmt)
-        return res.scalars().first()
+        return res.scalars().all()
 
     @staticmethod
-    async def list_outputs(db: AsyncSession, *, job_id: int, limit: int = 200, offset: int = 0) -> List[StgVocOutputsORM]:
+    async def list_outputs(db: AsyncSession, *, job_id: int, limit: int = 200, offset: int = 0) -> Sequence[StgVocOutputsORM]:
         stmt = (
             select(StgVocOutputsORM)
             .where(StgVocOutputsORM.job_id == int(job_id))
@@ -211,7 +280,7 @@ class VocRepository:
             .limit(int(limit))
         )
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.scalars().all()
 
     # -----------------------------
     # Evidence
@@ -224,8 +293,6 @@ class VocRepository:
         v1 behavior: evidence is append-only per run. If rerunning a module, clear first.
         """
 
-        from sqlalchemy import delete
-
         stmt = delete(StgVocEvidenceORM).where(
             StgVocEvidenceORM.job_id == int(job_id),
             StgVocEvidenceORM.module_code == str(module_code),
@@ -233,6 +300,20 @@ class VocRepository:
         res = await db.execute(stmt)
         return int(res.rowcount or 0)
 
+    @staticmethod
+    async def clear_evidence_for_modules(db: AsyncSession, *, job_id: int, module_codes: Sequence[str]) -> int:
+        """clear_evidence for several modules of a job in one DELETE."""
+
+        if not module_codes:
+            return 0
+
+        stmt = delete(StgVocEvidenceORM).where(
+            StgVocEvidenceORM.job_id == int(job_id),
+            StgVocEvidenceORM.module_code.in_([str(m) for m in module_codes]),
+        )
+        res = await db.execute(stmt)
+        return int(res.rowcount or 0)
+
     @staticmethod
     async def insert_evidence_many(
         db: AsyncSession,
@@ -245,25 +326,25 @@ class VocRepository:
         if not items:
             return 0
 
+        # Plain executemany INSERTs: evidence ids are never read back, so skip ORM
+        # instances and per-chunk unit-of-work flushes. chunk_size bounds each statement.
         total = 0
         for i in range(0, len(items), chunk_size):
             chunk = items[i : i + chunk_size]
-            objs = []
-            for it in chunk:
-                objs.append(
-                    StgVocEvidenceORM(
-                        job_id=int(job_id),
-                        module_code=str(module_code),
-                        source_type=str(it["source_type"]),
-                        source_id=int(it["source_id"]),
-                        kind=str(it.get("kind")) if it.get("kind") is not None else None,
-                        snippet=str(it.get("snippet") or ""),
-                        meta_json=dict(it.get("meta_json") or {}),
-                    )
-                )
-            db.add_all(objs)
-            await db.flush()
-            total += len(objs)
+            rows = [
+                {
+                    "job_id": int(job_id),
+                    "module_code": str(module_code),
+                    "source_type": str(it["source_type"]),
+                    "source_id": int(it["source_id"]),
+                    "kind": str(it.get("kind")) if it.get("kind") is not None else None,
+                    "snippet": str(it.get("snippet") or ""),
+                    "meta_json": dict(it.get("meta_json") or {}),
+                }
+                for it in chunk
+            ]
+            await db.execute(insert(StgVocEvidenceORM), rows)
+            total += len(rows)
         return total
 
     @staticmethod
@@ -274,10 +355,50 @@ class VocRepository:
         module_code: Optional[str] = None,
         limit: int = 500,
         offset: int = 0,
-    ) -> List[StgVocEvidenceORM]:
-        stmt = select(StgVocEvidenceORM).where(StgVocEvidenceORM.job_id == int(job_id))
+    ) -> Sequence[Row]:
+        """Read-only listing: plain column rows (attribute access), no ORM instances."""
+
+        stmt = select(*StgVocEvidenceORM.__table__.c).where(StgVocEvidenceORM.job_id == int(job_id))
         if module_code is not None:
             stmt = stmt.where(StgVocEvidenceORM.module_code == str(module_code))
         stmt = stmt.order_by(StgVocEvidenceORM.evidence_id.asc()).offset(int(offset)).limit(int(limit))
         res = await db.execute(stmt)
-        return list(res.scalars().all())
+        return res.all()
+
+    @staticmethod
+    async def list_evidence_for_modules(
+        db: AsyncSession,
+        *,
+        job_id: int,
+        module_codes: Sequence[str],
+        limit_per_module: int = 500,
+    ) -> Sequence[Row]:
+        """list_evidence for several modules in one query (first `limit_per_module` rows each)."""
+
+        if not module_codes:
+            return []
+
+        ev = StgVocEvidenceORM
+        rn = func.row_number().over(partition_by=ev.module_code, order_by=ev.evidence_id.asc()).label("rn")
+        ranked = (
+            select(*ev.__table__.c, rn)
+            .where(ev.job_id == int(job_id), ev.module_code.in_([str(m) for m in module_codes]))
+            .subquery()
+        )
+        stmt = (
+            select(*[c for c in ranked.c if c.key != "rn"])
+            .where(ranked.c.rn <= int(limit_per_module))
+            .order_by(ranked.c.module_code.asc(), ranked.c.evidence_id.asc())
+        )
+        res = await db.execute(stmt)
+        return res.all()
+
+    @staticmethod
+    async def count_evidence_by_module(db: AsyncSession, *, job_id: int) -> Dict[str, int]:
+        stmt = (
+            select(StgVocEvidenceORM.module_code, func.count())
+            .where(StgVocEvidenceORM.job_id == int(job_id))
+            .group_by(StgVocEvidenceORM.module_code)
+        )
+        res = await db.execute(stmt)
+        return {str(mc): int(n) for mc, n in res}
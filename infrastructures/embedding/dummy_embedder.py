@@ -16,17 +16,22 @@ class DummyEmbedder:
     def __init__(self, dim: int = 64):
         self.dim = dim
 
-    async def embed_query(self, text: str) -> List[float]:
+    async def embed_query(self, text: str) -> np.ndarray:
         return self._hash_vector(text)
 
-    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return [self._hash_vector(t) for t in texts]
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            out[i] = self._hash_vector(t)
+        return out
 
-    def _hash_vector(self, text: str) -> List[float]:
+    def _hash_vector(self, text: str) -> np.ndarray:
         h = hashlib.sha256(text.encode("utf-8")).digest()
         arr = np.frombuffer(h, dtype=np.uint8).astype(np.float32)
         if len(arr) >= self.dim:
             arr = arr[: self.dim]
         else:
             arr = np.pad(arr, (0, self.dim - len(arr)), "wrap")
-        return (arr / 255.0).tolist()
+        return arr / np.float32(255.0)
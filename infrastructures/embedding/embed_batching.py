@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# @Author: yaccii
+# @Description: Request coalescing for single-text embedding calls.
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+async def embed_in_batches(
+        texts: List[str],
+        encode: Callable[[List[str]], np.ndarray],
+        *,
+        batch_size: int,
+        max_concurrency: int,
+) -> np.ndarray:
+    """Run a blocking `encode` over `texts` in batches on worker threads.
+
+    At most `max_concurrency` batches run at once; results keep input order and are
+    returned as one contiguous (n, dim) float32 array.
+    """
+
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    size = max(1, int(batch_size))
+    if len(texts) <= size:
+        return await asyncio.to_thread(encode, texts)
+
+    sem = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+    async def _one(part: List[str]) -> np.ndarray:
+        async with sem:
+            return await asyncio.to_thread(encode, part)
+
+    parts = await asyncio.gather(*[_one(texts[i: i + size]) for i in range(0, len(texts), size)])
+    return np.concatenate(parts, axis=0)
+
+
+class BatchingEmbedMixin(ABC):
+    """Coalesce concurrent `embed_query` calls into batched `embed_documents` calls.
+
+    Subclasses implement only `embed_documents(texts)` and call `_init_embed_batching()`
+    in `__init__`. Calls arriving within `debounce_ms` of each other are flushed together,
+    at most `batch_size` texts per underlying call.
+    """
+
+    debounce_ms: int = 10
+    batch_size: int = 128
+    max_concurrency: int = 2
+
+    def _init_embed_batching(
+            self,
+            *,
+            debounce_ms: Optional[int] = None,
+            batch_size: Optional[int] = None,
+            max_concurrency: Optional[int] = None,
+    ) -> None:
+        if debounce_ms is not None:
+            self.debounce_ms = max(0, int(debounce_ms))
+        if batch_size is not None:
+            self.batch_size = max(1, int(batch_size))
+        if max_concurrency is not None:
+            self.max_concurrency = max(1, int(max_concurrency))
+        self._embed_queue: List[Tuple[str, asyncio.Future]] = []
+        self._embed_flush_task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        ...
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._embed_queue.append((text, fut))
+        if self._embed_flush_task is None:
+            self._embed_flush_task = loop.create_task(self._flush_embed_queue())
+        return await fut
+
+    async def _flush_embed_queue(self) -> None:
+        try:
+            await asyncio.sleep(self.debounce_ms / 1000.0)
+            while self._embed_queue:
+                batch = self._embed_queue[: self.batch_size]
+                del self._embed_queue[: self.batch_size]
+
+                try:
+                    vectors = await self.embed_documents([t for t, _ in batch])
+                except Exception as e:
+                    for _, f in batch:
+                        if not f.done():
+                            f.set_exception(e)
+                    continue
+
+                for (_, f), v in zip(batch, vectors):
+                    if not f.done():
+                        f.set_result(v)
+        finally:
+            self._embed_flush_task = None
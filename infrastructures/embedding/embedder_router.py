@@ -4,12 +4,31 @@
 
 from __future__ import annotations
 
+import threading
+
 from infrastructures.embedding.dummy_embedder import DummyEmbedder
-from infrastructures.embedding.sbert_embedder import SentenceTransformerEmbedder
+from infrastructures.embedding.embedding_cache import CachedEmbedder, EmbeddingCache
 from infrastructures.vconfig import vconfig
 from infrastructures.vlogger import vlogger
 
 _embedder_instance = None
+_embedder_lock = threading.Lock()
+
+
+def _with_cache(embedder, *, model: str):
+    path = str(vconfig.embedding_cache_path or "").strip()
+    if not path:
+        return embedder
+
+    cache = EmbeddingCache(
+        path=path,
+        model=f"{model}:{int(vconfig.embedding_dim)}",
+        lru_size=int(vconfig.embedding_cache_lru_size),
+        storage_dtype=str(vconfig.embedding_cache_dtype or "float32").strip().lower(),
+        mmap_mb=int(vconfig.embedding_cache_mmap_mb),
+    )
+    vlogger.info("embedding cache enabled path=%s", cache.path)
+    return CachedEmbedder(inner=embedder, cache=cache)
 
 
 def create_embedder():
@@ -17,17 +36,33 @@ def create_embedder():
     if _embedder_instance is not None:
         return _embedder_instance
 
+    # Model load is heavy: make sure concurrent cold callers build it once.
+    with _embedder_lock:
+        if _embedder_instance is None:
+            _embedder_instance = _build_embedder()
+    return _embedder_instance
+
+
+def _build_embedder():
     backend = vconfig.embedding_backend.strip().lower()
     vlogger.info("init embedder backend=%s", backend)
 
     if backend == "sentence_transformer":
-        _embedder_instance = SentenceTransformerEmbedder(
-            model_name=vconfig.embedding_model_name,
-            dim=vconfig.embedding_dim,
+        # sentence_transformers 会拉起 torch：仅在选用该后端时导入
+        from infrastructures.embedding.sbert_embedder import SentenceTransformerEmbedder
+
+        embedder = _with_cache(
+            SentenceTransformerEmbedder(
+                model_name=vconfig.embedding_model_name,
+                dim=vconfig.embedding_dim,
+                batch_size=vconfig.embedding_batch_size,
+                max_concurrency=vconfig.embedding_max_concurrency,
+            ),
+            model=vconfig.embedding_model_name,
         )
         vlogger.info("embedder=SentenceTransformer model=%s", vconfig.embedding_model_name)
-        return _embedder_instance
+        return embedder
 
-    _embedder_instance = DummyEmbedder(dim=vconfig.embedding_dim)
+    embedder = DummyEmbedder(dim=vconfig.embedding_dim)
     vlogger.info("embedder=DummyEmbedder dim=%s", vconfig.embedding_dim)
-    return _embedder_instance
+    return embedder
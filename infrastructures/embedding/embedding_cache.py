@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# @Author: yaccii
+# @Description: Persistent embedding cache (SQLite on disk + in-process LRU).
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# SQLite's default host-parameter limit is 999 on older builds.
+_SQL_IN_CHUNK = 500
+
+STORAGE_DTYPES = ("float32", "float16", "int8")
+
+
+def quantize(vec: Any, dtype: str) -> Tuple[bytes, float]:
+    """Encode a vector for storage. int8 uses a symmetric per-vector scale."""
+
+    v = np.asarray(vec, dtype=np.float32)
+    if dtype == "float16":
+        return v.astype(np.float16).tobytes(), 1.0
+    if dtype == "int8":
+        peak = float(np.max(np.abs(v))) if v.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        return np.round(v / scale).astype(np.int8).tobytes(), scale
+    return v.tobytes(), 1.0
+
+
+def dequantize(blob: bytes, dtype: str, scale: float = 1.0) -> np.ndarray:
+    if dtype == "float16":
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+    if dtype == "int8":
+        return np.frombuffer(blob, dtype=np.int8).astype(np.float32) * np.float32(scale)
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+class EmbeddingCache:
+    """Embedding vectors keyed by sha256(model + "\\0" + text).
+
+    - Front: in-process LRU (hot queries never touch SQLite).
+    - Back: SQLite file; all SQLite I/O runs in a worker thread. With `mmap_mb` > 0 reads
+      go through a memory map, so worker processes share one copy in the OS page cache
+      instead of each filling a private SQLite page cache.
+
+    Both tiers hold vectors encoded with `storage_dtype` (float32/float16/int8);
+    they are decoded to float32 arrays on read.
+    """
+
+    def __init__(
+            self,
+            *,
+            path: str,
+            model: str,
+            lru_size: int = 4096,
+            storage_dtype: str = "float32",
+            mmap_mb: int = 0,
+    ) -> None:
+        if storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(f"unsupported embedding cache dtype: {storage_dtype}")
+
+        self.path = os.path.abspath(path)
+        self.model = str(model)
+        self.lru_size = max(0, int(lru_size))
+        self.storage_dtype = storage_dtype
+        self._lru: "OrderedDict[bytes, Tuple[bytes, str, float]]" = OrderedDict()
+        self._db_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            if mmap_mb > 0:
+                self._conn.execute(f"PRAGMA mmap_size={int(mmap_mb) * 1024 * 1024}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, vec BLOB NOT NULL, "
+                "dtype TEXT NOT NULL DEFAULT 'float32', scale REAL NOT NULL DEFAULT 1.0)"
+            )
+            cols = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+            if "dtype" not in cols:
+                self._conn.execute("ALTER TABLE embeddings ADD COLUMN dtype TEXT NOT NULL DEFAULT 'float32'")
+            if "scale" not in cols:
+                self._conn.execute("ALTER TABLE embeddings ADD COLUMN scale REAL NOT NULL DEFAULT 1.0")
+            self._conn.commit()
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha256(self.model.encode("utf-8") + b"\0" + text.encode("utf-8")).digest()
+
+    # -------- LRU --------
+
+    def lru_get(self, key: bytes) -> Optional[np.ndarray]:
+        entry = self._lru.get(key)
+        if entry is None:
+            return None
+        self._lru.move_to_end(key)
+        blob, dtype, scale = entry
+        return dequantize(blob, dtype, scale)
+
+    def _lru_put_encoded(self, key: bytes, entry: Tuple[bytes, str, float]) -> None:
+        if self.lru_size <= 0:
+            return
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    # -------- SQLite --------
+
+    def _select_sync(self, keys: Sequence[bytes]) -> Dict[bytes, Tuple[bytes, str, float]]:
+        out: Dict[bytes, Tuple[bytes, str, float]] = {}
+        with self._db_lock:
+            for i in range(0, len(keys), _SQL_IN_CHUNK):
+                part = list(keys[i: i + _SQL_IN_CHUNK])
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vec, dtype, scale FROM embeddings WHERE key IN ({marks})", part
+                ).fetchall()
+                for k, vec, dtype, scale in rows:
+                    out[bytes(k)] = (bytes(vec), str(dtype), float(scale))
+        return out
+
+    def _insert_sync(self, rows: Sequence[tuple]) -> None:
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, model, dim, vec, dtype, scale) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    async def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        misses: List[bytes] = []
+        for k in keys:
+            v = self.lru_get(k)
+            if v is not None:
+                found[k] = v
+            else:
+                misses.append(k)
+
+        if misses:
+            disk = await asyncio.to_thread(self._select_sync, misses)
+            for k, entry in disk.items():
+                self._lru_put_encoded(k, entry)
+                found[k] = dequantize(*entry)
+        return found
+
+    async def put_many(self, items: Sequence[tuple]) -> None:
+        if not items:
+            return
+        rows = []
+        for k, v in items:
+            blob, scale = quantize(v, self.storage_dtype)
+            self._lru_put_encoded(k, (blob, self.storage_dtype, scale))
+            rows.append((k, self.model, len(v), blob, self.storage_dtype, scale))
+        await asyncio.to_thread(self._insert_sync, rows)
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+
+class CachedEmbedder:
+    """Wrap an embedder (embed_query/embed_documents) with an EmbeddingCache.
+
+    On a batch, cached vectors are served from the cache and only the missing
+    (deduplicated) texts are sent to the wrapped embedder; results keep input order.
+    """
+
+    def __init__(self, *, inner: Any, cache: EmbeddingCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.dim = getattr(inner, "dim", None)
+        self.model_name = getattr(inner, "model_name", inner.__class__.__name__)
+        count_tokens = getattr(inner, "count_tokens", None)
+        if count_tokens is not None:
+            self.count_tokens = count_tokens
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        k = self.cache.key(text)
+        hit = await self.cache.get_many([k])
+        if k in hit:
+            return hit[k]
+
+        vec = await self.inner.embed_query(text)
+        await self.cache.put_many([(k, vec)])
+        return vec
+
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+
+        keys = [self.cache.key(t) for t in texts]
+        found = await self.cache.get_many(keys)
+
+        missing: Dict[bytes, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in found and k not in missing:
+                missing[k] = t
+
+        if missing:
+            miss_keys = list(missing.keys())
+            vectors = await self.inner.embed_documents([missing[k] for k in miss_keys])
+            new_items = list(zip(miss_keys, vectors))
+            await self.cache.put_many(new_items)
+            found.update(new_items)
+
+        # Fill a preallocated float32 matrix row by row (no per-row view objects as with np.stack).
+        out = np.empty((len(keys), len(found[keys[0]])), dtype=np.float32)
+        for i, k in enumerate(keys):
+            out[i] = found[k]
+        return out
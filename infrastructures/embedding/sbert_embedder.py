@@ -6,21 +6,48 @@ from __future__ import annotations
 
 from typing import List
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from infrastructures.embedding.embed_batching import BatchingEmbedMixin, embed_in_batches
 
-class SentenceTransformerEmbedder:
-    """真实 embedding 实现 (使用 SentenceTransformers)"""
 
-    def __init__(self, model_name: str, dim: int | None = None):
+class SentenceTransformerEmbedder(BatchingEmbedMixin):
+    """真实 embedding 实现 (使用 SentenceTransformers)
+
+    并发的 embed_query 会被合并为一次 encode 批量调用；
+    encode 按 batch_size 切分后在线程池中执行（最多 max_concurrency 个批次并发），不阻塞事件循环。
+    """
+
+    def __init__(
+            self,
+            model_name: str,
+            dim: int | None = None,
+            *,
+            batch_size: int | None = None,
+            max_concurrency: int | None = None,
+    ):
         self.model_name = model_name
         self.model = SentenceTransformer(model_name)
         self.dim = dim or self.model.get_sentence_embedding_dimension()
-
-    async def embed_query(self, text: str) -> List[float]:
-        emb = self.model.encode([text], normalize_embeddings=True)[0]
-        return emb.tolist()
-
-    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        embs = self.model.encode(texts, normalize_embeddings=True)
-        return [e.tolist() for e in embs]
+        self._init_embed_batching(batch_size=batch_size, max_concurrency=max_concurrency)
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Exact token counts under this model's tokenizer (one batched call; no special tokens)."""
+
+        if not texts:
+            return []
+        encoded = self.model.tokenizer(list(texts), add_special_tokens=False, truncation=False)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        embs = self.model.encode(texts, batch_size=len(texts), normalize_embeddings=True, convert_to_numpy=True)
+        return np.ascontiguousarray(embs, dtype=np.float32)
+
+    async def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return await embed_in_batches(
+            texts,
+            self._encode,
+            batch_size=self.batch_size,
+            max_concurrency=self.max_concurrency,
+        )
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# @Author: yaccii
+# @Description: Similarity cache for query embeddings -> downstream retrieval results.
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import numpy as np
+
+from infrastructures.vconfig import vconfig
+from infrastructures.vlogger import vlogger
+
+_LOG_EVERY = 500
+_MAX_NAMESPACES = 256
+_INITIAL_ROWS = 64
+
+
+class _Bank:
+    """Ring of L2-normalized vectors (one per namespace), bounded by ``capacity``.
+
+    The contiguous buffer starts small and doubles on demand, so sparsely used
+    namespaces don't each pin a full ``capacity x dim`` matrix.
+    """
+
+    __slots__ = ("vecs", "values", "stamps", "capacity", "size", "pos")
+
+    def __init__(self, capacity: int, dim: int) -> None:
+        rows = min(capacity, _INITIAL_ROWS)
+        self.vecs = np.zeros((rows, dim), dtype=np.float32)
+        self.values: List[Any] = [None] * rows
+        self.stamps = np.zeros(rows, dtype=np.float64)
+        self.capacity = capacity
+        self.size = 0
+        self.pos = 0
+
+    def _grow(self) -> None:
+        rows = min(self.capacity, len(self.values) * 2)
+        vecs = np.zeros((rows, self.vecs.shape[1]), dtype=np.float32)
+        vecs[: self.size] = self.vecs[: self.size]
+        stamps = np.zeros(rows, dtype=np.float64)
+        stamps[: self.size] = self.stamps[: self.size]
+        self.vecs = vecs
+        self.stamps = stamps
+        self.values.extend([None] * (rows - len(self.values)))
+
+    def add(self, vec: np.ndarray, value: Any, now: float) -> None:
+        i = self.pos
+        if i == len(self.values) and i < self.capacity:
+            self._grow()
+        self.vecs[i] = vec
+        self.values[i] = value
+        self.stamps[i] = now
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+
+class SemanticQueryCache:
+    """Reuse retrieval results for near-duplicate queries.
+
+    Entries are grouped by namespace (e.g. kb_space + top_k) so results are only
+    reused for the same retrieval parameters. A lookup is one matrix-vector product
+    over the namespace bank; cosine >= threshold and age <= ttl counts as a hit.
+    """
+
+    def __init__(self, *, threshold: float, capacity: int = 10000, ttl_seconds: int = 300) -> None:
+        self.threshold = float(threshold)
+        self.capacity = max(1, int(capacity))
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self._banks: "OrderedDict[str, _Bank]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vec: Any) -> Optional[np.ndarray]:
+        # One owned float32 copy, scaled in place: a single allocation and one extra pass.
+        v = np.array(vec, dtype=np.float32).ravel()
+        n = float(np.sqrt(v @ v))
+        if n == 0.0:
+            return None
+        v *= np.float32(1.0 / n)
+        return v
+
+    def _count(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        total = self.hits + self.misses
+        if total % _LOG_EVERY == 0:
+            vlogger.info("semantic cache hits=%s misses=%s hit_rate=%.3f", self.hits, self.misses, self.hits / total)
+
+    def lookup(self, namespace: str, vec: Any) -> Optional[Any]:
+        q = self._normalize(vec)
+        if q is None:
+            return None
+
+        with self._lock:
+            bank = self._banks.get(namespace)
+            if bank is None or bank.size == 0 or bank.vecs.shape[1] != q.shape[0]:
+                self._count(False)
+                return None
+
+            sims = bank.vecs[: bank.size] @ q
+            if self.ttl_seconds > 0:
+                expired = bank.stamps[: bank.size] < (time.time() - self.ttl_seconds)
+                sims[expired] = -1.0
+
+            best = int(np.argmax(sims))
+            if float(sims[best]) >= self.threshold:
+                self._count(True)
+                return bank.values[best]
+
+            self._count(False)
+            return None
+
+    def add(self, namespace: str, vec: Any, value: Any) -> None:
+        q = self._normalize(vec)
+        if q is None:
+            return
+
+        with self._lock:
+            bank = self._banks.get(namespace)
+            if bank is None or bank.vecs.shape[1] != q.shape[0]:
+                bank = _Bank(self.capacity, q.shape[0])
+                self._banks[namespace] = bank
+                while len(self._banks) > _MAX_NAMESPACES:
+                    self._banks.popitem(last=False)
+            self._banks.move_to_end(namespace)
+            bank.add(q, value, time.time())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._banks.clear()
+
+
+_semantic_cache: Optional[SemanticQueryCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def create_semantic_query_cache() -> Optional[SemanticQueryCache]:
+    """Process singleton; None when SEMANTIC_CACHE_THRESHOLD is 0 (disabled)."""
+
+    global _semantic_cache
+    threshold = float(vconfig.semantic_cache_threshold)
+    if threshold <= 0:
+        return None
+
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticQueryCache(
+                    threshold=threshold,
+                    capacity=int(vconfig.semantic_cache_size),
+                    ttl_seconds=int(vconfig.semantic_cache_ttl_seconds),
+                )
+                vlogger.info("semantic query cache enabled threshold=%s size=%s", threshold,
+                             vconfig.semantic_cache_size)
+    return _semantic_cache
+
+
+def cache_namespace(*parts: Any) -> str:
+    return "|".join(str(p) for p in parts)
+
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# @Author: yaccii
+# @Description: Event loop policy helpers (uvloop when available).
+
+from __future__ import annotations
+
+import asyncio
+
+from infrastructures.vlogger import vlogger
+
+
+def install_uvloop() -> bool:
+    """Switch asyncio to uvloop if it is installed. Call before asyncio.run().
+
+    uvloop (libuv-backed) cuts per-await scheduling overhead on socket-heavy paths such as
+    token streaming from LLM providers. It is unavailable on Windows; there the default
+    loop is kept. The API process does not need this: uvicorn's `--loop auto` already
+    picks uvloop when installed.
+    """
+
+    try:
+        import uvloop  # type: ignore
+    except Exception:
+        vlogger.info("uvloop not available; using default asyncio loop")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    vlogger.info("uvloop event loop installed")
+    return True
@@ -4,13 +4,18 @@
 
 from __future__ import annotations
 
+import functools
+import operator
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, Sequence, List
-
-from elasticsearch import AsyncElasticsearch
-from elasticsearch.helpers import async_bulk
+from typing import TYPE_CHECKING, Dict, Any, Optional, Sequence, List, Set, Tuple
 
 from infrastructures.vconfig import vconfig
+from infrastructures.vlogger import vlogger
+
+if TYPE_CHECKING:
+    from elasticsearch import AsyncElasticsearch
 
 
 def _combat_headers() -> Dict[str, str]:
@@ -20,6 +25,21 @@ def _combat_headers() -> Dict[str, str]:
     }
 
 
+@functools.lru_cache(maxsize=32)
+def _response_shape(
+        source_fields: Optional[Tuple[str, ...]],
+) -> Tuple[Optional[bool], Optional[List[str]], List[str]]:
+    """(source, source_includes, filter_path) for a search; the handful of field sets in use are built once.
+
+    None -> full _source; () -> no _source at all (ids + scores only).
+    """
+    if source_fields is None:
+        return None, None, ["hits.hits._id", "hits.hits._score", "hits.hits._source"]
+    if not source_fields:
+        return False, None, ["hits.hits._id", "hits.hits._score"]
+    return None, list(source_fields), ["hits.hits._id", "hits.hits._score"] + [f"hits.hits._source.{f}" for f in source_fields]
+
+
 @dataclass
 class ESSearchHit:
     chunk_id: str
@@ -37,7 +57,17 @@ class ESIndex:
         else:
             self._enabled = True
 
-        self._client: Optional[AsyncElasticsearch] = None
+        self._client: Optional["AsyncElasticsearch"] = None
+        # Indexes known to exist; ensure_index() skips the round-trip for these.
+        self._ready_indexes: Set[str] = set()
+        self._ready_indexes_listed = False
+
+        # 热点 BM25 查询的进程内 TTL/LRU 缓存；本进程写入某 index 时递增其代号使旧条目失效，
+        # 跨进程写入（worker）靠 TTL 兜底
+        self._search_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._search_cache_size = int(vconfig.es_search_cache_size)
+        self._search_cache_ttl = float(vconfig.es_search_cache_ttl_seconds)
+        self._index_gen: Dict[str, int] = {}
 
     def _require_enabled(self) -> None:
         if not self._enabled:
@@ -49,9 +79,13 @@ class ESIndex:
         kb_space = (kb_space or "default").strip() or "default"
         return f"{prefix}{kb_space}"
 
-    def _get_client(self) -> AsyncElasticsearch:
+    def _get_client(self) -> "AsyncElasticsearch":
         self._require_enabled()
         if self._client is None:
+            # The driver is heavy to import; only pay for it once ES is actually used.
+            from elasticsearch import AsyncElasticsearch
+            from elasticsearch.serializer import OrjsonSerializer
+
             es_url = str(vconfig.es_url or "").strip()
             if not es_url:
                 raise RuntimeError("ES_URL is required when ES_ENABLED=true")
@@ -65,6 +99,13 @@ class ESIndex:
                 "hosts": [es_url],
                 "request_timeout": float(vconfig.es_timeout_seconds),
                 "headers": _combat_headers(),
+                # 单例 client 复用 keep-alive 连接池，bulk/search 并发时不再排队等连接
+                "connections_per_node": int(vconfig.es_connections_per_node),
+                "http_compress": True,
+                "retry_on_timeout": True,
+                "max_retries": int(vconfig.es_max_retries),
+                # bulk 批次编码与响应解码走 orjson
+                "serializer": OrjsonSerializer(),
             }
 
             # python client 8.x：basic_auth / api_key
@@ -81,6 +122,33 @@ class ESIndex:
         if self._client is not None:
             await self._client.close()
             self._client = None
+        self._ready_indexes.clear()
+        self._ready_indexes_listed = False
+        self._search_cache.clear()
+
+    async def warmup(self, kb_space: str = "default") -> bool:
+        """
+        启动预热（best-effort）：加载驱动、建立连接池、列出已有 index，并对已存在的 kb_space index
+        发一次 count 让分片检索路径热起来，避免首个用户检索承担这些冷启动开销。不会创建 index。
+        返回是否预热成功。
+        """
+        if not self._enabled:
+            return False
+        client = self._get_client()
+        index = self._index_name(kb_space)
+        try:
+            resp = await client.indices.get_alias(index=f"{vconfig.es_index_prefix}*")
+            self._ready_indexes.update(resp.keys())
+            self._ready_indexes_listed = True
+            if index in self._ready_indexes:
+                await client.count(index=index)
+        except Exception as e:
+            vlogger.warning("elasticsearch warmup failed index=%s err=%s", index, e)
+            return False
+        return True
+
+    def _invalidate_search_cache(self, index: str) -> None:
+        self._index_gen[index] = self._index_gen.get(index, 0) + 1
 
     async def ensure_index(self, kb_space: str) -> None:
         """
@@ -88,11 +156,20 @@ class ESIndex:
         """
         client = self._get_client()
         index = self._index_name(kb_space)
-
-        exists = await client.indices.exists(index=index)
-        if bool(exists):
+        if index in self._ready_indexes:
             return
 
+        if not self._ready_indexes_listed:
+            # 首次调用一次性列出本项目前缀下已存在的 index，之后各 space 命中集合即可，不再逐个试建
+            self._ready_indexes_listed = True
+            try:
+                resp = await client.indices.get_alias(index=f"{vconfig.es_index_prefix}*")
+                self._ready_indexes.update(resp.keys())
+            except Exception:
+                pass
+            if index in self._ready_indexes:
+                return
+
         mappings = {
             "properties": {
                 "chunk_id": {"type": "keyword"},
@@ -108,9 +185,24 @@ class ESIndex:
         settings = {
             "number_of_shards": int(vconfig.es_number_of_shards),
             "number_of_replicas": int(vconfig.es_number_of_replicas),
+            # 默认与 ES 一致（1s / request）；批量导入场景可通过配置放宽 refresh/translog 换取写入吞吐
+            "refresh_interval": str(vconfig.es_refresh_interval),
+            "translog": {
+                "flush_threshold_size": str(vconfig.es_translog_flush_threshold),
+                "durability": str(vconfig.es_translog_durability),
+            },
         }
 
-        await client.indices.create(index=index, mappings=mappings, settings=settings)
+        # Create-if-missing in one request: an existing index answers 400
+        # resource_already_exists_exception, so no separate HEAD is needed.
+        from elasticsearch import BadRequestError
+
+        try:
+            await client.indices.create(index=index, mappings=mappings, settings=settings)
+        except BadRequestError as e:
+            if e.error != "resource_already_exists_exception":
+                raise
+        self._ready_indexes.add(index)
 
     async def upsert(self, chunks: Sequence[Dict[str, Any]]) -> int:
         """
@@ -127,28 +219,42 @@ class ESIndex:
         await self.ensure_index(kb_space)
         index = self._index_name(kb_space)
 
-        actions = []
-        for c in chunks:
-            chunk_id = str(c["chunk_id"])
-            actions.append(
-                {
+        # chunker 产出的字段类型已确定，直接取值，避免逐条 .get() + 类型转换
+        fields = operator.itemgetter("chunk_id", "kb_space", "document_id", "index_version", "chunk_index", "content")
+
+        def _actions():
+            # 惰性生成：streaming_bulk 按 chunk_size / max_chunk_bytes 分批发送，内存只占一批
+            for c in chunks:
+                chunk_id, space, document_id, index_version, chunk_index, content = fields(c)
+                yield {
                     "_op_type": "index",
                     "_index": index,
                     "_id": chunk_id,
                     "_source": {
                         "chunk_id": chunk_id,
-                        "kb_space": str(c.get("kb_space") or "default"),
-                        "document_id": int(c.get("document_id") or 0),
-                        "index_version": int(c.get("index_version") or 0),
-                        "chunk_index": int(c.get("chunk_index") or 0),
-                        "content": str(c.get("content") or ""),
-                        "meta": dict(c.get("meta") or {}),
+                        "kb_space": space,
+                        "document_id": document_id,
+                        "index_version": index_version,
+                        "chunk_index": chunk_index,
+                        "content": content,
+                        "meta": c.get("meta") or {},
                     },
                 }
-            )
 
-        success, _ = await async_bulk(client, actions, refresh=False)
-        return int(success)
+        from elasticsearch.helpers import async_streaming_bulk
+
+        success = 0
+        async for ok, _ in async_streaming_bulk(
+                client,
+                _actions(),
+                chunk_size=int(vconfig.es_bulk_chunk_size),
+                max_chunk_bytes=int(vconfig.es_bulk_max_bytes),
+                refresh=False,
+        ):
+            if ok:
+                success += 1
+        self._invalidate_search_cache(index)
+        return success
 
     async def delete_by_document(self, kb_space: str, document_id: int, keep_index_version: int) -> int:
         """
@@ -171,6 +277,7 @@ class ESIndex:
         }
 
         resp = await client.delete_by_query(index=index, body=query, refresh=False, conflicts="proceed")
+        self._invalidate_search_cache(index)
         return int(resp.get("deleted") or 0)
 
     async def search(
@@ -180,27 +287,19 @@ class ESIndex:
             *,
             top_k: int = 10,
             document_ids: Optional[Sequence[int]] = None,
+            source_fields: Optional[Sequence[str]] = None,
     ) -> List[ESSearchHit]:
         """
         基于 content 字段做全文检索（BM25）。
+        source_fields: 只取回这些 _source 字段（None 为全部）；未取回的字段在 ESSearchHit 中为默认值。
         """
-        client = self._get_client()
-        await self.ensure_index(kb_space)
-        index = self._index_name(kb_space)
-
-        must: List[Dict[str, Any]] = [{"match": {"content": {"query": query}}}]
-        filt: List[Dict[str, Any]] = [{"term": {"kb_space": kb_space}}]
-
-        if document_ids:
-            filt.append({"terms": {"document_id": [int(x) for x in document_ids]}})
-
-        body = {
-            "size": int(top_k),
-            "query": {"bool": {"must": must, "filter": filt}},
-        }
-
-        resp = await client.search(index=index, body=body)
-        hits = resp.get("hits", {}).get("hits", []) or []
+        hits = await self._search_hits(
+            kb_space,
+            query,
+            top_k=top_k,
+            document_ids=document_ids,
+            source_fields=(tuple(source_fields) if source_fields is not None else None),
+        )
 
         out: List[ESSearchHit] = []
         for h in hits:
@@ -216,3 +315,73 @@ class ESIndex:
                 )
             )
         return out
+
+    async def search_scores(
+            self,
+            kb_space: str,
+            query: str,
+            *,
+            top_k: int = 10,
+            document_ids: Optional[Sequence[int]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        召回专用：只要 (chunk_id, score)。_id 即 chunk_id，不取 _source，也不构造 ESSearchHit。
+        """
+        hits = await self._search_hits(kb_space, query, top_k=top_k, document_ids=document_ids, source_fields=())
+        return [(h["_id"], float(h.get("_score") or 0.0)) for h in hits]
+
+    async def _search_hits(
+            self,
+            kb_space: str,
+            query: str,
+            *,
+            top_k: int,
+            document_ids: Optional[Sequence[int]],
+            source_fields: Optional[Tuple[str, ...]],
+    ) -> List[Dict[str, Any]]:
+        client = self._get_client()
+        await self.ensure_index(kb_space)
+        index = self._index_name(kb_space)
+
+        cache_key: Optional[Tuple[Any, ...]] = None
+        if self._search_cache_size > 0:
+            cache_key = (
+                index,
+                self._index_gen.get(index, 0),
+                query,
+                int(top_k),
+                tuple(int(x) for x in document_ids) if document_ids else None,
+                source_fields,
+            )
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                expires_at, cached_hits = cached
+                if expires_at > time.monotonic():
+                    self._search_cache.move_to_end(cache_key)
+                    return cached_hits
+                del self._search_cache[cache_key]
+
+        must: List[Dict[str, Any]] = [{"match": {"content": {"query": query}}}]
+        # index 已按 kb_space 拆分，kb_space term 恒为真，无需再过滤；其余条件只放 filter 上下文（不计分、可缓存）
+        filt: List[Dict[str, Any]] = []
+
+        if document_ids:
+            filt.append({"terms": {"document_id": [int(x) for x in document_ids]}})
+
+        source, source_includes, filter_path = _response_shape(source_fields)
+
+        resp = await client.search(
+            index=index,
+            query={"bool": {"must": must, "filter": filt}},
+            size=int(top_k),
+            source=source,
+            source_includes=source_includes,
+            filter_path=filter_path,
+        )
+        hits = resp.get("hits", {}).get("hits", []) or []
+
+        if cache_key is not None:
+            self._search_cache[cache_key] = (time.monotonic() + self._search_cache_ttl, hits)
+            while len(self._search_cache) > self._search_cache_size:
+                self._search_cache.popitem(last=False)
+        return hits
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import threading
 from typing import Optional
 
 from infrastructures.index.es_index import ESIndex
@@ -11,17 +12,24 @@ from infrastructures.index.milvus_index import MilvusIndex
 
 _es_singleton: Optional[ESIndex] = None
 _milvus_singleton: Optional[MilvusIndex] = None
+_lock = threading.Lock()
 
 
 def create_es_index() -> ESIndex:
     global _es_singleton
-    if _es_singleton is None:
-        _es_singleton = ESIndex()
+    if _es_singleton is not None:
+        return _es_singleton
+    with _lock:
+        if _es_singleton is None:
+            _es_singleton = ESIndex()
     return _es_singleton
 
 
 def create_milvus_index() -> MilvusIndex:
     global _milvus_singleton
-    if _milvus_singleton is None:
-        _milvus_singleton = MilvusIndex()
+    if _milvus_singleton is not None:
+        return _milvus_singleton
+    with _lock:
+        if _milvus_singleton is None:
+            _milvus_singleton = MilvusIndex()
     return _milvus_singleton
@@ -4,23 +4,88 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Dict, Any, List, Optional, Tuple
+import operator
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Set, Tuple
 
-from pymilvus import connections, Collection, FieldSchema, DataType, CollectionSchema
-from pymilvus.orm import utility
+import numpy as np
 
 from infrastructures.vconfig import vconfig
 
+if TYPE_CHECKING:
+    from pymilvus import Collection
+
+
+_ROW_FIELDS = operator.itemgetter("chunk_id", "kb_space", "document_id", "index_version", "chunk_index")
+
+_SearchKey = Tuple[str, int, Optional[Tuple[int, ...]]]
+
+_SEARCH_PARAMS: Dict[str, Any] = {
+    "nprobe": int(vconfig.milvus_search_nprobe),
+    "ef": int(vconfig.milvus_search_ef),
+    "itopk_size": int(vconfig.milvus_search_ef),
+}
+
+
+def _build_params(index_type: str) -> Dict[str, Any]:
+    """Default build params per index type (used when MILVUS_INDEX_PARAMS is empty)."""
+    if index_type == "GPU_BRUTE_FORCE":
+        return {}
+    if index_type == "GPU_CAGRA":
+        return {
+            "intermediate_graph_degree": int(vconfig.milvus_cagra_graph_degree) * 2,
+            "graph_degree": int(vconfig.milvus_cagra_graph_degree),
+        }
+    # GPU_IVF_FLAT / GPU_IVF_PQ 与 CPU 版参数一致，只是在 GPU 上建索引和检索
+    base_type = index_type[len("GPU_"):] if index_type.startswith("GPU_") else index_type
+    if base_type.startswith("IVF"):
+        params: Dict[str, Any] = {"nlist": int(vconfig.milvus_ivf_nlist)}
+        if base_type == "IVF_PQ":
+            # m sub-quantizers x 8 bits: dim*4 bytes per vector shrink to m bytes
+            params.update({"m": int(vconfig.milvus_pq_m), "nbits": 8})
+        return params
+    if index_type == "HNSW":
+        return {
+            "M": int(vconfig.milvus_hnsw_m),
+            "efConstruction": int(vconfig.milvus_hnsw_ef_construction),
+        }
+    if index_type in ("FLAT", "AUTOINDEX"):
+        return {}
+    # SCANN / DISKANN 等其它类型的参数集不同，套用 HNSW 参数会建出错误的索引，要求显式配置
+    raise ValueError(
+        f"unsupported MILVUS_INDEX_TYPE={index_type!r} without MILVUS_INDEX_PARAMS; "
+        "set MILVUS_INDEX_PARAMS explicitly for this index type"
+    )
+
+
+@lru_cache(maxsize=1024)
+def _document_filter(document_ids: Tuple[int, ...]) -> str:
+    """Milvus boolean expr for a (sorted) document_id set; repeated filters reuse the string."""
+    return f"document_id in [{','.join(map(str, document_ids))}]"
+
 
 class MilvusIndex:
     def __init__(self) -> None:
         self._connected = False
+        # Loaded collections by name: has_collection/describe/load are RPCs, pay them once.
+        self._collections: Dict[str, "Collection"] = {}
+        self._collections_lock = threading.Lock()
+        # 并发的同参数查询在 batch 窗口内合并为一次多向量 search（一次 RPC / 一次批量 GEMM）
+        self._search_batch_ms = int(vconfig.milvus_search_batch_ms)
+        self._search_batch_size = int(vconfig.milvus_search_batch_size)
+        self._search_queues: Dict[_SearchKey, List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self._search_tasks: Set[asyncio.Task] = set()
 
     def _ensure_connected(self) -> None:
         if self._connected or not vconfig.milvus_enabled:
             return
 
+        # pymilvus（gRPC/protobuf）较重：只在 Milvus 真正被使用时才导入
+        from pymilvus import connections
+
         connections.connect(
             alias="default",
             uri=str(vconfig.milvus_uri),
@@ -35,9 +100,24 @@ class MilvusIndex:
         prefix = vconfig.milvus_collection_prefix.strip() or "rag"
         return f"{prefix}_{kb_space}"
 
-    def _ensure_collection(self, kb_space: str, dim: int) -> Collection:
-        self._ensure_connected()
+    def _ensure_collection(self, kb_space: str, dim: int) -> "Collection":
         name = self._collection_name(kb_space)
+        col = self._collections.get(name)
+        if col is not None:
+            return col
+
+        with self._collections_lock:
+            col = self._collections.get(name)
+            if col is None:
+                col = self._open_collection(name, dim)
+                self._collections[name] = col
+        return col
+
+    def _open_collection(self, name: str, dim: int) -> "Collection":
+        self._ensure_connected()
+
+        from pymilvus import Collection, CollectionSchema, DataType, FieldSchema
+        from pymilvus.orm import utility
 
         if not utility.has_collection(name):
             fields = [
@@ -55,13 +135,11 @@ class MilvusIndex:
             if raw:
                 index_params: Dict[str, Any] = json.loads(raw)
             else:
+                index_type = str(vconfig.milvus_index_type).strip().upper()
                 index_params = {
-                    "index_type": str(vconfig.milvus_index_type),
+                    "index_type": index_type,
                     "metric_type": str(vconfig.milvus_metric_type),
-                    "params": {
-                        "M": int(vconfig.milvus_hnsw_m),
-                        "efConstruction": int(vconfig.milvus_hnsw_ef_construction),
-                    },
+                    "params": _build_params(index_type),
                 }
 
             col.create_index(field_name="vector", index_params=index_params)
@@ -72,8 +150,8 @@ class MilvusIndex:
         col.load()
         return col
 
-    async def upsert(self, *, chunks: List[Dict[str, Any]], vectors: List[List[float]]) -> None:
-        if not vconfig.milvus_enabled:
+    async def upsert(self, *, chunks: List[Dict[str, Any]], vectors: np.ndarray) -> None:
+        if not vconfig.milvus_enabled or not chunks:
             return
         if len(chunks) != len(vectors):
             raise ValueError(f"chunks({len(chunks)}) != vectors({len(vectors)})")
@@ -82,18 +160,34 @@ class MilvusIndex:
         if dim <= 0:
             raise ValueError("invalid embedding dim")
 
-        kb_space = str(chunks[0]["kb_space"]) if chunks else "default"
-        col = self._ensure_collection(kb_space=kb_space, dim=dim)
+        kb_space = str(chunks[0]["kb_space"])
 
+        # Column-major in one pass: transpose the row tuples instead of five scans with per-value casts
+        # (chunker output is already typed, as ESIndex.upsert relies on too).
+        chunk_ids, spaces, document_ids, index_versions, chunk_indexes = (
+            list(col) for col in zip(*map(_ROW_FIELDS, chunks))
+        )
         data = [
-            [str(c["chunk_id"]) for c in chunks],
-            [str(c["kb_space"]) for c in chunks],
-            [int(c["document_id"]) for c in chunks],
-            [int(c["index_version"]) for c in chunks],
-            [int(c["chunk_index"]) for c in chunks],
-            vectors,
+            chunk_ids,
+            spaces,
+            document_ids,
+            index_versions,
+            chunk_indexes,
+            # pymilvus takes float32 ndarrays for FLOAT_VECTOR as-is; no per-float list round trip.
+            np.asarray(vectors, dtype=np.float32),
         ]
-        col.upsert(data)
+        # pymilvus is blocking (gRPC + flush); keep it off the event loop so
+        # concurrent writes (e.g. the ES bulk in ingest) actually overlap.
+        await asyncio.to_thread(self._upsert_sync, kb_space, dim, data)
+
+    def _upsert_sync(self, kb_space: str, dim: int, data: List[Any]) -> None:
+        col = self._ensure_collection(kb_space=kb_space, dim=dim)
+        # pymilvus expands every float into the gRPC payload per call; slicing (ndarray views, no copy)
+        # bounds that peak to one batch instead of the whole document.
+        step = int(vconfig.milvus_upsert_batch_size)
+        total = len(data[0])
+        for i in range(0, total, step):
+            col.upsert([column[i: i + step] for column in data] if total > step else data)
         col.flush()
 
     async def delete_by_document(
@@ -121,44 +215,67 @@ class MilvusIndex:
             self,
             *,
             kb_space: str,
-            query_vector: List[float],
+            query_vector: np.ndarray,
             top_k: int,
             document_ids: Optional[List[int]] = None,
     ) -> List[Tuple[str, float]]:
         if not vconfig.milvus_enabled:
             return []
 
+        doc_key = tuple(sorted(int(x) for x in document_ids)) if document_ids else None
+        key: _SearchKey = (str(kb_space), int(top_k), doc_key)
+        if self._search_batch_ms <= 0:
+            results = await asyncio.to_thread(self._search_sync, key, [query_vector])
+            return results[0]
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        queue = self._search_queues.get(key)
+        if queue is None:
+            self._search_queues[key] = [(query_vector, fut)]
+            task = loop.create_task(self._flush_search_queue(key))
+            self._search_tasks.add(task)
+            task.add_done_callback(self._search_tasks.discard)
+        else:
+            queue.append((query_vector, fut))
+        return await fut
+
+    async def _flush_search_queue(self, key: _SearchKey) -> None:
+        await asyncio.sleep(self._search_batch_ms / 1000.0)
+        queue = self._search_queues.pop(key, [])
+        for i in range(0, len(queue), self._search_batch_size):
+            batch = queue[i: i + self._search_batch_size]
+            try:
+                results = await asyncio.to_thread(self._search_sync, key, [q for q, _ in batch])
+            except Exception as e:
+                for _, f in batch:
+                    if not f.done():
+                        f.set_exception(e)
+                continue
+
+            for (_, f), pairs in zip(batch, results):
+                if not f.done():
+                    f.set_result(pairs)
+
+    def _search_sync(self, key: _SearchKey, query_vectors: List[np.ndarray]) -> List[List[Tuple[str, float]]]:
+        kb_space, top_k, document_ids = key
         dim = int(vconfig.embedding_dim)
-        col = self._ensure_collection(kb_space=str(kb_space), dim=dim)
+        col = self._ensure_collection(kb_space=kb_space, dim=dim)
 
-        expr = None
-        if document_ids:
-            ids = ",".join(str(int(x)) for x in document_ids)
-            expr = f"document_id in [{ids}]"
+        expr = _document_filter(document_ids) if document_ids else None
 
         search_params = {
             "metric_type": str(vconfig.milvus_metric_type),
-            "params": {
-                "nprobe": int(vconfig.milvus_search_nprobe),
-                "ef": int(vconfig.milvus_search_ef),
-            },
+            "params": _SEARCH_PARAMS,
         }
 
         results = col.search(
-            data=[query_vector],
+            data=query_vectors,
             anns_field="vector",
             param=search_params,
-            limit=int(top_k),
+            limit=top_k,
             expr=expr,
-            output_fields=["chunk_id"],
         )
 
-        pairs: List[Tuple[str, float]] = []
-        for hits in results:
-            for h in hits:
-                cid = h.entity.get("chunk_id")
-                if cid is None:
-                    continue
-                pairs.append((str(cid), float(h.distance)))
-
-        return pairs
+        # chunk_id 即主键：直接取列式的 ids/distances，无需 output_fields 和逐条 entity 查找
+        return [list(zip(map(str, hits.ids), map(float, hits.distances))) for hits in results]
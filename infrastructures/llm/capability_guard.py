@@ -10,7 +10,15 @@ from typing import Optional
 from domains.llm_model_domain import CapabilityMode, LlmModelProfile
 
 
-@dataclass
+# Capability bits (non-native ASSIST support counts as supported).
+CAP_IMAGE = 1 << 0
+CAP_AUDIO = 1 << 1
+CAP_FILE = 1 << 2
+CAP_STREAM = 1 << 3
+CAP_JSON_SCHEMA = 1 << 4
+
+
+@dataclass(slots=True, frozen=True)
 class CapabilityCheckResult:
     ok: bool
     reason: Optional[str] = None
@@ -53,3 +61,47 @@ def check_request_capabilities(
         return CapabilityCheckResult(False, "model_not_support_json_schema")
 
     return CapabilityCheckResult(True)
+
+
+def capability_mask(profile: LlmModelProfile) -> int:
+    """Fold a profile's capability map into CAP_* bits.
+
+    Capabilities are immutable within a config snapshot, so this is computed once per
+    profile when the snapshot is built and routing only compares integers per request.
+    """
+
+    caps = profile.capabilities
+    mask = 0
+    if _supports(caps.modalities.input_image):
+        mask |= CAP_IMAGE
+    if _supports(caps.modalities.input_audio):
+        mask |= CAP_AUDIO
+    if _supports(caps.modalities.input_file):
+        mask |= CAP_FILE
+    if bool(caps.features.streaming):
+        mask |= CAP_STREAM
+    if bool(caps.features.json_schema):
+        mask |= CAP_JSON_SCHEMA
+    return mask
+
+
+def required_mask(
+    *,
+    need_image: bool = False,
+    need_audio: bool = False,
+    need_file: bool = False,
+    need_stream: bool = False,
+    need_json_schema: bool = False,
+) -> int:
+    mask = 0
+    if need_image:
+        mask |= CAP_IMAGE
+    if need_audio:
+        mask |= CAP_AUDIO
+    if need_file:
+        mask |= CAP_FILE
+    if need_stream:
+        mask |= CAP_STREAM
+    if need_json_schema:
+        mask |= CAP_JSON_SCHEMA
+    return mask
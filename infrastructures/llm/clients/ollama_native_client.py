@@ -4,16 +4,17 @@
 
 from __future__ import annotations
 
-import json
 import time
 from dataclasses import dataclass
 from typing import Any, AsyncIterator, Dict, Optional
 
 import httpx
+import orjson
 
 from infrastructures.llm.errors import (
     LlmAuthError,
     LlmBadRequestError,
+    LlmConfigError,
     LlmProviderError,
     LlmRateLimitError,
     LlmTimeoutError,
@@ -24,7 +25,7 @@ def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OllamaResponse:
     raw: Dict[str, Any]
     latency_ms: int
@@ -34,8 +35,13 @@ class OllamaNativeClient:
     """Ollama native client using /api/chat.
 
     Ollama's streaming returns newline-delimited JSON objects.
+
+    HTTP clients are pooled per base_url at class level, so every instance that
+    targets the same Ollama server shares one keep-alive connection pool.
     """
 
+    _shared_clients: Dict[str, httpx.AsyncClient] = {}
+
     def __init__(
         self,
         *,
@@ -48,8 +54,40 @@ class OllamaNativeClient:
         self.timeout_seconds = max(1, int(timeout_seconds))
         self.provider_tag = provider_tag
         self.default_headers = default_headers or {}
+        if not self.base_url:
+            raise LlmConfigError(f"{provider_tag}: base_url is not configured", details={"provider": provider_tag})
+        # Endpoint and headers are fixed for the client's lifetime: resolve them once.
+        self._request_headers = self._build_headers()
+        self._chat_url = self._url("/api/chat")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        client = self._shared_clients.get(self.base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            )
+            self._shared_clients[self.base_url] = client
+        return client
+
+    async def warmup(self) -> None:
+        """Open a pooled connection ahead of the first chat call (best-effort)."""
+
+        try:
+            await self._get_client().get(self._url("/api/tags"), timeout=httpx.Timeout(5.0))
+        except Exception:
+            return
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool for this base_url."""
+
+        client = self._shared_clients.pop(self.base_url, None)
+        if client is not None:
+            await client.aclose()
 
     def _headers(self) -> Dict[str, str]:
+        return self._request_headers
+
+    def _build_headers(self) -> Dict[str, str]:
         h = {
             "Accept": "application/json",
             "Content-Type": "application/json",
@@ -65,11 +103,11 @@ class OllamaNativeClient:
     async def chat(self, *, payload: Dict[str, Any], timeout_seconds: Optional[int] = None) -> OllamaResponse:
         t0 = _now_ms()
         timeout = httpx.Timeout(float(timeout_seconds or self.timeout_seconds))
-        url = self._url("/api/chat")
+        url = self._chat_url
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                resp = await client.post(url, headers=self._headers(), json=payload)
+            client = self._get_client()
+            resp = await client.post(url, headers=self._headers(), content=orjson.dumps(payload), timeout=timeout)
         except httpx.TimeoutException as e:
             raise LlmTimeoutError(provider=self.provider_tag) from e
         except Exception as e:
@@ -93,7 +131,7 @@ class OllamaNativeClient:
             )
 
         try:
-            j = resp.json()
+            j = orjson.loads(resp.content)
         except Exception as e:
             raise LlmProviderError(
                 "invalid json from upstream",
@@ -108,44 +146,37 @@ class OllamaNativeClient:
         """Yield Ollama JSON lines from /api/chat with stream=true."""
 
         timeout = httpx.Timeout(float(timeout_seconds or self.timeout_seconds), read=None)
-        url = self._url("/api/chat")
+        url = self._chat_url
         payload = dict(payload)
         payload["stream"] = True
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                async with client.stream("POST", url, headers=self._headers(), json=payload) as resp:
-                    if resp.status_code in (401, 403):
-                        raise LlmAuthError(provider=self.provider_tag)
-                    if resp.status_code == 429:
-                        raise LlmRateLimitError(provider=self.provider_tag)
-                    if 400 <= resp.status_code < 500:
-                        txt = (await resp.aread()).decode("utf-8", errors="ignore")
-                        raise LlmBadRequestError("bad request", provider=self.provider_tag, details={"text": txt[:5000]})
-                    if resp.status_code >= 500:
-                        txt = (await resp.aread()).decode("utf-8", errors="ignore")
-                        raise LlmProviderError(
-                            f"upstream error: {resp.status_code}",
-                            provider=self.provider_tag,
-                            retryable=True,
-                            http_status=502,
-                            details={"status_code": resp.status_code, "text": txt[:5000]},
-                        )
-
-                    buf = ""
-                    async for chunk in resp.aiter_text():
-                        if not chunk:
-                            continue
-                        buf += chunk
-                        while "\n" in buf:
-                            line, buf = buf.split("\n", 1)
-                            line = line.strip()
-                            if not line:
-                                continue
-                            try:
-                                yield json.loads(line)
-                            except Exception:
-                                continue
+            client = self._get_client()
+            async with client.stream("POST", url, headers=self._headers(), content=orjson.dumps(payload), timeout=timeout) as resp:
+                if resp.status_code in (401, 403):
+                    raise LlmAuthError(provider=self.provider_tag)
+                if resp.status_code == 429:
+                    raise LlmRateLimitError(provider=self.provider_tag)
+                if 400 <= resp.status_code < 500:
+                    txt = (await resp.aread()).decode("utf-8", errors="ignore")
+                    raise LlmBadRequestError("bad request", provider=self.provider_tag, details={"text": txt[:5000]})
+                if resp.status_code >= 500:
+                    txt = (await resp.aread()).decode("utf-8", errors="ignore")
+                    raise LlmProviderError(
+                        f"upstream error: {resp.status_code}",
+                        provider=self.provider_tag,
+                        retryable=True,
+                        http_status=502,
+                        details={"status_code": resp.status_code, "text": txt[:5000]},
+                    )
+
+                async for line in resp.aiter_lines():
+                    if not line.strip():
+                        continue
+                    try:
+                        yield orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
         except httpx.TimeoutException as e:
             raise LlmTimeoutError(provider=self.provider_tag) from e
         except Exception as e:
@@ -4,27 +4,34 @@
 
 from __future__ import annotations
 
-import json
+import importlib.util
 import time
 from dataclasses import dataclass
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 import httpx
+import orjson
 
 from infrastructures.llm.errors import (
     LlmAuthError,
     LlmBadRequestError,
+    LlmConfigError,
     LlmProviderError,
     LlmRateLimitError,
     LlmTimeoutError,
 )
 
 
+# HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 without it.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_CONNECT_TIMEOUT_SECONDS = 5.0
+
+
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OpenAICompatResponse:
     raw: Dict[str, Any]
     latency_ms: int
@@ -40,8 +47,13 @@ class OpenAICompatibleClient:
     Notes:
       - We do not assume vendor SDK availability; we use httpx directly.
       - Provider adapters decide how to map the unified domain request into OpenAI payload.
+      - HTTP clients are pooled per base_url at class level: providers/gateways that share an
+        endpoint share one keep-alive pool. Auth headers are sent per request, so the API key
+        is not part of the pool key.
     """
 
+    _shared_clients: Dict[Tuple[str, bool], httpx.AsyncClient] = {}
+
     def __init__(
         self,
         *,
@@ -50,36 +62,58 @@ class OpenAICompatibleClient:
         provider_tag: str = "openai_compatible",
         timeout_seconds: int = 60,
         default_headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 512,
+        max_keepalive_connections: int = 256,
+        http2: bool = True,
     ) -> None:
         self.base_url = (base_url or "").rstrip("/")
         self.api_key = api_key or ""
         self.provider_tag = provider_tag
         self.timeout_seconds = max(1, int(timeout_seconds))
         self.default_headers = default_headers or {}
-        # Lazily-created shared HTTP client for this provider instance.
-        # Reusing the client enables connection pooling (keep-alive/TLS reuse),
-        # which significantly reduces per-request overhead under concurrency.
-        self._client: Optional[httpx.AsyncClient] = None
+        self.max_connections = max(1, int(max_connections))
+        self.max_keepalive_connections = max(0, int(max_keepalive_connections))
+        self.http2 = bool(http2) and _HTTP2_AVAILABLE
+        if not self.base_url:
+            raise LlmConfigError(f"{provider_tag}: base_url is not configured", details={"provider": provider_tag})
+        # Credentials and endpoint are fixed for the client's lifetime: resolve them once.
+        self._request_headers = self._build_headers()
+        self._chat_url = self._url("/v1/chat/completions")
+        self._pool_key = (self.base_url, self.http2)
 
     def _get_client(self) -> httpx.AsyncClient:
-        if self._client is not None:
-            return self._client
+        client = self._shared_clients.get(self._pool_key)
+        if client is not None and not client.is_closed:
+            return client
 
         # NOTE: Do not bake auth headers into the client; we still pass them per request
         # to keep behavior identical to the previous implementation.
-        self._client = httpx.AsyncClient()
-        return self._client
+        # The default pool (100 connections, 20 keep-alive) throttles concurrent calls well
+        # below provider rate limits; size it explicitly. Retries stay with the caller.
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=30.0,
+        )
+        # With an explicit transport httpx ignores client-level http2/limits: set them on the transport.
+        client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=0, http2=self.http2, limits=limits),
+            timeout=httpx.Timeout(float(self.timeout_seconds), connect=_CONNECT_TIMEOUT_SECONDS),
+        )
+        self._shared_clients[self._pool_key] = client
+        return client
 
     async def aclose(self) -> None:
-        """Close the underlying connection pool."""
+        """Close the shared connection pool for this base_url."""
 
-        if self._client is not None:
-            try:
-                await self._client.aclose()
-            finally:
-                self._client = None
+        client = self._shared_clients.pop(self._pool_key, None)
+        if client is not None:
+            await client.aclose()
 
     def _headers(self) -> Dict[str, str]:
+        return self._request_headers
+
+    def _build_headers(self) -> Dict[str, str]:
         h = {
             "Accept": "application/json",
             "Content-Type": "application/json",
@@ -96,12 +130,13 @@ class OpenAICompatibleClient:
 
     async def chat_completions(self, *, payload: Dict[str, Any], timeout_seconds: Optional[int] = None) -> OpenAICompatResponse:
         t0 = _now_ms()
-        timeout = httpx.Timeout(float(timeout_seconds or self.timeout_seconds))
-        url = self._url("/v1/chat/completions")
+        # Per-request timeouts replace the client default entirely, so carry connect= here too.
+        timeout = httpx.Timeout(float(timeout_seconds or self.timeout_seconds), connect=_CONNECT_TIMEOUT_SECONDS)
+        url = self._chat_url
 
         try:
             client = self._get_client()
-            resp = await client.post(url, headers=self._headers(), json=payload, timeout=timeout)
+            resp = await client.post(url, headers=self._headers(), content=orjson.dumps(payload), timeout=timeout)
         except httpx.TimeoutException as e:
             raise LlmTimeoutError(provider=self.provider_tag) from e
         except Exception as e:
@@ -128,7 +163,7 @@ class OpenAICompatibleClient:
             )
 
         try:
-            j = resp.json()
+            j = orjson.loads(resp.content)
         except Exception as e:
             raise LlmProviderError(
                 "invalid json from upstream",
@@ -150,14 +185,16 @@ class OpenAICompatibleClient:
         Each yielded element is the parsed JSON dict for a single SSE `data:` line.
         """
 
-        timeout = httpx.Timeout(float(timeout_seconds or self.timeout_seconds), read=None)
-        url = self._url("/v1/chat/completions")
+        timeout = httpx.Timeout(
+            float(timeout_seconds or self.timeout_seconds), connect=_CONNECT_TIMEOUT_SECONDS, read=None
+        )
+        url = self._chat_url
         payload = dict(payload)
         payload["stream"] = True
 
         try:
             client = self._get_client()
-            async with client.stream("POST", url, headers=self._headers(), json=payload, timeout=timeout) as resp:
+            async with client.stream("POST", url, headers=self._headers(), content=orjson.dumps(payload), timeout=timeout) as resp:
                 if resp.status_code in (401, 403):
                     raise LlmAuthError(provider=self.provider_tag)
                 if resp.status_code == 429:
@@ -175,29 +212,21 @@ class OpenAICompatibleClient:
                         details={"status_code": resp.status_code, "text": txt[:5000]},
                     )
 
-                # SSE is line-based. We parse `data: ...` frames.
-                buffer = ""
-                async for chunk in resp.aiter_text():
-                    if not chunk:
+                # SSE is line-based. We parse `data: ...` frames; httpx does the line splitting
+                # incrementally instead of re-slicing a growing string buffer per line.
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if not data:
+                        continue
+                    if data == "[DONE]":
+                        return
+                    try:
+                        yield orjson.loads(data)
+                    except orjson.JSONDecodeError:
+                        # Some gateways may send non-json or partial lines; ignore safely.
                         continue
-                    buffer += chunk
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        line = line.strip()
-                        if not line:
-                            continue
-                        if not line.startswith("data:"):
-                            continue
-                        data = line[len("data:") :].strip()
-                        if not data:
-                            continue
-                        if data == "[DONE]":
-                            return
-                        try:
-                            yield json.loads(data)
-                        except Exception:
-                            # Some gateways may send non-json or partial lines; ignore safely.
-                            continue
         except httpx.TimeoutException as e:
             raise LlmTimeoutError(provider=self.provider_tag) from e
         except Exception as e:
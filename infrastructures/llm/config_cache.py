@@ -5,26 +5,47 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import os
 import time
-from dataclasses import dataclass
-from typing import Dict, Optional, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, List
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.llm_model_domain import LlmModelProfile, LlmFlowPolicy
 from infrastructures.db.repository.llm_config_repository import LlmConfigRepository
+from infrastructures.llm.capability_guard import capability_mask
+from infrastructures.vconfig import vconfig
+from infrastructures.vlogger import vlogger
+
+# Bump when the on-disk snapshot layout (or the domain models it embeds) changes.
+_SNAPSHOT_SCHEMA = 2
 
 
 def _now() -> int:
     return int(time.time())
 
 
-@dataclass
+def _row_digest(*values: Any) -> str:
+    # 按行内容而非 updated_at 判断是否变化：updated_at 只有秒级精度，且直接 SQL 修改不会更新它
+    raw = json.dumps(values, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
 class LlmConfigSnapshot:
     loaded_at: int
     profiles: Dict[str, LlmModelProfile]
     flows: Dict[str, LlmFlowPolicy]
     version_id: Optional[int] = None
+    # profile_id / flow_code -> row content digest, used to reuse unchanged entries on refresh.
+    profile_stamps: Dict[str, str] = field(default_factory=dict)
+    flow_stamps: Dict[str, str] = field(default_factory=dict)
+    # profile_id -> CAP_* bits, precomputed for routing.
+    capability_masks: Dict[str, int] = field(default_factory=dict)
 
 
 class LlmConfigCache:
@@ -32,14 +53,24 @@ class LlmConfigCache:
 
     - The *source of truth* is service DB tables: llm_model_profiles, llm_flow_policies.
     - The cache is intentionally simple: TTL-based refresh with optional version check.
+      While one coroutine refreshes, concurrent callers get the previous snapshot.
+
+    - Optionally, the last loaded snapshot is persisted to `snapshot_path` and used to seed
+      the cache on process start. A seeded snapshot is treated as stale, so the first
+      ensure_loaded() only runs the version check and skips the full reload when the
+      active version is unchanged.
 
     This module is infrastructure-only: callers should provide a db session.
     """
 
-    def __init__(self, *, ttl_seconds: int = 60):
+    def __init__(self, *, ttl_seconds: int = 60, snapshot_path: str = ""):
         self._ttl = max(5, int(ttl_seconds))
         self._snapshot: Optional[LlmConfigSnapshot] = None
         self._lock = asyncio.Lock()
+        self._snapshot_path = str(snapshot_path or "").strip()
+        self._snapshot_dir_ready = False
+        if self._snapshot_path:
+            self._snapshot = self._read_snapshot_file()
 
     def invalidate(self) -> None:
         """Invalidate local cache.
@@ -53,6 +84,58 @@ class LlmConfigCache:
     def snapshot(self) -> Optional[LlmConfigSnapshot]:
         return self._snapshot
 
+    def _read_snapshot_file(self) -> Optional[LlmConfigSnapshot]:
+        try:
+            with open(self._snapshot_path, "rb") as f:
+                data = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            vlogger.warning("llm config snapshot unreadable path=%s err=%s", self._snapshot_path, e)
+            return None
+
+        if not isinstance(data, dict) or data.get("schema") != _SNAPSHOT_SCHEMA:
+            return None
+
+        try:
+            profiles = {pid: LlmModelProfile.model_validate(p) for pid, p in (data.get("profiles") or {}).items()}
+            flows = {code: LlmFlowPolicy.model_validate(f) for code, f in (data.get("flows") or {}).items()}
+        except Exception as e:
+            vlogger.warning("llm config snapshot invalid path=%s err=%s", self._snapshot_path, e)
+            return None
+
+        version_id = data.get("version_id")
+        return LlmConfigSnapshot(
+            loaded_at=0,  # stale: validated against DB on first use
+            profiles=profiles,
+            flows=flows,
+            version_id=int(version_id) if version_id is not None else None,
+            profile_stamps={str(k): str(v) for k, v in (data.get("profile_stamps") or {}).items()},
+            flow_stamps={str(k): str(v) for k, v in (data.get("flow_stamps") or {}).items()},
+            capability_masks={pid: capability_mask(p) for pid, p in profiles.items()},
+        )
+
+    def _write_snapshot_file(self, snap: LlmConfigSnapshot) -> None:
+        data = {
+            "schema": _SNAPSHOT_SCHEMA,
+            "version_id": snap.version_id,
+            "profiles": {pid: p.model_dump(mode="json") for pid, p in snap.profiles.items()},
+            "flows": {code: f.model_dump(mode="json") for code, f in snap.flows.items()},
+            "profile_stamps": snap.profile_stamps,
+            "flow_stamps": snap.flow_stamps,
+        }
+        tmp_path = f"{self._snapshot_path}.tmp"
+        try:
+            if not self._snapshot_dir_ready:
+                os.makedirs(os.path.dirname(os.path.abspath(self._snapshot_path)), exist_ok=True)
+                self._snapshot_dir_ready = True
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_path, self._snapshot_path)
+        except Exception as e:
+            # Best-effort: the DB stays the source of truth.
+            vlogger.warning("llm config snapshot write failed path=%s err=%s", self._snapshot_path, e)
+
     def _is_fresh(self) -> bool:
         if self._snapshot is None:
             return False
@@ -67,6 +150,11 @@ class LlmConfigCache:
         if self._is_fresh():
             return self._snapshot  # type: ignore[return-value]
 
+        # A refresh is already in flight: keep serving the stale snapshot instead of
+        # queueing every request behind the refresher's DB round-trip.
+        if self._snapshot is not None and self._lock.locked():
+            return self._snapshot
+
         # Prevent thundering herd under concurrency: only one coroutine refreshes.
         async with self._lock:
             if self._is_fresh():
@@ -83,8 +171,28 @@ class LlmConfigCache:
             profiles_orm = await LlmConfigRepository.list_model_profiles(db, enabled_only=False, limit=2000)
             flows_orm = await LlmConfigRepository.list_flow_policies(db, limit=2000)
 
+            prev = self._snapshot
             profiles: Dict[str, LlmModelProfile] = {}
+            stamps: Dict[str, str] = {}
             for row in profiles_orm:
+                pid = str(row.profile_id)
+                stamp = _row_digest(
+                    row.provider,
+                    row.model_name,
+                    row.display_name,
+                    row.is_enabled,
+                    row.capabilities_json,
+                    row.limits_json,
+                    row.meta_json,
+                )
+                stamps[pid] = stamp
+
+                # Row content unchanged since the last load: reuse the validated profile
+                # instead of re-running pydantic validation on the capability map.
+                if prev is not None and prev.profile_stamps.get(pid) == stamp and pid in prev.profiles:
+                    profiles[pid] = prev.profiles[pid]
+                    continue
+
                 cap = dict(row.capabilities_json or {})
                 # Backward/forward compatibility: allow limits_json to override/merge.
                 if row.limits_json:
@@ -95,8 +203,8 @@ class LlmConfigCache:
                     elif "limits" not in cap:
                         cap["limits"] = dict(row.limits_json or {})
 
-                profiles[str(row.profile_id)] = LlmModelProfile(
-                    profile_id=str(row.profile_id),
+                profiles[pid] = LlmModelProfile(
+                    profile_id=pid,
                     provider=str(row.provider),  # enum will validate
                     model_name=str(row.model_name),
                     display_name=str(row.display_name),
@@ -106,9 +214,26 @@ class LlmConfigCache:
                 )
 
             flows: Dict[str, LlmFlowPolicy] = {}
+            flow_stamps: Dict[str, str] = {}
             for row in flows_orm:
-                flows[str(row.flow_code)] = LlmFlowPolicy(
-                    flow_code=str(row.flow_code),
+                code = str(row.flow_code)
+                stamp = _row_digest(
+                    row.default_profile_id,
+                    row.allowed_profile_ids_json,
+                    row.fallback_chain_json,
+                    row.default_rag_enabled,
+                    row.default_stream_enabled,
+                    row.multimodal_policy,
+                    row.params_json,
+                )
+                flow_stamps[code] = stamp
+
+                if prev is not None and prev.flow_stamps.get(code) == stamp and code in prev.flows:
+                    flows[code] = prev.flows[code]
+                    continue
+
+                flows[code] = LlmFlowPolicy(
+                    flow_code=code,
                     default_profile_id=str(row.default_profile_id),
                     allowed_profile_ids=list(row.allowed_profile_ids_json or []),
                     fallback_chain=list(row.fallback_chain_json or []),
@@ -118,7 +243,24 @@ class LlmConfigCache:
                     params=(row.params_json or {}),
                 )
 
-            self._snapshot = LlmConfigSnapshot(loaded_at=_now(), profiles=profiles, flows=flows, version_id=version_id)
+            self._snapshot = LlmConfigSnapshot(
+                loaded_at=_now(),
+                profiles=profiles,
+                flows=flows,
+                version_id=version_id,
+                profile_stamps=stamps,
+                flow_stamps=flow_stamps,
+                capability_masks={
+                    pid: (
+                        prev.capability_masks[pid]
+                        if prev is not None and prev.profiles.get(pid) is p and pid in prev.capability_masks
+                        else capability_mask(p)
+                    )
+                    for pid, p in profiles.items()
+                },
+            )
+            if self._snapshot_path:
+                self._write_snapshot_file(self._snapshot)
             return self._snapshot
 
     async def get_profile(self, db: AsyncSession, profile_id: str) -> Optional[LlmModelProfile]:
@@ -148,4 +290,7 @@ class LlmConfigCache:
 
 
 # A process-local singleton is typically fine; refresh controlled by TTL/version.
-llm_config_cache = LlmConfigCache(ttl_seconds=60)
+llm_config_cache = LlmConfigCache(
+    ttl_seconds=vconfig.llm_config_cache_ttl_seconds,
+    snapshot_path=vconfig.llm_config_snapshot_path,
+)
@@ -20,15 +20,16 @@ from domains.llm_request_domain import (
 from infrastructures.llm.errors import LlmUnsupportedModalityError
 
 
+# part type -> ModalityCapabilities field, resolved once at import.
+_MODE_FIELD: Dict[InputPartType, str] = {
+    InputPartType.image: "input_image",
+    InputPartType.audio: "input_audio",
+    InputPartType.file: "input_file",
+}
+
+
 def _mode_of(profile: LlmModelProfile, part_type: InputPartType) -> CapabilityMode:
-    m = profile.capabilities.modalities
-    if part_type == InputPartType.image:
-        return m.input_image
-    if part_type == InputPartType.audio:
-        return m.input_audio
-    if part_type == InputPartType.file:
-        return m.input_file
-    return m.input_text
+    return getattr(profile.capabilities.modalities, _MODE_FIELD.get(part_type, "input_text"))
 
 
 class MultimodalAssistPreprocessor:
@@ -81,7 +82,7 @@ class MultimodalAssistPreprocessor:
                     return idx, out, {
                         "type": "file",
                         "asset_uri": part.asset_uri,
-                        "file_name": getattr(part, "file_name", None),
+                        "file_name": part.file_name,
                         "text_len": len(txt),
                     }
 
@@ -90,14 +91,14 @@ class MultimodalAssistPreprocessor:
         tasks: List[asyncio.Task] = []
 
         for idx, p in enumerate(req.input_parts):
-            if isinstance(p, TextPart) or getattr(p, "type", None) == InputPartType.text:
+            # Dispatch on the class first: InputPart is a plain (non-discriminated) Union, so a
+            # {"type": "image", "text": ...} payload validates to TextPart(type=image) and must
+            # still be treated as text. Every variant declares `type`, so no attribute probing.
+            ptype = p.type
+            if isinstance(p, TextPart) or ptype == InputPartType.text:
                 out_slots[idx].append(p)
                 continue
 
-            ptype = getattr(p, "type", None)
-            if ptype is None:
-                continue
-
             mode = _mode_of(profile, ptype)
             if mode == CapabilityMode.native:
                 out_slots[idx].append(p)
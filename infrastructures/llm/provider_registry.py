@@ -4,55 +4,78 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Dict
+import importlib
+import threading
+from typing import Dict, Iterable, Optional, Tuple
 
 from domains.llm_model_domain import LlmProvider
-from infrastructures.llm.providers import (
-    DeepSeekProvider,
-    GeminiProvider,
-    OllamaProvider,
-    OpenAIProvider,
-    QwenProvider,
-)
+
+# provider -> (module path, class name). Modules are imported on first use only,
+# so a process that never talks to a provider never pays for importing it.
+_PROVIDER_DISPATCH: Dict[str, Tuple[str, str]] = {
+    LlmProvider.openai.value: ("infrastructures.llm.providers.openai_provider", "OpenAIProvider"),
+    LlmProvider.gemini.value: ("infrastructures.llm.providers.gemini_provider", "GeminiProvider"),
+    LlmProvider.deepseek.value: ("infrastructures.llm.providers.deepseek_provider", "DeepSeekProvider"),
+    LlmProvider.qwen.value: ("infrastructures.llm.providers.qwen_provider", "QwenProvider"),
+    LlmProvider.ollama.value: ("infrastructures.llm.providers.ollama_provider", "OllamaProvider"),
+}
+
+_providers: Dict[str, object] = {}
+_lock = threading.Lock()
 
 
-@lru_cache(maxsize=1)
 def get_provider_registry() -> Dict[str, object]:
-    """Create provider singletons.
+    """Return provider singletons created so far.
 
-    The registry is intentionally process-local.
+    The registry is intentionally process-local. Providers are created lazily
+    by get_provider(); this view is used by shutdown hooks.
     """
 
-    return {
-        LlmProvider.openai.value: OpenAIProvider(),
-        LlmProvider.gemini.value: GeminiProvider(),
-        LlmProvider.deepseek.value: DeepSeekProvider(),
-        LlmProvider.qwen.value: QwenProvider(),
-        LlmProvider.ollama.value: OllamaProvider(),
-    }
+    return _providers
+
+
+def get_provider(provider: str) -> Optional[object]:
+    key = str(provider)
+    p = _providers.get(key)
+    if p is not None:
+        return p
 
+    target = _PROVIDER_DISPATCH.get(key)
+    if target is None:
+        return None
 
-def get_provider(provider: str):
-    reg = get_provider_registry()
-    return reg.get(str(provider))
+    with _lock:
+        p = _providers.get(key)
+        if p is None:
+            module_path, class_name = target
+            cls = getattr(importlib.import_module(module_path), class_name)
+            p = cls()
+            _providers[key] = p
+    return p
+
+
+async def warm_provider_registry(providers: Iterable[str]) -> None:
+    """Best-effort startup hook: create the given providers and pre-warm their connections."""
+
+    for name in providers:
+        try:
+            p = get_provider(name)
+            warmup = getattr(p, "warmup", None)
+            if callable(warmup):
+                await warmup()
+        except Exception:
+            continue
 
 
 async def close_provider_registry() -> None:
     """Best-effort shutdown hook to close provider resources.
 
-    This keeps existing behavior intact (providers are still lazily created
-    via get_provider_registry()), while allowing network clients to close
-    their connection pools on application shutdown.
+    Only providers that were actually created are closed, allowing network
+    clients to release their connection pools on application shutdown.
     """
 
     try:
-        # If registry hasn't been created yet, do nothing.
-        if get_provider_registry.cache_info().currsize <= 0:
-            return
-
-        reg = get_provider_registry()
-        for p in reg.values():
+        for p in list(_providers.values()):
             aclose = getattr(p, "aclose", None)
             if callable(aclose):
                 try:
@@ -2,18 +2,28 @@
 # @Author: yaccii
 # @Description: Provider adapters.
 
-from infrastructures.llm.providers.provider_base import LlmProviderBase
-from infrastructures.llm.providers.openai_provider import OpenAIProvider
-from infrastructures.llm.providers.gemini_provider import GeminiProvider
-from infrastructures.llm.providers.deepseek_provider import DeepSeekProvider
-from infrastructures.llm.providers.qwen_provider import QwenProvider
-from infrastructures.llm.providers.ollama_provider import OllamaProvider
+from __future__ import annotations
 
-__all__ = [
-    "LlmProviderBase",
-    "OpenAIProvider",
-    "GeminiProvider",
-    "DeepSeekProvider",
-    "QwenProvider",
-    "OllamaProvider",
-]
+import importlib
+from typing import Any
+
+# 名称 -> 模块；按需导入，避免 import 本包就拉起全部 provider SDK（provider_registry 依赖这一点做懒加载）
+_LAZY_EXPORTS = {
+    "LlmProviderBase": "infrastructures.llm.providers.provider_base",
+    "OpenAIProvider": "infrastructures.llm.providers.openai_provider",
+    "GeminiProvider": "infrastructures.llm.providers.gemini_provider",
+    "DeepSeekProvider": "infrastructures.llm.providers.deepseek_provider",
+    "QwenProvider": "infrastructures.llm.providers.qwen_provider",
+    "OllamaProvider": "infrastructures.llm.providers.ollama_provider",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
@@ -44,6 +44,16 @@ class OllamaProvider(LlmProviderBase):
             provider_tag="ollama",
         )
 
+    async def warmup(self) -> None:
+        await self._client.warmup()
+
+    async def aclose(self) -> None:
+        try:
+            await self._client.aclose()
+        except Exception:
+            # Best-effort: shutdown should not crash the process.
+            return None
+
     def _build_messages(self, req: LlmRequest) -> List[Dict[str, Any]]:
         msgs: List[Dict[str, Any]] = []
         if req.system_prompt:
@@ -52,7 +62,7 @@ class OllamaProvider(LlmProviderBase):
             msgs.append({"role": str(m.role.value), "content": str(m.content or "")})
 
         if req.input_parts:
-            has_non_text = any(getattr(p, "type", None) != InputPartType.text for p in req.input_parts)
+            has_non_text = any(p.type != InputPartType.text for p in req.input_parts)
             if has_non_text:
                 # Native Ollama /api/chat does not accept multimodal parts.
                 # Use ASSIST policy (OCR/ASR/file parsing) before reaching provider.
@@ -61,9 +71,9 @@ class OllamaProvider(LlmProviderBase):
                         raise LlmUnsupportedModalityError(
                             "Ollama native chat does not accept image/audio/file parts directly; parse to text first.",
                             provider=self.provider_name,
-                            details={"part_type": str(getattr(p, "type", "")), "asset_uri": getattr(p, "asset_uri", None)},
+                            details={"part_type": str(p.type), "asset_uri": p.asset_uri},
                         )
-            text = "\n".join([str(getattr(p, "text", "")).strip() for p in req.input_parts if isinstance(p, TextPart)])
+            text = "\n".join([p.text.strip() for p in req.input_parts if isinstance(p, TextPart)])
             if text.strip():
                 msgs.append({"role": "user", "content": text.strip()})
 
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import base64
 import json
+import mmap
 import os
 from typing import Any, AsyncIterator, Dict, List, Optional
 
@@ -41,7 +42,7 @@ def _extract_model_name(profile_id: str) -> str:
     return profile_id
 
 
-def _load_local_bytes(storage_uri: str) -> bytes:
+def _local_path(storage_uri: str) -> str:
     if storage_uri.startswith("local:"):
         path = storage_uri[len("local:") :]
     else:
@@ -50,15 +51,20 @@ def _load_local_bytes(storage_uri: str) -> bytes:
 
     if not os.path.isfile(path):
         raise FileNotFoundError(path)
-    with open(path, "rb") as f:
-        return f.read()
+    return path
 
 
 def _to_data_url(*, storage_uri: str, mime_type: str) -> str:
-    b = _load_local_bytes(storage_uri)
-    enc = base64.b64encode(b).decode("utf-8")
+    # Encode straight from a read-only mapping: the raw file never becomes a heap bytes
+    # copy, only the base64 output does.
+    with open(_local_path(storage_uri), "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            enc = b""
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                enc = base64.b64encode(mm)
     mt = mime_type or "application/octet-stream"
-    return f"data:{mt};base64,{enc}"
+    return f"data:{mt};base64,{enc.decode('ascii')}"
 
 
 class OpenAICompatibleProviderBase(LlmProviderBase):
@@ -93,9 +99,9 @@ class OpenAICompatibleProviderBase(LlmProviderBase):
             msgs.append({"role": str(m.role.value), "content": str(m.content or "")})
 
         if req.input_parts:
-            has_non_text = any(getattr(p, "type", None) != InputPartType.text for p in req.input_parts)
+            has_non_text = any(p.type != InputPartType.text for p in req.input_parts)
             if not has_non_text:
-                text = "\n".join([str(getattr(p, "text", "")).strip() for p in req.input_parts if getattr(p, "text", "")])
+                text = "\n".join([p.text.strip() for p in req.input_parts if isinstance(p, TextPart) and p.text])
                 if text.strip():
                     msgs.append({"role": "user", "content": text.strip()})
             else:
@@ -116,7 +122,7 @@ class OpenAICompatibleProviderBase(LlmProviderBase):
                         raise LlmUnsupportedModalityError(
                             "OpenAI-compatible chat/completions does not accept audio/file parts directly; please parse to text before calling provider.",
                             provider=self.provider_name,
-                            details={"part_type": str(getattr(p, "type", "")), "asset_uri": getattr(p, "asset_uri", None)},
+                            details={"part_type": str(p.type), "asset_uri": p.asset_uri},
                         )
 
                 if parts:
@@ -177,11 +183,11 @@ class OpenAICompatibleProviderBase(LlmProviderBase):
         return LlmUsage(input_tokens=inp, output_tokens=out, total_tokens=tot)
 
     def _parse_text(self, raw: Dict[str, Any]) -> str:
-        choices = raw.get("choices") or []
-        if not choices:
+        # EAFP: the response shape is fixed, so index straight into the happy path.
+        try:
+            return str(raw["choices"][0]["message"]["content"] or "")
+        except (KeyError, IndexError, TypeError):
             return ""
-        msg = (choices[0] or {}).get("message") or {}
-        return str(msg.get("content") or "")
 
     async def generate(self, req: LlmRequest) -> LlmResponse:
         payload = self._build_payload(req)
@@ -216,11 +222,11 @@ class OpenAICompatibleProviderBase(LlmProviderBase):
         async for chunk in self._client.chat_completions_stream(payload=payload, timeout_seconds=req.timeout_seconds):
             # Standard OpenAI chunk format
             try:
-                choices = chunk.get("choices") or []
-                if not choices:
-                    continue
-                c0 = choices[0] or {}
-                delta = (c0.get("delta") or {}).get("content")
+                c0 = chunk["choices"][0]
+                try:
+                    delta = c0["delta"]["content"]
+                except (KeyError, TypeError):
+                    delta = None
                 finish = c0.get("finish_reason")
 
                 if delta:
@@ -28,6 +28,11 @@ class LlmProviderBase(ABC):
     async def stream(self, req: LlmRequest) -> AsyncIterator[StreamEvent]:
         raise NotImplementedError
 
+    async def warmup(self) -> None:
+        """Optional pre-warm hook (e.g. open pooled connections at startup)."""
+
+        return None
+
     async def aclose(self) -> None:
         """Optional resource cleanup hook.
 
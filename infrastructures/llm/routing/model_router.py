@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.llm_model_domain import LlmModelProfile
 from infrastructures.llm.config_cache import llm_config_cache
-from infrastructures.llm.capability_guard import check_request_capabilities
+from infrastructures.llm.capability_guard import capability_mask, required_mask
 
 
 @dataclass
@@ -52,6 +52,14 @@ class ModelRouter:
             if pid and pid not in ordered:
                 ordered.append(pid)
 
+        need = required_mask(
+            need_image=need_image,
+            need_audio=need_audio,
+            need_file=need_file,
+            need_stream=need_stream,
+            need_json_schema=need_json_schema,
+        )
+
         candidates: List[str] = []
         for pid in ordered:
             prof: Optional[LlmModelProfile] = snap.profiles.get(str(pid))
@@ -61,15 +69,10 @@ class ModelRouter:
                 continue
 
             candidates.append(str(pid))
-            chk = check_request_capabilities(
-                prof,
-                need_image=need_image,
-                need_audio=need_audio,
-                need_file=need_file,
-                need_stream=need_stream,
-                need_json_schema=need_json_schema,
-            )
-            if chk.ok:
+            mask = snap.capability_masks.get(str(pid))
+            if mask is None:
+                mask = capability_mask(prof)
+            if (need & ~mask) == 0:
                 return RouteResult(ok=True, profile_id=str(pid), candidates=candidates)
 
         return RouteResult(ok=False, reason="no_candidate_satisfies_capability", candidates=candidates)
@@ -4,15 +4,34 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
+
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_OTHER_RE = re.compile(r"[^\s\u4e00-\u9fffA-Za-z0-9]")
 
 
 class Chunker:
-    def __init__(self, *, max_chars: int = 800, overlap: int = 80) -> None:
+    def __init__(
+            self,
+            *,
+            max_chars: int = 800,
+            overlap: int = 80,
+            token_counter: Optional[Callable[[List[str]], List[int]]] = None,
+            dedup: bool = True,
+    ) -> None:
         self.max_chars = int(max_chars)
         self.overlap = int(overlap)
+        # Optional exact counter (e.g. the embedder's tokenizer), called once per document
+        # with every chunk in a worker thread (tokenizing is CPU-bound and would block the
+        # event loop); without it token_count falls back to _estimate_token_count.
+        self.token_counter = token_counter
+        # Drop chunks whose content repeats an earlier chunk of the same document
+        # (headers/footers/disclaimers), so they are embedded and indexed once.
+        self.dedup = bool(dedup)
 
     async def chunk(
             self,
@@ -38,52 +57,60 @@ class Chunker:
         buf_text_parts: List[str] = []
         buf_locs: List[Dict[str, Any]] = []
         buf_start_char: Optional[int] = None
+        # len("\n".join(buf_text_parts)), kept incrementally instead of re-joining per piece.
+        buf_len = 0
         global_char = 0
+        seen_hashes: Set[str] = set()
 
-        def flush_chunk(c_index: int) -> None:
-            nonlocal buf_text_parts, buf_locs, buf_start_char
+        def flush_chunk(c_index: int) -> bool:
+            nonlocal buf_text_parts, buf_locs, buf_start_char, buf_len
 
             content = "\n".join([p for p in buf_text_parts if p]).strip()
             if not content:
                 buf_text_parts = []
                 buf_locs = []
                 buf_start_char = None
-                return
+                buf_len = 0
+                return False
 
             char_start = int(buf_start_char or 0)
             char_end = int(char_start + len(content))
 
-            locator = self._merge_locator(buf_locs, char_start=char_start, char_end=char_end)
-
-            chunk_id = self._sha1_hex(f"{int(document_id)}:{int(index_version)}:{int(c_index)}")
             content_hash = self._sha256_hex(content.encode("utf-8"))
-            token_count = self._estimate_token_count(content)
-
-            chunks.append(
-                {
-                    "chunk_id": chunk_id,
-                    "document_id": int(document_id),
-                    "kb_space": str(kb_space),
-                    "index_version": int(index_version),
-                    "chunk_index": int(c_index),
-                    "modality": modality,
-                    "locator": locator,
-                    "content": content,
-                    "content_hash": content_hash,
-                    "token_count": int(token_count),
-
-                }
-            )
+            emit = not (self.dedup and content_hash in seen_hashes)
+            if emit:
+                seen_hashes.add(content_hash)
+                locator = self._merge_locator(buf_locs, char_start=char_start, char_end=char_end)
+                chunk_id = self._sha1_hex(f"{int(document_id)}:{int(index_version)}:{int(c_index)}")
+                token_count = self._estimate_token_count(content) if self.token_counter is None else 0
+
+                chunks.append(
+                    {
+                        "chunk_id": chunk_id,
+                        "document_id": int(document_id),
+                        "kb_space": str(kb_space),
+                        "index_version": int(index_version),
+                        "chunk_index": int(c_index),
+                        "modality": modality,
+                        "locator": locator,
+                        "content": content,
+                        "content_hash": content_hash,
+                        "token_count": int(token_count),
+                    }
+                )
 
             if 0 < overlap < len(content):
                 tail = content[-overlap:]
                 buf_text_parts = [tail]
                 buf_locs = [buf_locs[-1]] if buf_locs else []
                 buf_start_char = char_end - overlap
+                buf_len = len(tail)
             else:
                 buf_text_parts = []
                 buf_locs = []
                 buf_start_char = None
+                buf_len = 0
+            return emit
 
         chunk_index = 0
         for seg_text, seg_loc in segs:
@@ -100,13 +127,14 @@ class Chunker:
                 if buf_start_char is None:
                     buf_start_char = global_char
 
-                projected_len = len("\n".join(buf_text_parts + [piece]))
+                projected_len = buf_len + len(piece) + (1 if buf_text_parts else 0)
                 if projected_len > max_chars and buf_text_parts:
-                    flush_chunk(chunk_index)
-                    chunk_index += 1
+                    if flush_chunk(chunk_index):
+                        chunk_index += 1
                     if buf_start_char is None:
                         buf_start_char = global_char
 
+                buf_len += len(piece) + (1 if buf_text_parts else 0)
                 buf_text_parts.append(piece)
                 if isinstance(seg_loc, dict) and seg_loc:
                     buf_locs.append(seg_loc)
@@ -116,6 +144,11 @@ class Chunker:
         if buf_text_parts:
             flush_chunk(chunk_index)
 
+        if self.token_counter is not None and chunks:
+            counts = await asyncio.to_thread(self.token_counter, [c["content"] for c in chunks])
+            for c, n in zip(chunks, counts):
+                c["token_count"] = int(n)
+
         return chunks
 
     @staticmethod
@@ -139,16 +172,12 @@ class Chunker:
         return segs
 
     @staticmethod
-    def _split_large(text: str, *, max_chars: int) -> List[str]:
-        if len(text) <= max_chars:
-            return [text]
-        out: List[str] = []
-        start = 0
-        while start < len(text):
-            end = min(len(text), start + max_chars)
-            out.append(text[start:end])
-            start = end
-        return out
+    def _split_large(text: str, *, max_chars: int) -> Iterable[str]:
+        # Windows are sliced lazily: a multi-MB segment is never duplicated into a list of pieces.
+        n = len(text)
+        if n <= max_chars:
+            return (text,)
+        return (text[i: i + max_chars] for i in range(0, n, max_chars))
 
     @staticmethod
     def _merge_locator(locs: List[Dict[str, Any]], *, char_start: int, char_end: int) -> Dict[str, Any]:
@@ -215,7 +244,7 @@ class Chunker:
 
         if not text:
             return 0
-        cjk = len(re.findall(r"[\u4e00-\u9fff]", text))
-        words = len(re.findall(r"[A-Za-z0-9]+", text))
-        other = len(re.findall(r"[^\s\u4e00-\u9fffA-Za-z0-9]", text))
+        cjk = len(_CJK_RE.findall(text))
+        words = len(_WORD_RE.findall(text))
+        other = len(_OTHER_RE.findall(text))
         return int(cjk + words + (other // 4))
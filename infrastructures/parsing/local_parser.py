@@ -66,7 +66,7 @@ class LocalParser:
 
         self.router = ParserRouter(
             text_parser=TextParser(),
-            pdf_parser=PdfParser(),
+            pdf_parser=PdfParser(workers=vconfig.pdf_parse_workers),
             docx_parser=DocxParser(),
             image_parser=image_parser,
             audio_parser=audio_parser,
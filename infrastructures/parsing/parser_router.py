@@ -5,10 +5,45 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from infrastructures.parsing.parser_base import ParseError, Parser
 
+_DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# When extension and content type disagree, the earlier kind wins (pdf > docx > image > audio).
+_KIND_RANK: Dict[str, int] = {"pdf": 0, "docx": 1, "image": 2, "audio": 3}
+
+_EXT_KINDS: Dict[str, str] = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    **dict.fromkeys((".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tiff"), "image"),
+    **dict.fromkeys((".mp3", ".wav", ".m4a", ".flac", ".aac", ".ogg"), "audio"),
+}
+_MIME_KINDS: Dict[str, str] = {"application/pdf": "pdf", _DOCX_MIME: "docx"}
+_MIME_MAJOR_KINDS: Dict[str, str] = {"image": "image", "audio": "audio"}
+
+
+def _mime_kind(ctype: str) -> Optional[str]:
+    mime = ctype.split(";", 1)[0].strip()
+    kind = _MIME_KINDS.get(mime)
+    if kind is not None:
+        return kind
+    # Loose substring matches (x-pdf, vendor suffixes, ...) rank above the major type.
+    if "pdf" in ctype:
+        return "pdf"
+    if _DOCX_MIME in ctype:
+        return "docx"
+    return _MIME_MAJOR_KINDS.get(mime.partition("/")[0])
+
+
+def _resolve_kind(*, ctype: str, ext: str) -> Optional[str]:
+    by_ext = _EXT_KINDS.get(ext)
+    by_mime = _mime_kind(ctype) if ctype else None
+    if by_ext is None or by_mime is None:
+        return by_ext or by_mime
+    return by_ext if _KIND_RANK[by_ext] <= _KIND_RANK[by_mime] else by_mime
+
 
 class ParserRouter:
     def __init__(
@@ -29,29 +64,34 @@ class ParserRouter:
         self.audio_parser = audio_parser
         self.enable_image_ocr = bool(enable_image_ocr)
         self.enable_audio_asr = bool(enable_audio_asr)
+        # kind -> parser resolver, built once; unknown kinds fall through to text_parser.
+        self._dispatch: Dict[str, Callable[[], Parser]] = {
+            "pdf": lambda: self.pdf_parser,
+            "docx": self._docx,
+            "image": self._image,
+            "audio": self._audio,
+        }
+
+    def _docx(self) -> Parser:
+        if self.docx_parser is None:
+            raise ParseError("docx parser not configured", retryable=False)
+        return self.docx_parser
+
+    def _image(self) -> Parser:
+        if not self.enable_image_ocr or self.image_parser is None:
+            raise ParseError("image parsing disabled (ENABLE_IMAGE_OCR=false)", retryable=False)
+        return self.image_parser
+
+    def _audio(self) -> Parser:
+        if not self.enable_audio_asr or self.audio_parser is None:
+            raise ParseError("audio parsing disabled (ENABLE_AUDIO_ASR=false)", retryable=False)
+        return self.audio_parser
 
     async def parse(self, *, storage_uri: str, content_type: str) -> Dict[str, Any]:
         ctype = (content_type or "").lower()
         path = storage_uri[len("local:"):] if storage_uri.startswith("local:") else storage_uri
         ext = os.path.splitext(path)[1].lower()
 
-        # PDF
-        if "pdf" in ctype or ext == ".pdf":
-            return await self.pdf_parser.parse(storage_uri=storage_uri, content_type=content_type)
-
-        if ("application/vnd.openxmlformats-officedocument.wordprocessingml.document" in ctype or ext == ".docx"):
-            if self.docx_parser is None:
-                raise ParseError("docx parser not configured", retryable=False)
-            return await self.docx_parser.parse(storage_uri=storage_uri, content_type=content_type)
-
-        if ctype.startswith("image/") or ext in {".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tiff"}:
-            if not self.enable_image_ocr or self.image_parser is None:
-                raise ParseError("image parsing disabled (ENABLE_IMAGE_OCR=false)", retryable=False)
-            return await self.image_parser.parse(storage_uri=storage_uri, content_type=content_type)
-
-        if ctype.startswith("audio/") or ext in {".mp3", ".wav", ".m4a", ".flac", ".aac", ".ogg"}:
-            if not self.enable_audio_asr or self.audio_parser is None:
-                raise ParseError("audio parsing disabled (ENABLE_AUDIO_ASR=false)", retryable=False)
-            return await self.audio_parser.parse(storage_uri=storage_uri, content_type=content_type)
-
-        return await self.text_parser.parse(storage_uri=storage_uri, content_type=content_type)
+        kind = _resolve_kind(ctype=ctype, ext=ext)
+        parser = self._dispatch[kind]() if kind is not None else self.text_parser
+        return await parser.parse(storage_uri=storage_uri, content_type=content_type)
@@ -5,38 +5,118 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, Any, List
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
 
 from pypdf import PdfReader
 
 from infrastructures.parsing.parser_base import Parser, ParseError
 
+# Below this page count the process round-trip costs more than it saves.
+_POOL_MIN_PAGES = 16
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the parent runs an event loop and model threads; forking it is unsafe.
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """Process-pool task: (page_no, text) for pages [start, end). Must stay top-level (picklable)."""
+
+    reader = PdfReader(path)
+    out: List[Tuple[int, str]] = []
+    for i in range(start, end):
+        out.append((i + 1, (reader.pages[i].extract_text() or "").strip()))
+    return out
+
 
 class PdfParser(Parser):
+    """pypdf text extraction.
+
+    Large PDFs are split into page ranges and extracted in a shared process pool
+    (extract_text is pure-Python CPU work, so threads would serialize on the GIL).
+    """
+
+    def __init__(self, *, workers: int = 0) -> None:
+        self.workers = max(0, int(workers))
+
     async def parse(self, *, storage_uri: str, content_type: str) -> Dict[str, Any]:
         path = self._to_local_path(storage_uri)
 
-        def _parse_sync(p: str) -> Dict[str, Any]:
+        def _open_sync(p: str) -> PdfReader:
             try:
-                reader = PdfReader(p)
+                return PdfReader(p)
             except Exception as e:
                 raise ParseError(f"pdf parse failed: {e}", retryable=False) from e
 
-            parts: List[str] = []
-            elements: List[Dict[str, Any]] = []
-            for i, page in enumerate(reader.pages):
-                page_text = (page.extract_text() or "").strip()
-                if not page_text:
-                    continue
-                parts.append(page_text)
-                elements.append({"type": "text", "text": page_text, "locator": {"page": int(i + 1)}})
+        def _parse_sync(reader: PdfReader) -> List[Tuple[int, str]]:
+            return [(i + 1, (page.extract_text() or "").strip()) for i, page in enumerate(reader.pages)]
 
-            text = "\n".join(parts).strip()
-            if not text:
-                raise ParseError("pdf has no extractable text", retryable=False)
+        # PdfReader + extract_text are synchronous and can be CPU-heavy.
+        # Run off the FastAPI event loop.
+        reader = await asyncio.to_thread(_open_sync, path)
+        n_pages = len(reader.pages)
 
-            return {"text": text, "elements": elements, "source_modality": "pdf"}
+        if self.workers > 1 and n_pages >= _POOL_MIN_PAGES:
+            pages = await self._extract_in_pool(path, n_pages)
+        else:
+            pages = await asyncio.to_thread(_parse_sync, reader)
 
-        # PdfReader + extract_text are synchronous and can be CPU-heavy.
-        # Run in a thread to avoid blocking the FastAPI event loop.
-        return await asyncio.to_thread(_parse_sync, path)
+        parts: List[str] = []
+        elements: List[Dict[str, Any]] = []
+        for page_no, page_text in pages:
+            if not page_text:
+                continue
+            parts.append(page_text)
+            elements.append({"type": "text", "text": page_text, "locator": {"page": int(page_no)}})
+
+        text = "\n".join(parts).strip()
+        if not text:
+            raise ParseError("pdf has no extractable text", retryable=False)
+
+        return {"text": text, "elements": elements, "source_modality": "pdf"}
+
+    async def _extract_in_pool(self, path: str, n_pages: int) -> List[Tuple[int, str]]:
+        loop = asyncio.get_running_loop()
+        pool = _get_pool(self.workers)
+        step = -(-n_pages // self.workers)
+
+        futures = [
+            loop.run_in_executor(pool, _extract_page_range, path, start, min(n_pages, start + step))
+            for start in range(0, n_pages, step)
+        ]
+        try:
+            shards = await asyncio.gather(*futures)
+        except BrokenProcessPool as e:
+            # A crashed worker poisons the executor; replace it for the next document.
+            _reset_pool(pool)
+            raise ParseError(f"pdf worker pool crashed: {e}", retryable=True) from e
+        except Exception as e:
+            raise ParseError(f"pdf parse failed: {e}", retryable=False) from e
+
+        # Shards are submitted in page order and gather preserves it.
+        out: List[Tuple[int, str]] = []
+        for shard in shards:
+            out.extend(shard)
+        return out
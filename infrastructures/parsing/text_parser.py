@@ -4,20 +4,83 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import codecs
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 
 from infrastructures.parsing.parser_base import Parser, ParseError
 
+_HTML_EXTS = {".html", ".htm", ".xhtml"}
+_MMAP_MIN_BYTES = 4 << 20
+# Encoding detection only needs a prefix; the full buffer is decoded once afterwards.
+_DETECT_SAMPLE_BYTES = 256 << 10
+# Detection is only trusted when it is clearly confident: short or legacy Western samples
+# get coherence ~0 and an arbitrary code page, so they go to the strict fallback chain instead.
+_DETECT_MAX_CHAOS = 0.1
+_DETECT_MIN_COHERENCE = 0.3
+_FALLBACK_CHARSETS = ("gbk", "cp1252")
+_CONTROL_BYTES = bytes(x for x in range(32) if x not in (9, 10, 12, 13, 27)) + b"\x7f"
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+# lxml refuses str input that still carries an XML encoding declaration.
+_XML_DECL_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+# Elements that start a new line; everything else (b/a/span/em/...) is inline and joined as-is.
+_BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "body", "br", "caption", "dd", "details", "div", "dl",
+    "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "summary", "table", "tbody",
+    "td", "tfoot", "th", "thead", "title", "tr", "ul",
+})
+
+
+def _extract_text_from_html(html_text: str) -> str:
+    """Visible text of an (already decoded) HTML document; one line per block-level element."""
+
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    try:
+        root = lxml_html.document_fromstring(_XML_DECL_RE.sub("", html_text, count=1))
+    except (etree.ParserError, ValueError):
+        return ""
+
+    etree.strip_elements(root, "script", "style", "noscript", "template", etree.Comment, with_tail=False)
+    body = root.find("body")
+    node = body if body is not None else root
+
+    parts: List[str] = []
+    for event, el in etree.iterwalk(node, events=("start", "end")):
+        block = isinstance(el.tag, str) and el.tag in _BLOCK_TAGS
+        if event == "start":
+            if block:
+                parts.append("\n")
+            if el.text and isinstance(el.tag, str):
+                parts.append(el.text)
+        else:
+            if block:
+                parts.append("\n")
+            if el.tail and el is not node:
+                parts.append(el.tail)
+
+    # HTML whitespace semantics: collapse runs inside a line, drop empty lines.
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
 
 class TextParser(Parser):
-    async def parse(self, *, storage_uri: str, content_type: str) -> Dict[str, Any]:
-        path = self._to_local_path(storage_uri)
+    """Plain text / HTML parser.
 
-        # 防止图片/音频/octet-stream 走到 text fallback 后乱码
-        if self._looks_binary(path):
-            raise ParseError("file looks like binary; text parser refused", retryable=False)
+    The file is read once, off the event loop; files >= 4 MiB are mmap'ed and decoded
+    straight from the mapping instead of being copied through a buffered reader first.
+    """
 
-        text = self._read_text(path)
+    async def parse(self, *, storage_uri: str, content_type: str) -> Dict[str, Any]:
+        path = self._to_local_path(storage_uri)
+        text = await asyncio.to_thread(self._parse_sync, path, content_type)
 
         elements: List[Dict[str, Any]] = []
         if text.strip():
@@ -25,26 +88,121 @@ class TextParser(Parser):
 
         return {"text": text, "elements": elements, "source_modality": "text"}
 
+    def _parse_sync(self, path: str, content_type: str) -> str:
+        with self._open_buffer(path) as buf:
+            # 防止图片/音频/octet-stream 走到 text fallback 后乱码
+            if self._looks_binary(buf[:4096]):
+                raise ParseError("file looks like binary; text parser refused", retryable=False)
+
+            charset = self._declared_charset(content_type)
+            if self._is_html(path, content_type):
+                # Decode once (Content-Type charset, else <meta charset>, else the text cascade)
+                # and hand lxml a str, so charset-less UTF-8/GBK pages are not read as Latin-1.
+                return _extract_text_from_html(self._decode_text(buf, charset or self._meta_charset(buf[:4096])))
+            return self._decode_text(buf, charset)
+
+    @staticmethod
+    def _is_html(path: str, content_type: str) -> bool:
+        ctype = (content_type or "").lower()
+        if "text/html" in ctype or "application/xhtml" in ctype:
+            return True
+        return os.path.splitext(path)[1].lower() in _HTML_EXTS
+
     @staticmethod
-    def _looks_binary(path: str) -> bool:
+    @contextmanager
+    def _open_buffer(path: str) -> Iterator[Any]:
         try:
-            with open(path, "rb") as f:
-                b = f.read(4096)
+            f = open(path, "rb")
         except OSError as e:
             raise ParseError(f"read file failed: {e}", retryable=False) from e
 
+        with f:
+            try:
+                if os.fstat(f.fileno()).st_size < _MMAP_MIN_BYTES:
+                    data: Any = f.read()
+                    mm = None
+                else:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    data = mm
+            except (OSError, ValueError) as e:
+                raise ParseError(f"read file failed: {e}", retryable=False) from e
+
+            try:
+                yield data
+            finally:
+                if mm is not None:
+                    mm.close()
+
+    @staticmethod
+    def _looks_binary(b: bytes) -> bool:
         if not b:
             return False
         if b"\x00" in b:
             return True
-        printable = sum(1 for x in b if 32 <= x <= 126 or x in (9, 10, 13))
-        return printable / max(1, len(b)) < 0.70
+        # Bytes >= 0x80 are legitimate in UTF-8/GBK/latin-1 text, so only C0 controls
+        # (besides \t \n \f \r and ESC) and DEL count against the sample.
+        control = len(b) - len(b.translate(None, _CONTROL_BYTES))
+        return control / len(b) > 0.05
+
+    @staticmethod
+    def _declared_charset(content_type: str) -> Optional[str]:
+        m = _CHARSET_RE.search(content_type or "")
+        if not m:
+            return None
+        try:
+            return codecs.lookup(m.group(1)).name
+        except LookupError:
+            return None
 
     @staticmethod
-    def _read_text(path: str) -> str:
+    def _meta_charset(head: bytes) -> Optional[str]:
+        m = _META_CHARSET_RE.search(head)
+        if not m:
+            return None
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
-        except UnicodeDecodeError:
-            with open(path, "r", encoding="latin-1", errors="ignore") as f:
-                return f.read()
+            return codecs.lookup(m.group(1).decode("ascii")).name
+        except (LookupError, UnicodeDecodeError):
+            return None
+
+    @staticmethod
+    def _detect_charset(sample: bytes) -> Optional[str]:
+        try:
+            from charset_normalizer import from_bytes
+        except ImportError:
+            return None
+
+        results = from_bytes(sample)
+        best = results.best()
+        if best is None or best.chaos > _DETECT_MAX_CHAOS or best.coherence < _DETECT_MIN_COHERENCE:
+            return None
+        # Western text often scores identically under cp1250/cp1257/cp1252; prefer cp1252 on a tie.
+        for m in results:
+            if m.chaos == best.chaos and m.coherence == best.coherence and "cp1252" in m.could_be_from_charset:
+                return "cp1252"
+        return best.encoding
+
+    @staticmethod
+    def _decode_fallback(buf: Any) -> str:
+        for charset in _FALLBACK_CHARSETS:
+            try:
+                return str(buf, charset)
+            except UnicodeDecodeError:
+                continue
+        return str(buf, "latin-1")
+
+    @classmethod
+    def _decode_text(cls, buf: Any, charset: Optional[str] = None) -> str:
+        # Order: declared charset (no detection) -> strict utf-8 (the common case, one C pass)
+        # -> one confident detection on a prefix sample -> strict gbk -> cp1252 -> latin-1.
+        if charset:
+            text = str(buf, charset, "ignore")
+        else:
+            try:
+                text = str(buf, "utf-8")
+            except UnicodeDecodeError:
+                detected = cls._detect_charset(bytes(buf[:_DETECT_SAMPLE_BYTES]))
+                text = str(buf, detected, "ignore") if detected else cls._decode_fallback(buf)
+        # Match text-mode open(): universal newlines.
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 from dataclasses import dataclass
 from typing import Any, Optional
 from urllib.parse import urlparse
@@ -28,9 +29,15 @@ def _resp_array(parts: list[bytes]) -> bytes:
     return out
 
 
-async def _read_line(reader: asyncio.StreamReader, timeout: float) -> bytes:
+async def _read_reply(reader: asyncio.StreamReader, timeout: float) -> Any:
+    """Read one complete RESP reply under a single deadline.
+
+    One wait_for per reply (instead of one per line/bulk read) keeps the
+    per-read path free of Task allocation and cancellation bookkeeping.
+    """
+
     try:
-        return await asyncio.wait_for(reader.readline(), timeout=timeout)
+        return await asyncio.wait_for(_read_resp(reader), timeout=timeout)
     except asyncio.TimeoutError as e:
         raise AppError(
             code="spider.redis_timeout",
@@ -39,8 +46,8 @@ async def _read_line(reader: asyncio.StreamReader, timeout: float) -> bytes:
         ) from e
 
 
-async def _read_resp(reader: asyncio.StreamReader, timeout: float) -> Any:
-    line = await _read_line(reader, timeout)
+async def _read_resp(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
     if not line:
         raise AppError(
             code="spider.redis_closed",
@@ -68,7 +75,7 @@ async def _read_resp(reader: asyncio.StreamReader, timeout: float) -> Any:
         n = int(payload)
         if n == -1:
             return None
-        data = await asyncio.wait_for(reader.readexactly(n + 2), timeout=timeout)
+        data = await reader.readexactly(n + 2)
         return data[:-2]
     if prefix == b"*":
         count = int(payload)
@@ -76,7 +83,7 @@ async def _read_resp(reader: asyncio.StreamReader, timeout: float) -> Any:
             return None
         items = []
         for _ in range(count):
-            items.append(await _read_resp(reader, timeout))
+            items.append(await _read_resp(reader))
         return items
     return payload.decode("utf-8", errors="replace")
 
@@ -148,8 +155,10 @@ def build_review_spider_payload(
 async def enqueue_spider_task(payload: dict[str, Any]) -> int:
     client = SpiderRedisClient()
     length = await client.lpush_json(payload=payload)
-    vlogger.info(
-        "spider task enqueued",
-        extra={"redis_list_key": vconfig.spider_redis_list_key, "task_id": payload.get("task_id"), "len": length},
-    )
+    # Called once per crawl unit; callers log a per-job summary, so this stays at DEBUG.
+    if vlogger.isEnabledFor(logging.DEBUG):
+        vlogger.debug(
+            "spider task enqueued",
+            extra={"redis_list_key": vconfig.spider_redis_list_key, "task_id": payload.get("task_id"), "len": length},
+        )
     return length
@@ -4,26 +4,31 @@
 
 from __future__ import annotations
 
-import hashlib
+import functools
 import os
 import re
+import string
 import time
 from typing import Optional
 
 from domains.error_domain import AppError
-from infrastructures.storage.storage_base import Storage, StoredFile, UploadFileLike
+from infrastructures.storage.storage_base import Storage, StoredFile, UploadFileLike, ensure_dir, write_upload
 from infrastructures.vconfig import vconfig
 
 _filename_re = re.compile(r"[^0-9A-Za-z._-]+")
+# 与 _filename_re 的字符集一致：已是安全文件名（常见情况）时跳过正则替换
+_filename_chars = frozenset(string.ascii_letters + string.digits + "._-")
 
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+@functools.lru_cache(maxsize=4096)
 def _safe_filename(name: str) -> str:
     base = os.path.basename(name or "file").strip() or "file"
-    base = _filename_re.sub("_", base)
+    if not _filename_chars.issuperset(base):
+        base = _filename_re.sub("_", base)
     if base in {".", ".."}:
         base = "file"
     return base[:180]
@@ -32,7 +37,7 @@ def _safe_filename(name: str) -> str:
 class LocalStorage(Storage):
     def __init__(self, *, base_dir: str) -> None:
         self.base_dir = os.path.abspath(base_dir)
-        os.makedirs(self.base_dir, exist_ok=True)
+        ensure_dir(self.base_dir)
 
     async def save_upload(
             self,
@@ -54,32 +59,22 @@ class LocalStorage(Storage):
 
         rel_dir = os.path.join(str(kb_space), str(int(uploader_user_id)), day)
         abs_dir = os.path.join(self.base_dir, rel_dir)
-        os.makedirs(abs_dir, exist_ok=True)
+        ensure_dir(abs_dir)
 
         abs_path = os.path.join(abs_dir, f"{ts_ms}_{safe_name}")
 
         max_bytes = int(vconfig.max_upload_mb) * 1024 * 1024
 
-        h = hashlib.sha256()
-        size = 0
-
-        with open(abs_path, "wb") as f:
-            while True:
-                chunk = await upload_file.read(1024 * 1024)
-                if not chunk:
-                    break
-                f.write(chunk)
-                h.update(chunk)
-                size += len(chunk)
-                if size > max_bytes:
-                    f.close()
-                    os.remove(abs_path)
-                    raise AppError(
-                        code="upload.too_large",
-                        message=f"File exceeds max_upload_mb={int(vconfig.max_upload_mb)}MB",
-                        http_status=413,
-                        details={"max_upload_mb": int(vconfig.max_upload_mb)},
-                    )
+        size, sha256 = await write_upload(upload_file, abs_path, max_bytes=max_bytes)
+
+        if size > max_bytes:
+            os.remove(abs_path)
+            raise AppError(
+                code="upload.too_large",
+                message=f"File exceeds max_upload_mb={int(vconfig.max_upload_mb)}MB",
+                http_status=413,
+                details={"max_upload_mb": int(vconfig.max_upload_mb)},
+            )
 
         await upload_file.close()
 
@@ -89,7 +84,7 @@ class LocalStorage(Storage):
             filename=filename,
             content_type=content_type,
             size=int(size),
-            sha256=h.hexdigest(),
+            sha256=sha256,
             local_path=abs_path,
         )
 
@@ -5,34 +5,49 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import os
 import re
+import string
+import threading
 import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from starlette.datastructures import UploadFile
 
 from domains.error_domain import AppError
-from infrastructures.storage.storage_base import Storage, StoredFile, UploadFileLike
+from infrastructures.storage.storage_base import Storage, StoredFile, UploadFileLike, ensure_dir, write_upload
 from infrastructures.vconfig import vconfig
 
 _filename_re = re.compile(r"[^0-9A-Za-z._-]+")
+# 与 _filename_re 的字符集一致：已是安全文件名（常见情况）时跳过正则替换
+_filename_chars = frozenset(string.ascii_letters + string.digits + "._-")
 
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+@functools.lru_cache(maxsize=4096)
 def _sanitize_filename(name: str) -> str:
     name = (name or "").strip() or "file"
-    name = _filename_re.sub("_", name)
+    if not _filename_chars.issuperset(name):
+        name = _filename_re.sub("_", name)
     if len(name) > 200:
         name = name[-200:]
     return name
 
 
+def _is_cached(path: str) -> bool:
+    # 单次 stat 同时判断存在与非空（exists + getsize 是两次系统调用）
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
+
+
 def _join_key(prefix: str, *parts: str) -> str:
     p = (prefix or "").strip().strip("/")
     items = [x.strip().strip("/") for x in parts if (x or "").strip().strip("/")]
@@ -74,7 +89,7 @@ class _S3Config:
 class S3Storage(Storage):
     def __init__(self, *, base_dir: str) -> None:
         self.base_dir = str(base_dir)
-        os.makedirs(self.base_dir, exist_ok=True)
+        ensure_dir(self.base_dir)
 
         c = _S3Config(
             bucket=str(vconfig.s3_bucket or "").strip(),
@@ -91,17 +106,36 @@ class S3Storage(Storage):
 
         self._cfg = c
         self._client = None
+        self._transfer_config = None
+        self._client_lock = threading.Lock()
+        self._downloads: Dict[str, "asyncio.Future[None]"] = {}
 
     def _get_client(self):
         if self._client is not None:
             return self._client
+        # 首次创建在线程里进行（boto3 加载 endpoint/model 数据较慢），加锁避免并发冷启动建出多个 client
+        with self._client_lock:
+            if self._client is None:
+                self._create_client()
+        return self._client
 
+    def _create_client(self) -> None:
         try:
             import boto3  # type: ignore
+            from boto3.s3.transfer import TransferConfig  # type: ignore
+            from botocore.config import Config as BotoConfig  # type: ignore
         except Exception as e:
             raise RuntimeError("boto3 is required for S3 storage backend") from e
 
-        kwargs = {}
+        # 单 client 复用：连接池放大到并发上传/下载量级，TLS 连接保活复用
+        kwargs = {
+            "config": BotoConfig(
+                max_pool_connections=int(vconfig.s3_max_pool_connections),
+                retries={"max_attempts": 3, "mode": "adaptive"},
+                tcp_keepalive=True,
+                s3={"addressing_style": "path" if bool(vconfig.s3_force_path_style) else "auto"},
+            ),
+        }
         if self._cfg.region:
             kwargs["region_name"] = self._cfg.region
         if self._cfg.endpoint_url:
@@ -112,14 +146,22 @@ class S3Storage(Storage):
         if self._cfg.session_token:
             kwargs["aws_session_token"] = self._cfg.session_token
 
+        # 小于阈值仍是单次 PutObject；大文件按分片多路并发上传（默认 16MB 分片、16 路）
+        self._transfer_config = TransferConfig(
+            multipart_threshold=int(vconfig.s3_multipart_threshold_mb) * 1024 * 1024,
+            multipart_chunksize=int(vconfig.s3_multipart_chunk_mb) * 1024 * 1024,
+            max_concurrency=int(vconfig.s3_transfer_concurrency),
+            use_threads=True,
+        )
+        # client 最后赋值：_get_client 的无锁快路径看到 client 时 transfer_config 已就绪
         self._client = boto3.client("s3", **kwargs)
-        return self._client
 
     def _cache_path_for(self, *, bucket: str, key: str) -> str:
-        h = hashlib.sha256(f"{bucket}/{key}".encode("utf-8")).hexdigest()
+        # 仅用于本地缓存文件命名（非内容指纹），blake2b-128 足够且更快
+        h = hashlib.blake2b(f"{bucket}/{key}".encode("utf-8"), digest_size=16).hexdigest()
         ext = os.path.splitext(key)[1].lower()
         cache_dir = os.path.join(self.base_dir, "s3_cache")
-        os.makedirs(cache_dir, exist_ok=True)
+        ensure_dir(cache_dir)
         return os.path.join(cache_dir, f"{h}{ext}")
 
     async def save_upload(
@@ -136,20 +178,23 @@ class S3Storage(Storage):
         content_type = str(upload_file.content_type or "")
 
         tmp_dir = os.path.join(self.base_dir, "tmp")
-        os.makedirs(tmp_dir, exist_ok=True)
+        ensure_dir(tmp_dir)
         tmp_path = os.path.join(tmp_dir, f"upload_{_now_ms()}_{filename}")
 
-        h = hashlib.sha256()
-        size = 0
+        # 与 LocalStorage 同一上限：超限时写盘提前停止，不再整份落盘后推到 S3
+        max_bytes = int(vconfig.max_upload_mb) * 1024 * 1024
+        size, sha256 = await write_upload(upload_file, tmp_path, max_bytes=max_bytes)
+
+        if size > max_bytes:
+            os.remove(tmp_path)
+            raise AppError(
+                code="upload.too_large",
+                message=f"File exceeds max_upload_mb={int(vconfig.max_upload_mb)}MB",
+                http_status=413,
+                details={"max_upload_mb": int(vconfig.max_upload_mb)},
+            )
 
-        with open(tmp_path, "wb") as f:
-            while True:
-                chunk = await upload_file.read(1024 * 1024)
-                if not chunk:
-                    break
-                f.write(chunk)
-                h.update(chunk)
-                size += len(chunk)
+        await upload_file.close()
 
         key = _join_key(
             self._cfg.prefix,
@@ -160,23 +205,24 @@ class S3Storage(Storage):
         )
 
         bucket = self._cfg.bucket
-        client = self._get_client()
+        client = await asyncio.to_thread(self._get_client)
 
         def _upload() -> None:
-            with open(tmp_path, "rb") as f:
-                extra = {}
-                if content_type:
-                    extra["ContentType"] = content_type
-                client.put_object(Bucket=bucket, Key=key, Body=f, **extra)
+            # upload_file 走 boto3 托管传输：大文件自动分片并发上传
+            extra = {}
+            if content_type:
+                extra["ContentType"] = content_type
+            client.upload_file(tmp_path, bucket, key, ExtraArgs=(extra or None), Config=self._transfer_config)
 
         await asyncio.to_thread(_upload)
 
         cache_path = self._cache_path_for(bucket=bucket, key=key)
+        local_path: Optional[str] = cache_path
         if not os.path.exists(cache_path):
             try:
                 os.replace(tmp_path, cache_path)
             except Exception:
-                pass
+                local_path = None
         else:
             try:
                 os.remove(tmp_path)
@@ -189,8 +235,8 @@ class S3Storage(Storage):
             filename=filename,
             content_type=content_type,
             size=int(size),
-            sha256=h.hexdigest(),
-            local_path=cache_path if os.path.exists(cache_path) else None,
+            sha256=sha256,
+            local_path=local_path,
         )
 
     async def resolve_local_path(self, *, storage_uri: str) -> Optional[str]:
@@ -207,16 +253,27 @@ class S3Storage(Storage):
             return None
 
         cache_path = self._cache_path_for(bucket=bucket, key=key)
-        if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
+        if _is_cached(cache_path):
             return cache_path
 
-        client = self._get_client()
+        # 同一对象的并发解析共用一次下载
+        task = self._downloads.get(cache_path)
+        if task is None:
+            task = asyncio.ensure_future(self._download(bucket=bucket, key=key, cache_path=cache_path))
+            self._downloads[cache_path] = task
+            task.add_done_callback(lambda _t: self._downloads.pop(cache_path, None))
+        await asyncio.shield(task)
+
+        if _is_cached(cache_path):
+            return cache_path
+        return None
+
+    async def _download(self, *, bucket: str, key: str, cache_path: str) -> None:
+        client = await asyncio.to_thread(self._get_client)
 
         def _download() -> None:
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            client.download_file(bucket, key, cache_path)
+            ensure_dir(os.path.dirname(cache_path))
+            # 托管传输：大对象分段 Range GET、多路并发拉取，写临时文件后原子改名
+            client.download_file(bucket, key, cache_path, Config=self._transfer_config)
 
         await asyncio.to_thread(_download)
-        if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
-            return cache_path
-        return None
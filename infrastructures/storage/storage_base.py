@@ -4,8 +4,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from typing import Any, BinaryIO, Optional, Protocol, Tuple
+
+from infrastructures.vconfig import vconfig
 
 
 @dataclass(frozen=True)
@@ -19,6 +24,13 @@ class StoredFile:
     local_path: Optional[str] = None
 
 
+def ensure_dir(path: str) -> str:
+    """makedirs(exist_ok=True) every call: ~one stat when the dir exists, and dirs removed at runtime
+    (tmp/s3_cache cleanup, purged day dirs) are recreated instead of failing until restart."""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
 class UploadFileLike(Protocol):
     """上传文件最小接口：兼容 FastAPI/Starlette UploadFile。"""
 
@@ -44,3 +56,54 @@ class Storage(Protocol):
 
     async def resolve_local_path(self, *, storage_uri: str) -> Optional[str]:
         ...
+
+
+def _copy_sync(src: Any, dst_path: str, max_bytes: Optional[int], chunk_size: int) -> Tuple[int, str]:
+    h = hashlib.sha256()
+    size = 0
+    # 大块读写：超过缓冲区的块直接落盘，每块约一次 read + 一次 write 系统调用，块越大内核往返越少
+    with open(dst_path, "wb") as dst:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            dst.write(chunk)
+            h.update(chunk)
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                break
+    return size, h.hexdigest()
+
+
+async def write_upload(upload_file: UploadFileLike, dst_path: str, *, max_bytes: Optional[int] = None) -> Tuple[int, str]:
+    """
+    把上传内容写入 dst_path，返回 (size, sha256)。超过 max_bytes 时提前停止（size > max_bytes，由调用方处理）。
+    Starlette UploadFile 自带同步 .file（SpooledTemporaryFile），open + 读-写-哈希循环一次性放到线程里；
+    其他实现退化为逐块 await read + 线程内写盘/哈希。
+    """
+    chunk_size = int(vconfig.upload_copy_chunk_kb) * 1024
+
+    src = getattr(upload_file, "file", None)
+    if src is not None and hasattr(src, "read"):
+        return await asyncio.to_thread(_copy_sync, src, dst_path, max_bytes, chunk_size)
+
+    h = hashlib.sha256()
+    size = 0
+
+    def _consume(dst: BinaryIO, chunk: bytes) -> None:
+        dst.write(chunk)
+        h.update(chunk)
+
+    dst = await asyncio.to_thread(open, dst_path, "wb")
+    try:
+        while True:
+            chunk = await upload_file.read(chunk_size)
+            if not chunk:
+                break
+            await asyncio.to_thread(_consume, dst, chunk)
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                break
+    finally:
+        dst.close()
+    return size, h.hexdigest()
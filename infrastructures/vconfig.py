@@ -12,15 +12,15 @@ from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-def _project_root() -> Path:
-    return Path(__file__).resolve().parents[1]
+# Resolved once per process (resolve() walks every path component).
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 
 class VConfig(BaseSettings):
     """Project configuration loaded from .env."""
 
     model_config = SettingsConfigDict(
-        env_file=str(_project_root() / ".env"),
+        env_file=str(_PROJECT_ROOT / ".env"),
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
@@ -30,6 +30,8 @@ class VConfig(BaseSettings):
     app_env: str = Field(..., validation_alias="APP_ENV")
     log_level: str = Field(..., validation_alias="LOG_LEVEL")
     log_requests: bool = Field(..., validation_alias="LOG_REQUESTS")
+    # text | json
+    log_format: str = Field("text", validation_alias="LOG_FORMAT")
     request_id_header: str = Field(..., validation_alias="REQUEST_ID_HEADER")
     generate_request_id: bool = Field(..., validation_alias="GENERATE_REQUEST_ID")
 
@@ -41,6 +43,7 @@ class VConfig(BaseSettings):
 
     # ---------- Upload ----------
     max_upload_mb: int = Field(..., validation_alias="MAX_UPLOAD_MB", ge=1)
+    upload_copy_chunk_kb: int = Field(4096, validation_alias="UPLOAD_COPY_CHUNK_KB", ge=64)
 
     # ---------- Database ----------
     db_url: str = Field(..., validation_alias="DB_URL")
@@ -57,18 +60,40 @@ class VConfig(BaseSettings):
 
     # ---------- Storage ----------
     storage_dir: str = Field(..., validation_alias="STORAGE_DIR")
+    # S3 backend (reserved): HTTP pool shared by concurrent uploads/downloads
+    s3_force_path_style: bool = Field(False, validation_alias="S3_FORCE_PATH_STYLE")
+    s3_max_pool_connections: int = Field(64, validation_alias="S3_MAX_POOL_CONNECTIONS", ge=1)
+    # Managed transfer: objects above the threshold go multipart, parts sent/fetched over N threads
+    s3_multipart_threshold_mb: int = Field(8, validation_alias="S3_MULTIPART_THRESHOLD_MB", ge=5)
+    s3_multipart_chunk_mb: int = Field(16, validation_alias="S3_MULTIPART_CHUNK_MB", ge=5)
+    s3_transfer_concurrency: int = Field(16, validation_alias="S3_TRANSFER_CONCURRENCY", ge=1)
 
     # ---------- Worker ----------
     worker_poll_interval: float = Field(..., validation_alias="WORKER_POLL_INTERVAL", gt=0)
+    # Drop chunks repeating an earlier chunk of the same document (changes chunk_index numbering on re-ingest)
+    chunk_dedup: bool = Field(True, validation_alias="CHUNK_DEDUP")
 
     # ---------- Search ----------
     index_backend: str = Field(..., validation_alias="INDEX_BACKEND")
     search_max_per_doc: int = Field(..., validation_alias="SEARCH_MAX_PER_DOC", ge=1)
+    # Reuse vector hits for near-duplicate queries (cosine >= threshold). 0 disables.
+    semantic_cache_threshold: float = Field(0.0, validation_alias="SEMANTIC_CACHE_THRESHOLD", ge=0, le=1)
+    semantic_cache_size: int = Field(10000, validation_alias="SEMANTIC_CACHE_SIZE", ge=1)
+    semantic_cache_ttl_seconds: int = Field(300, validation_alias="SEMANTIC_CACHE_TTL_SECONDS", ge=0)
 
     # ---------- Embedding ----------
     embedding_backend: str = Field(..., validation_alias="EMBEDDING_BACKEND")
     embedding_model_name: str = Field(..., validation_alias="EMBEDDING_MODEL")
     embedding_dim: int = Field(..., validation_alias="EMBEDDING_DIM", ge=1)
+    embedding_batch_size: int = Field(128, validation_alias="EMBEDDING_BATCH_SIZE", ge=1)
+    embedding_max_concurrency: int = Field(2, validation_alias="EMBEDDING_MAX_CONCURRENCY", ge=1)
+    # SQLite file for the persistent embedding cache ("" disables caching).
+    embedding_cache_path: str = Field("", validation_alias="EMBEDDING_CACHE_PATH")
+    embedding_cache_lru_size: int = Field(4096, validation_alias="EMBEDDING_CACHE_LRU_SIZE", ge=0)
+    # float32 | float16 | int8 (per-vector scale)
+    embedding_cache_dtype: str = Field("float32", validation_alias="EMBEDDING_CACHE_DTYPE")
+    # SQLite mmap window in MB; pages are served from the OS page cache shared by all workers (0 disables).
+    embedding_cache_mmap_mb: int = Field(256, validation_alias="EMBEDDING_CACHE_MMAP_MB", ge=0)
 
     # ---------- Elasticsearch (optional) ----------
     es_enabled: bool = Field(False, validation_alias="ES_ENABLED")
@@ -78,8 +103,21 @@ class VConfig(BaseSettings):
     es_api_key: str = Field("", validation_alias="ES_API_KEY")
     es_index_prefix: str = Field("veesees_chunks_", validation_alias="ES_INDEX_PREFIX")
     es_timeout_seconds: int = Field(10, validation_alias="ES_TIMEOUT_SECONDS", ge=1)
+    es_connections_per_node: int = Field(32, validation_alias="ES_CONNECTIONS_PER_NODE", ge=1)
+    es_max_retries: int = Field(3, validation_alias="ES_MAX_RETRIES", ge=0)
     es_number_of_shards: int = Field(1, validation_alias="ES_NUMBER_OF_SHARDS", ge=1)
     es_number_of_replicas: int = Field(0, validation_alias="ES_NUMBER_OF_REPLICAS", ge=0)
+    # ES defaults (1s / request): new chunks searchable within ~1s, acknowledged writes fsync'ed.
+    # Bulk-heavy deployments may opt into e.g. 30s / async via env.
+    es_refresh_interval: str = Field("1s", validation_alias="ES_REFRESH_INTERVAL")
+    es_translog_flush_threshold: str = Field("1gb", validation_alias="ES_TRANSLOG_FLUSH_THRESHOLD")
+    es_translog_durability: str = Field("request", validation_alias="ES_TRANSLOG_DURABILITY")
+    es_prewarm: bool = Field(True, validation_alias="ES_PREWARM")
+    # BM25 结果缓存仅在本进程内失效（worker 写入不会通知 API 进程），默认关闭；开启时依赖 TTL 兜底
+    es_search_cache_size: int = Field(0, validation_alias="ES_SEARCH_CACHE_SIZE", ge=0)
+    es_search_cache_ttl_seconds: int = Field(30, validation_alias="ES_SEARCH_CACHE_TTL_SECONDS", ge=1)
+    es_bulk_chunk_size: int = Field(500, validation_alias="ES_BULK_CHUNK_SIZE", ge=1)
+    es_bulk_max_bytes: int = Field(10 * 1024 * 1024, validation_alias="ES_BULK_MAX_BYTES", ge=1024)
 
     # ---------- Milvus (optional) ----------
     milvus_enabled: bool = Field(False, validation_alias="MILVUS_ENABLED")
@@ -95,11 +133,23 @@ class VConfig(BaseSettings):
     milvus_index_type: str = Field("HNSW", validation_alias="MILVUS_INDEX_TYPE")
     milvus_hnsw_m: int = Field(16, validation_alias="MILVUS_HNSW_M", ge=1)
     milvus_hnsw_ef_construction: int = Field(200, validation_alias="MILVUS_HNSW_EF_CONSTRUCTION", ge=1)
+    # IVF_* (IVF_FLAT / IVF_SQ8 / IVF_PQ) build params; SQ8/PQ store quantized codes instead of float32
+    milvus_ivf_nlist: int = Field(1024, validation_alias="MILVUS_IVF_NLIST", ge=1)
+    milvus_pq_m: int = Field(32, validation_alias="MILVUS_PQ_M", ge=1)
+    # GPU_CAGRA graph degree (GPU_IVF_FLAT / GPU_IVF_PQ reuse the IVF params above)
+    milvus_cagra_graph_degree: int = Field(32, validation_alias="MILVUS_CAGRA_GRAPH_DEGREE", ge=1)
     milvus_search_nprobe: int = Field(16, validation_alias="MILVUS_SEARCH_NPROBE", ge=1)
     milvus_search_ef: int = Field(64, validation_alias="MILVUS_SEARCH_EF", ge=1)
+    # Micro-batch window for concurrent searches (0 = one RPC per query) and max queries per RPC
+    milvus_search_batch_ms: int = Field(2, validation_alias="MILVUS_SEARCH_BATCH_MS", ge=0)
+    milvus_search_batch_size: int = Field(32, validation_alias="MILVUS_SEARCH_BATCH_SIZE", ge=1)
     milvus_index_params: str = Field("", validation_alias="MILVUS_INDEX_PARAMS")
+    # Rows per upsert call (bounds client-side serialisation memory and gRPC message size)
+    milvus_upsert_batch_size: int = Field(2000, validation_alias="MILVUS_UPSERT_BATCH_SIZE", ge=1)
 
     # ---------- Parsing extras (optional) ----------
+    # Process-pool workers for page-parallel PDF extraction (0/1 = single thread).
+    pdf_parse_workers: int = Field(0, validation_alias="PDF_PARSE_WORKERS", ge=0)
     enable_image_ocr: bool = Field(False, validation_alias="ENABLE_IMAGE_OCR")
     ocr_lang: str = Field("ch", validation_alias="OCR_LANG")
 
@@ -145,9 +195,13 @@ class VConfig(BaseSettings):
     ollama_default_model: str = Field("", validation_alias="OLLAMA_DEFAULT_MODEL")
     ollama_timeout_seconds: int = Field(60, validation_alias="OLLAMA_TIMEOUT_SECONDS", ge=1)
 
-    llm_registry_dir: str = Field(str(_project_root() / "configs"), validation_alias="LLM_REGISTRY_DIR")
-    llm_schema_dir: str = Field(str(_project_root() / "configs" / "schemas"), validation_alias="LLM_SCHEMA_DIR")
+    llm_registry_dir: str = Field(str(_PROJECT_ROOT / "configs"), validation_alias="LLM_REGISTRY_DIR")
+    llm_schema_dir: str = Field(str(_PROJECT_ROOT / "configs" / "schemas"), validation_alias="LLM_SCHEMA_DIR")
     llm_schema_validate_mode: str = Field("lite", validation_alias="LLM_SCHEMA_VALIDATE_MODE")
+    # Seconds a loaded LLM config snapshot is served before re-checking the DB.
+    llm_config_cache_ttl_seconds: int = Field(60, validation_alias="LLM_CONFIG_CACHE_TTL_SECONDS", ge=5)
+    # Local file used to persist the LLM config cache across restarts ("" disables).
+    llm_config_snapshot_path: str = Field("", validation_alias="LLM_CONFIG_SNAPSHOT_PATH")
 
     @field_validator("whisper_language", mode="before")
     @classmethod
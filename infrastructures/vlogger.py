@@ -4,10 +4,17 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
+import queue
 import time
 import uuid
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import orjson
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
@@ -15,13 +22,77 @@ from starlette.responses import Response
 from infrastructures.vconfig import vconfig
 
 _request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+_listener: Optional[QueueListener] = None
+
+
+_TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [rid=%(request_id)s] %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord carries; anything else on a record came from `extra=`.
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "taskName"}
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {k: v for k, v in record.__dict__.items() if k not in _RECORD_ATTRS}
 
 
 def get_request_id() -> str:
     return _request_id_var.get()
 
 
-def init_logging(level: str) -> None:
+class TextFormatter(logging.Formatter):
+    """Classic one-line format; `extra=` fields are appended as k=v (only when a record is emitted)."""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        fields = _extra_fields(record)
+        if not fields:
+            return line
+        return line + " " + " ".join(f"{k}={v}" for k, v in fields.items())
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line; `extra=` fields become top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "rid": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        out.update(_extra_fields(record))
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            out["exc"] = record.exc_text
+        if record.stack_info:
+            out["stack"] = self.formatStack(record.stack_info)
+        return orjson.dumps(out, default=str).decode("utf-8")
+
+
+_EXC_FORMATTER = logging.Formatter()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock prepare() fully formats the record on the caller; here only what cannot
+    cross threads safely is resolved: %-args (may be mutated later) and the traceback.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def init_logging(level: str, fmt: str = "text") -> None:
     valid = {"CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"}
     lvl = level.upper().strip()
     if lvl not in valid:
@@ -36,12 +107,22 @@ def init_logging(level: str) -> None:
 
     logging.setLogRecordFactory(record_factory)
 
-    logging.basicConfig(
-        level=getattr(logging, lvl),
-        format="%(asctime)s %(levelname)s %(name)s [rid=%(request_id)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        force=True,
-    )
+    handler = logging.StreamHandler()
+    if (fmt or "").strip().lower() == "json":
+        handler.setFormatter(JsonFormatter(datefmt=_DATE_FORMAT))
+    else:
+        handler.setFormatter(TextFormatter(_TEXT_FORMAT, datefmt=_DATE_FORMAT))
+
+    # Callers only enqueue the record; formatting and stream I/O happen on the listener
+    # thread, so a slow stderr never stalls the event loop.
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+    logging.basicConfig(level=getattr(logging, lvl), handlers=[_DeferredQueueHandler(log_queue)], force=True)
 
     # Ensure uvicorn logs go through root formatter
     for name in ("uvicorn", "uvicorn.error", "uvicorn.access", "fastapi", "starlette"):
@@ -52,6 +133,18 @@ def init_logging(level: str) -> None:
     vlogger.info("logging initialized level=%s", lvl)
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
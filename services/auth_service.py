@@ -10,11 +10,11 @@ from typing import Optional, Dict, Any, cast
 import jwt
 from jwt import PyJWTError
 from passlib.context import CryptContext
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.error_domain import AppError
 from domains.user_domain import UserRole
-from infrastructures.db.orm.user_orm import MetaUsersORM
 from infrastructures.db.repository.user_repository import UserRepository
 from infrastructures.vconfig import vconfig
 from infrastructures.vlogger import vlogger
@@ -55,13 +55,13 @@ class AuthService:
         except PyJWTError as exc:
             raise AppError(code="auth.invalid_token", message="Invalid or expired token", http_status=401) from exc
 
-    def create_access_token_for_user(self, user: MetaUsersORM) -> str:
+    def create_access_token_for_user(self, user: Row) -> str:
         return self._create_token(
             subject=str(user.user_id),
             extra_claims={"user_id": user.user_id, "username": user.username, "role": user.role, "status": user.status},
         )
 
-    async def get_user_by_token(self, db: AsyncSession, token: str) -> MetaUsersORM:
+    async def get_user_by_token(self, db: AsyncSession, token: str) -> Row:
         payload = self.decode_token(token)
 
         sub = payload.get("sub")
@@ -73,14 +73,14 @@ class AuthService:
         except ValueError as exc:
             raise AppError(code="auth.invalid_token", message="Invalid token subject", http_status=401) from exc
 
-        user = await self._user_repo.get_by_id(db, user_id)
+        user = await self._user_repo.get_auth_row_by_id(db, user_id)
         if not user or user.status != 1:
             raise AppError(code="auth.user_not_found", message="User not found or inactive", http_status=401)
 
         return user
 
-    async def authenticate(self, db: AsyncSession, username: str, password: str) -> Optional[MetaUsersORM]:
-        user = await self._user_repo.get_by_username(db, username)
+    async def authenticate(self, db: AsyncSession, username: str, password: str) -> Optional[Row]:
+        user = await self._user_repo.get_login_row(db, username)
         if not user or user.status != 1:
             return None
 
@@ -89,7 +89,7 @@ class AuthService:
 
         return user
 
-    async def authenticate_or_raise(self, db: AsyncSession, username: str, password: str) -> MetaUsersORM:
+    async def authenticate_or_raise(self, db: AsyncSession, username: str, password: str) -> Row:
         user = await self.authenticate(db=db, username=username, password=password)
         if not user:
             raise AppError(
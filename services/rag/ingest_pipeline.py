@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List
 
@@ -29,7 +30,7 @@ class IngestPipeline:
 
     async def run_job(self, *, job_id: int, worker_id: str) -> JobRunResult:
         async with self.db_factory() as db:
-            job = await self.repo.get_job(db, job_id=int(job_id))
+            job, doc = await self.repo.get_job_with_document(db, job_id=int(job_id))
             if job is None:
                 return JobRunResult(
                     job_id=int(job_id),
@@ -63,7 +64,6 @@ class IngestPipeline:
                     )
 
             try:
-                doc = await self.repo.get_document(db, document_id=int(job.document_id), include_deleted=True)
                 if doc is None:
                     await self.repo.finish_job(
                         db,
@@ -129,14 +129,19 @@ class IngestPipeline:
                 )
                 await db.commit()
 
+                # Milvus and (optional) ES writes are independent: submit both, wait once.
+                # Both must settle before a failure is raised, so a failed job never leaves the
+                # other write running unobserved (a retry could race with it).
+                writes = []
                 if bool(vconfig.milvus_enabled):
-                    texts = [str(c.get("content") or "") for c in chunks]
-                    vectors = await self.embedder.embed_documents(texts)
-                    await self.milvus_index.upsert(chunks=chunks, vectors=vectors)
-
-                # optional: es
+                    writes.append(self._index_milvus(chunks))
                 if bool(vconfig.es_enabled):
-                    await self.es_index.upsert(chunks=chunks)
+                    writes.append(self.es_index.upsert(chunks=chunks))
+                if writes:
+                    results = await asyncio.gather(*writes, return_exceptions=True)
+                    for r in results:
+                        if isinstance(r, BaseException):
+                            raise r
 
                 # commit
                 await self.repo.set_active_index_version(
@@ -235,8 +240,13 @@ class IngestPipeline:
                     data={"stage": "error"},
                 )
 
+    async def _index_milvus(self, chunks: List[Dict[str, Any]]) -> None:
+        texts = [str(c.get("content") or "") for c in chunks]
+        vectors = await self.embedder.embed_documents(texts)
+        await self.milvus_index.upsert(chunks=chunks, vectors=vectors)
+
     async def cleanup_after_commit(self, *, kb_space: str, document_id: int, keep_index_version: int) -> None:
-        if bool(vconfig.es_enabled) and str(getattr(vconfig, "es_url", "") or "").strip():
+        if bool(vconfig.es_enabled) and str(vconfig.es_url or "").strip():
             try:
                 await self.es_index.delete_by_document(
                     kb_space=str(kb_space),
@@ -255,7 +265,7 @@ class IngestPipeline:
                 )
 
         # Milvus cleanup
-        if bool(vconfig.milvus_enabled) and str(getattr(vconfig, "milvus_uri", "") or "").strip():
+        if bool(vconfig.milvus_enabled) and str(vconfig.milvus_uri or "").strip():
             try:
                 await self.milvus_index.delete_by_document(
                     kb_space=str(kb_space),
@@ -9,27 +9,8 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.rag_domain import SearchRequest, SearchResponse
-from infrastructures.db.repository.rag_repository import RagRepository
-from infrastructures.embedding.embedder_router import create_embedder
-from infrastructures.index.index_router import create_es_index, create_milvus_index
 from infrastructures.vlogger import vlogger
-from services.rag.search_service import SearchService
-
-
-_repo = RagRepository()
-_search_service: Optional[SearchService] = None
-
-
-def _get_search_service() -> SearchService:
-    global _search_service
-    if _search_service is None:
-        _search_service = SearchService(
-            repo=_repo,
-            embedder=create_embedder(),
-            milvus_index=create_milvus_index(),
-            es_index=create_es_index(),
-        )
-    return _search_service
+from services.rag.search_service import create_search_service
 
 
 class RagCapability:
@@ -43,6 +24,6 @@ class RagCapability:
         request_id: Optional[str] = None,
     ) -> SearchResponse:
         vlogger.info("rag.search space=%s top_k=%s rid=%s", kb_space, top_k, request_id or "-")
-        svc = _get_search_service()
+        svc = create_search_service()
         req = SearchRequest(kb_space=str(kb_space), query=str(query), top_k=int(top_k))
         return await svc.search(db, req)
@@ -4,13 +4,14 @@
 
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Sequence
 
 from fastapi import UploadFile
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.error_domain import AppError
-from infrastructures.db.orm.rag_orm import MetaRagSpacesORM, MetaRagDocumentsORM, OpsRagIngestJobsORM, StgRagChunksORM
+from infrastructures.db.orm.rag_orm import MetaRagSpacesORM, MetaRagDocumentsORM, OpsRagIngestJobsORM
 from infrastructures.db.repository.rag_repository import RagRepository
 from infrastructures.storage.storage_base import Storage
 
@@ -57,7 +58,7 @@ class RagService:
             status: Optional[int] = None,
             limit: int = 50,
             offset: int = 0,
-    ) -> List[MetaRagSpacesORM]:
+    ) -> Sequence[MetaRagSpacesORM]:
         return await self.repo.list_spaces(db, enabled=enabled, status=status, limit=limit, offset=offset)
 
     async def update_space(
@@ -129,6 +130,8 @@ class RagService:
             kb_space=kb_space,
             pipeline_version=pipeline_version,
             max_retries=int(max_retries),
+            # The flushed doc is still in memory (and row-locked by our INSERT); no re-read needed.
+            index_version=int(doc.active_index_version or 0) + 1,
         )
 
         return doc, job
@@ -147,7 +150,7 @@ class RagService:
             kb_space: Optional[str] = None,
             limit: int = 50,
             offset: int = 0,
-    ) -> List[MetaRagDocumentsORM]:
+    ) -> Sequence[Row]:
         return await self.repo.list_documents(db, kb_space=kb_space, limit=limit, offset=offset)
 
     async def update_document_filename(self, db: AsyncSession, *, document_id: int, filename: str) -> int:
@@ -155,19 +158,20 @@ class RagService:
         if not filename:
             raise AppError(code="rag.filename_invalid", message="filename is required", http_status=400)
 
-        doc = await self.get_document(db, document_id=int(document_id), include_deleted=False)
-        if int(getattr(doc, "status", 0)) >= 90:
-            raise AppError(code="rag.document_deleted", message="Document is deleted", http_status=400)
-
-        return await self.repo.update_document_filename(db, document_id=int(document_id), filename=filename)
+        # The existence/deleted check rides on the UPDATE's WHERE clause (MySQL rowcount is
+        # matched rows), so the happy path is one round-trip instead of SELECT + UPDATE.
+        rows = await self.repo.update_document_filename(
+            db, document_id=int(document_id), filename=filename, include_deleted=False
+        )
+        if rows == 0:
+            raise AppError(code="rag.document_not_found", message="Document not found", http_status=404)
+        return rows
 
     async def delete_document(self, db: AsyncSession, *, document_id: int) -> int:
         """软删 document + 取消未终态 job（不删除原始文件）"""
-        doc = await self.repo.get_document(db, document_id=document_id, include_deleted=True)
-        if doc is None:
-            raise AppError(code="rag.document_not_found", message="Document not found", http_status=404)
-
         rows = await self.repo.mark_document_deleted(db, document_id=int(document_id))
+        if rows == 0:
+            raise AppError(code="rag.document_not_found", message="Document not found", http_status=404)
         await self.repo.cancel_jobs_by_document(db, document_id=int(document_id), last_error="document deleted")
         return int(rows)
 
@@ -185,7 +189,7 @@ class RagService:
             statuses: Optional[List[int]] = None,
             limit: int = 50,
             offset: int = 0,
-    ) -> List[OpsRagIngestJobsORM]:
+    ) -> Sequence[Row]:
         return await self.repo.list_jobs(db, kb_space=kb_space, statuses=statuses, limit=int(limit), offset=int(offset))
 
     async def list_chunks(
@@ -196,7 +200,7 @@ class RagService:
             index_version: Optional[int] = None,
             limit: int = 200,
             offset: int = 0,
-    ) -> List[StgRagChunksORM]:
+    ) -> Sequence[Row]:
         doc = await self.get_document(db, document_id=document_id, include_deleted=False)
 
         ver = index_version
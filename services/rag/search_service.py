@@ -4,13 +4,19 @@
 
 from __future__ import annotations
 
-from typing import Any, List, Tuple, Dict
+import asyncio
+import threading
+from typing import Any, List, Tuple, Dict, Optional
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.error_domain import AppError
 from domains.rag_domain import SearchRequest, SearchResponse, SearchHit
 from infrastructures.db.repository.rag_repository import RagRepository
+from infrastructures.embedding.embedder_router import create_embedder
+from infrastructures.embedding.semantic_cache import cache_namespace, create_semantic_query_cache
+from infrastructures.index.index_router import create_es_index, create_milvus_index
 from infrastructures.vconfig import vconfig
 
 
@@ -20,6 +26,7 @@ class SearchService:
         self.embedder = embedder
         self.milvus_index = milvus_index
         self.es_index = es_index
+        self.semantic_cache = create_semantic_query_cache()
 
     @staticmethod
     def _backend() -> str:
@@ -66,13 +73,16 @@ class SearchService:
         vec_pairs: List[Tuple[str, float]] = []
         es_pairs: List[Tuple[str, float]] = []
 
-        if backend in {"vector", "hybrid"}:
-            q_vec = await self.embedder.embed_query(query)
-            vec_pairs = await self.milvus_index.search(kb_space=kb_space, query_vector=q_vec, top_k=top_k * 5)
-
-        if backend in {"bm25", "hybrid"}:
-            es_hits = await self.es_index.search(kb_space=kb_space, query=query, top_k=top_k * 5)
-            es_pairs = [(str(h.chunk_id), float(h.score)) for h in es_hits]
+        # hybrid 下两路召回互不依赖，并发执行
+        if backend == "hybrid":
+            vec_pairs, es_pairs = await asyncio.gather(
+                self._embed_and_vector_search(kb_space=kb_space, query=query, top_k=top_k * 5),
+                self._bm25_search(kb_space=kb_space, query=query, top_k=top_k * 5),
+            )
+        elif backend == "vector":
+            vec_pairs = await self._embed_and_vector_search(kb_space=kb_space, query=query, top_k=top_k * 5)
+        else:
+            es_pairs = await self._bm25_search(kb_space=kb_space, query=query, top_k=top_k * 5)
 
         fused = self._merge(vec_pairs, es_pairs, backend)
         chunk_ids: List[str] = []
@@ -92,13 +102,16 @@ class SearchService:
 
         max_per_doc = int(vconfig.search_max_per_doc)
 
+        # _merge 输出的 chunk_id 已是 str；每条命中只做一次 chunk 查找 + 一次计数查找，超限即跳过
         for cid, score in fused:
-            c = by_id.get(str(cid))
-            if not c:
+            c = by_id.get(cid)
+            if c is None:
                 continue
-            if seen_doc.get(c.document_id, 0) >= max_per_doc:
+            doc_id = c.document_id
+            n = seen_doc.get(doc_id, 0)
+            if n >= max_per_doc:
                 continue
-            seen_doc[c.document_id] = seen_doc.get(c.document_id, 0) + 1
+            seen_doc[doc_id] = n + 1
 
             hits.append(
                 SearchHit(
@@ -116,6 +129,28 @@ class SearchService:
 
         return SearchResponse(kb_space=kb_space, query=query, top_k=top_k, backend=backend, hits=hits)
 
+    async def _embed_and_vector_search(self, *, kb_space: str, query: str, top_k: int) -> List[Tuple[str, float]]:
+        q_vec = await self.embedder.embed_query(query)
+        return await self._vector_search(kb_space=kb_space, q_vec=q_vec, top_k=top_k)
+
+    async def _bm25_search(self, *, kb_space: str, query: str, top_k: int) -> List[Tuple[str, float]]:
+        # 命中内容统一从 DB 回表，ES 只需返回 chunk_id(_id) + score
+        return await self.es_index.search_scores(kb_space=kb_space, query=query, top_k=top_k)
+
+    async def _vector_search(self, *, kb_space: str, q_vec: np.ndarray, top_k: int) -> List[Tuple[str, float]]:
+        cache = self.semantic_cache
+        if cache is None:
+            return await self.milvus_index.search(kb_space=kb_space, query_vector=q_vec, top_k=top_k)
+
+        ns = cache_namespace(kb_space, top_k)
+        cached = cache.lookup(ns, q_vec)
+        if cached is not None:
+            return list(cached)
+
+        pairs = await self.milvus_index.search(kb_space=kb_space, query_vector=q_vec, top_k=top_k)
+        cache.add(ns, q_vec, tuple(pairs))
+        return pairs
+
     @staticmethod
     def _merge(
             vec_pairs: List[Tuple[str, float]],
@@ -150,3 +185,24 @@ class SearchService:
         fused = [(cid, a.get(cid, 0.0) + b.get(cid, 0.0)) for cid in keys]
         fused.sort(key=lambda x: (-x[1], x[0]))
         return fused
+
+
+_search_service: Optional[SearchService] = None
+_search_service_lock = threading.Lock()
+
+
+def create_search_service() -> SearchService:
+    """Process singleton shared by the HTTP router and RagCapability."""
+
+    global _search_service
+    if _search_service is not None:
+        return _search_service
+    with _search_service_lock:
+        if _search_service is None:
+            _search_service = SearchService(
+                repo=RagRepository(),
+                embedder=create_embedder(),
+                milvus_index=create_milvus_index(),
+                es_index=create_es_index(),
+            )
+    return _search_service
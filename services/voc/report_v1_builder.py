@@ -35,11 +35,7 @@ class ReportV1Builder:
             modules[mc] = dict(o.payload_json or {})
 
         # evidence counts per module (lightweight, no heavy payload)
-        # NOTE: list_evidence returns full rows; for now we just count in-memory.
-        ev_rows = await VocRepository.list_evidence(db, job_id=int(job_id), module_code=None)
-        ev_count: Dict[str, int] = {}
-        for r in ev_rows:
-            ev_count[str(r.module_code)] = ev_count.get(str(r.module_code), 0) + 1
+        ev_count = await VocRepository.count_evidence_by_module(db, job_id=int(job_id))
 
         available = len(modules) > 0
 
@@ -4,10 +4,10 @@
 
 from __future__ import annotations
 
-import json
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.llm_request_domain import LlmRequest, LlmMessage, LlmRole
@@ -59,6 +59,12 @@ def _safe_json(obj: Any, *, max_list: int = 30, max_str: int = 600, depth: int =
         return "<unserializable>"
 
 
+def _prompt_json(ctx: Dict[str, Any]) -> str:
+    # ctx has already been through _safe_json (plain JSON types, str keys); orjson keeps
+    # non-ASCII as-is (like ensure_ascii=False) and emits compact separators.
+    return orjson.dumps(ctx).decode("utf-8")
+
+
 class VocAiService:
     """Generate ai_summary for VOC modules and report.
 
@@ -140,7 +146,7 @@ class VocAiService:
             "- 若数据不足，请明确写出限制。\n"
             "- 不要输出多余的免责声明。\n\n"
             "输入如下（JSON）：\n"
-            f"{json.dumps(ctx, ensure_ascii=False)}\n"
+            f"{_prompt_json(ctx)}\n"
         )
 
     @staticmethod
@@ -156,7 +162,7 @@ class VocAiService:
             "3) Top 5 可执行行动建议（按优先级排序，说明预期影响）\n"
             "4) 数据限制\n\n"
             "输入如下（JSON）：\n"
-            f"{json.dumps(ctx, ensure_ascii=False)}\n"
+            f"{_prompt_json(ctx)}\n"
         )
 
     async def summarize_module(
@@ -178,9 +184,30 @@ class VocAiService:
         if out is None:
             return False, None
 
+        ev_rows = await VocRepository.list_evidence(db, job_id=int(job_id), module_code=str(module_code), limit=self.max_evidence, offset=0)
+        status, summary = await self._summarize_output(
+            db, job_id=int(job_id), out=out, ev_rows=ev_rows, flow_code=flow_code, model_profile_id=model_profile_id
+        )
+        return status == "ok", summary
+
+    async def _summarize_output(
+        self,
+        db: AsyncSession,
+        *,
+        job_id: int,
+        out: Any,
+        ev_rows: List[Any],
+        flow_code: Optional[str] = None,
+        model_profile_id: Optional[str] = None,
+    ) -> Tuple[str, Optional[str]]:
+        """summarize_module on an already loaded output + evidence.
+
+        Returns (meta.ai.status, summary_text); status is one of ok/empty/skipped/failed.
+        """
+
+        module_code = str(out.module_code)
         payload = dict(out.payload_json or {})
 
-        ev_rows = await VocRepository.list_evidence(db, job_id=int(job_id), module_code=str(module_code), limit=self.max_evidence, offset=0)
         evidence = []
         for r in ev_rows:
             evidence.append(
@@ -210,7 +237,7 @@ class VocAiService:
             if isinstance(payload["meta"], dict):
                 payload["meta"]["ai"] = {**ai_meta_base, "status": "skipped", "reason": "no_model_profile"}
             await VocRepository.upsert_output(db, job_id=int(job_id), module_code=str(module_code), payload_json=payload, schema_version=int(out.schema_version))
-            return False, None
+            return "skipped", None
 
         prompt = self._build_module_prompt(module_code=str(module_code), output_payload=payload, evidence=evidence)
 
@@ -247,7 +274,7 @@ class VocAiService:
                     payload_json=payload,
                     schema_version=int(out.schema_version),
                 )
-                return bool(summary), summary
+                return ("ok" if summary else "empty"), summary
             except Exception as e:
                 errors.append(str(e))
                 continue
@@ -257,7 +284,7 @@ class VocAiService:
         if isinstance(payload["meta"], dict):
             payload["meta"]["ai"] = {**ai_meta_base, "status": "failed", "errors": errors[-3:]}
         await VocRepository.upsert_output(db, job_id=int(job_id), module_code=str(module_code), payload_json=payload, schema_version=int(out.schema_version))
-        return False, None
+        return "failed", None
 
     async def summarize_modules(
         self,
@@ -273,19 +300,40 @@ class VocAiService:
         failed = 0
         skipped = 0
 
-        for mc in module_codes:
-            success, _ = await self.summarize_module(db, job_id=int(job_id), module_code=str(mc), model_profile_id=model_profile_id)
-            if success:
+        codes = [str(mc) for mc in module_codes]
+        cfg = get_vconfig()
+
+        # Outputs and evidence for all modules are loaded up front (two queries)
+        # instead of get_output + list_evidence per module.
+        outs = {str(o.module_code): o for o in await VocRepository.get_outputs(db, job_id=int(job_id), module_codes=codes)}
+        ev_by_module: Dict[str, List[Any]] = {}
+        if cfg.enable_llm and outs:
+            ev_rows = await VocRepository.list_evidence_for_modules(
+                db, job_id=int(job_id), module_codes=list(outs.keys()), limit_per_module=self.max_evidence
+            )
+            for r in ev_rows:
+                ev_by_module.setdefault(str(r.module_code), []).append(r)
+
+        for mc in codes:
+            out = outs.get(mc)
+            if out is None:
+                status = None
+            elif not cfg.enable_llm:
+                # Nothing is written; only a previously stored "skipped" is told apart from failed.
+                meta = (out.payload_json or {}).get("meta")
+                ai = meta.get("ai") if isinstance(meta, dict) else None
+                status = "skipped" if isinstance(ai, dict) and ai.get("status") == "skipped" else None
+            else:
+                status, _ = await self._summarize_output(
+                    db, job_id=int(job_id), out=out, ev_rows=ev_by_module.get(mc, []), model_profile_id=model_profile_id
+                )
+
+            if status == "ok":
                 ok += 1
+            elif status == "skipped":
+                skipped += 1
             else:
-                # can be failed or skipped; distinguish by meta in payload (optional)
-                out = await VocRepository.get_output(db, job_id=int(job_id), module_code=str(mc))
-                meta = (out.payload_json or {}).get("meta") if out else None
-                ai = meta.get("ai") if isinstance(meta, dict) else None
-                if isinstance(ai, dict) and ai.get("status") == "skipped":
-                    skipped += 1
-                else:
-                    failed += 1
+                failed += 1
 
         return {"ok": ok, "failed": failed, "skipped": skipped}
 
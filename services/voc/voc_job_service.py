@@ -7,8 +7,9 @@ from __future__ import annotations
 import hashlib
 import json
 import time
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domains.error_domain import AppError
@@ -34,7 +35,15 @@ from services.voc.report_v1_builder import ReportV1Builder
 
 
 def _stable_json(obj: Dict[str, Any]) -> str:
-    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    # Matches json.dumps(ensure_ascii=False, sort_keys=True, separators=(",", ":")) only for
+    # str / int (64-bit) / bool / None / list values, which is all job params contain, so
+    # persisted input_hash values stay stable. Floats are NOT covered: orjson renders e.g. 1e16
+    # as "1e16" where json gives "1e+16", so do not put floats into hashed params.
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+    except orjson.JSONEncodeError:
+        # orjson rejects ints beyond 64 bits; json.dumps (the previous encoder) accepts them.
+        return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
 
 
 def _sha256_hex(s: str) -> str:
@@ -249,27 +258,28 @@ class VocJobService:
 
         last_stage: str | None = None
 
-        async def _persist_module(*, module_code: str, output_payload: Dict[str, Any], schema_version: int, evidence_rows: List[Dict[str, Any]]):
-            await VocRepository.upsert_output(
+        async def _persist_modules(modules: List[Tuple[str, Dict[str, Any], int, List[Dict[str, Any]]]]):
+            # (module_code, payload, schema_version, evidence_rows); outputs and evidence
+            # clearing are written for all modules at once rather than per module.
+            await VocRepository.upsert_outputs(
                 db,
                 job_id=int(job_id),
-                module_code=module_code,
-                payload_json=output_payload,
-                schema_version=int(schema_version),
+                outputs=[(module_code, payload, int(schema_version)) for module_code, payload, schema_version, _ in modules],
             )
-            await VocRepository.clear_evidence(db, job_id=int(job_id), module_code=module_code)
-            ev_items = []
-            for e in evidence_rows or []:
-                ev_items.append(
-                    {
-                        "source_type": e["source_type"],
-                        "source_id": e["source_id"],
-                        "kind": e.get("kind"),
-                        "snippet": e.get("snippet") or "",
-                        "meta_json": e.get("meta_json") or {},
-                    }
-                )
-            await VocRepository.insert_evidence_many(db, job_id=int(job_id), module_code=module_code, items=ev_items)
+            await VocRepository.clear_evidence_for_modules(db, job_id=int(job_id), module_codes=[m[0] for m in modules])
+            for module_code, _, _, evidence_rows in modules:
+                ev_items = []
+                for e in evidence_rows or []:
+                    ev_items.append(
+                        {
+                            "source_type": e["source_type"],
+                            "source_id": e["source_id"],
+                            "kind": e.get("kind"),
+                            "snippet": e.get("snippet") or "",
+                            "meta_json": e.get("meta_json") or {},
+                        }
+                    )
+                await VocRepository.insert_evidence_many(db, job_id=int(job_id), module_code=module_code, items=ev_items)
 
         try:
             # ---------- extracting ----------
@@ -338,7 +348,7 @@ class VocJobService:
             await db.commit()
 
             # compute modules (in-memory)
-            computed: List[tuple[str, Dict[str, Any], int, List[Dict[str, Any]]]] = []
+            computed: List[Tuple[str, Dict[str, Any], int, List[Dict[str, Any]]]] = []
 
             if review_ds is not None:
                 result = ReviewOverviewAnalyzer.compute(ds=review_ds, days_for_trend=30)
@@ -374,8 +384,7 @@ class VocJobService:
             await VocRepository.update_job_status(db, job_id=int(job_id), status=int(VocJobStatus.PERSISTING), stage=last_stage)
             await db.commit()
 
-            for module_code, payload, schema_version, evidence_rows in computed:
-                await _persist_module(module_code=module_code, output_payload=payload, schema_version=schema_version, evidence_rows=evidence_rows)
+            await _persist_modules(computed)
 
             await db.commit()
 
@@ -400,12 +409,7 @@ class VocJobService:
 
             # ---------- build report.v1 (reads outputs/evidence only) ----------
             report = await ReportV1Builder.build(db, job_id=int(job_id))
-            await _persist_module(
-                module_code=report.module_code,
-                output_payload=report.model_dump(),
-                schema_version=int(report.schema_version),
-                evidence_rows=[],
-            )
+            await _persist_modules([(report.module_code, report.model_dump(), int(report.schema_version), [])])
             await db.commit()
 
             # ---------- ai summarizing (report) ----------
@@ -98,9 +98,13 @@ class VocOrchestrator:
         # store pending crawl plan into params_json
         new_params = dict(job.params_json or {})
         new_params["pending_crawl"] = pending
-        await self.repo.update_job_params_json(db, job_id=int(job.job_id), params_json=new_params)
-
-        await self.repo.update_job_status(db, job_id=int(job.job_id), status=int(VocJobStatus.CRAWLING), stage=VocJobStage.crawling.value)
+        await self.repo.update_job_status(
+            db,
+            job_id=int(job.job_id),
+            status=int(VocJobStatus.CRAWLING),
+            stage=VocJobStage.crawling.value,
+            params_json=new_params,
+        )
         vlogger.info("voc job enqueued spider tasks", extra={"job_id": int(job.job_id), "pending": len(pending)})
         return int(job.job_id)
 
@@ -152,16 +156,26 @@ class VocOrchestrator:
         # mark one crawl unit as finished
         params = dict(job.params_json or {})
         pending: List[Dict[str, Any]] = list(params.get("pending_crawl") or [])
+        params_changed = False
         if pending and run_type and scope_type and scope_value:
             pending = [p for p in pending if not (p.get("run_type") == run_type and p.get("scope_type") == scope_type and p.get("scope_value") == scope_value)]
             params["pending_crawl"] = pending
-            await self.repo.update_job_params_json(db, job_id=int(job_id), params_json=params)
+            params_changed = True
 
         if pending:
             # still waiting for other units
+            if params_changed:
+                await self.repo.update_job_params_json(db, job_id=int(job_id), params_json=params)
             return
 
-        await self.repo.update_job_status(db, job_id=int(job_id), status=int(VocJobStatus.EXTRACTING), stage=VocJobStage.extracting.value)
+        # last unit: pending list + status transition in one UPDATE
+        await self.repo.update_job_status(
+            db,
+            job_id=int(job_id),
+            status=int(VocJobStatus.EXTRACTING),
+            stage=VocJobStage.extracting.value,
+            params_json=params if params_changed else None,
+        )
 
     # -----------------------------
     # Internals
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# @Author: yaccii
+# @Description: TextParser 编码识别回归用例
+
+from __future__ import annotations
+
+import pytest
+
+from infrastructures.parsing.text_parser import TextParser
+
+_FR_LONG = (
+    "Très bien, où est le château? Le garçon mange une pomme à côté de la fenêtre. "
+    "Nous étions très contents de voir l'église ce matin."
+)
+_ZH_LONG = "中文测试文本，这是一个比较长的句子。我们今天去公园散步，天气非常好，大家都很开心。"
+_RU_LONG = (
+    "Привет, как дела? Это тестовый текст на русском языке, который должен быть "
+    "достаточно длинным для определения языка. Москва является столицей России."
+)
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (b"caf\xe9 na\xefve", "café naïve"),
+        ("Très bien, où est le château?".encode("cp1252"), "Très bien, où est le château?"),
+        (_FR_LONG.encode("cp1252"), _FR_LONG),
+        ("这是".encode("gbk"), "这是"),
+        (_ZH_LONG.encode("gbk"), _ZH_LONG),
+        (_RU_LONG.encode("cp1251"), _RU_LONG),
+        ("héllo 中文".encode("utf-8"), "héllo 中文"),
+        (b"a\x81 b", "a\x81 b"),
+    ],
+)
+def test_decode_text_without_declared_charset(raw: bytes, expected: str) -> None:
+    assert TextParser._decode_text(raw) == expected
+
+
+def test_decode_text_declared_charset_and_newlines() -> None:
+    assert TextParser._decode_text("über\r\nzwei\rdrei".encode("cp1252"), "cp1252") == "über\nzwei\ndrei"
+
+
+@pytest.mark.parametrize(
+    "raw, content_type, expected",
+    [
+        ("<p>中文 <b>粗</b>体</p>".encode("utf-8"), "text/html", "中文 粗体"),
+        ("<p>你好世界，这是网页</p>".encode("gbk"), "text/html", "你好世界，这是网页"),
+        (
+            '<html><head><meta charset="gbk"></head><body><div>你好<a href="x">世界</a></div>'
+            "<p>第二段<br>换行</p><script>var x = 1;</script></body></html>".encode("gbk"),
+            "text/html",
+            "你好世界\n第二段\n换行",
+        ),
+        ("<p>naïve</p>".encode("cp1252"), "text/html; charset=windows-1252", "naïve"),
+        (
+            '<?xml version="1.0" encoding="utf-8"?><html><body><p>a <em>b</em></p>'
+            "<ul><li>x</li><li>y</li></ul></body></html>".encode("utf-8"),
+            "application/xhtml+xml",
+            "a b\nx\ny",
+        ),
+    ],
+)
+def test_parse_html(tmp_path, raw: bytes, content_type: str, expected: str) -> None:
+    path = tmp_path / "page.html"
+    path.write_bytes(raw)
+    assert TextParser()._parse_sync(str(path), content_type) == expected
@@ -7,14 +7,14 @@ from __future__ import annotations
 import asyncio
 
 from infrastructures.db.orm.orm_base import AsyncSessionFactory, init_db
+from infrastructures.event_loop import install_uvloop
 from infrastructures.db.repository.rag_repository import RagRepository
 from infrastructures.embedding.dummy_embedder import DummyEmbedder
-from infrastructures.index.es_index import ESIndex
-from infrastructures.index.milvus_index import MilvusIndex
+from infrastructures.index.index_router import create_es_index, create_milvus_index
 from infrastructures.parsing.chunker import Chunker
 from infrastructures.parsing.local_parser import LocalParser
 from infrastructures.vconfig import vconfig
-from infrastructures.vlogger import vlogger
+from infrastructures.vlogger import init_logging, vlogger
 from services.rag.ingest_pipeline import IngestPipeline
 from worker.rag_worker import RagWorker
 
@@ -44,13 +44,19 @@ async def main() -> None:
 
     parser = LocalParser()
 
-    chunker = Chunker(max_chars=800, overlap=80)
-
     embedder = DummyEmbedder(dim=int(vconfig.embedding_dim))
     vlogger.info("embedder=%s dim=%s", embedder.__class__.__name__, int(vconfig.embedding_dim))
 
-    es_index = ESIndex()
-    milvus_index = MilvusIndex()
+    # Count tokens with the embedder's own tokenizer when it exposes one.
+    chunker = Chunker(
+        max_chars=800,
+        overlap=80,
+        token_counter=getattr(embedder, "count_tokens", None),
+        dedup=bool(vconfig.chunk_dedup),
+    )
+
+    es_index = create_es_index()
+    milvus_index = create_milvus_index()
 
     pipeline = IngestPipeline(
         repo=repo,
@@ -76,4 +82,6 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    init_logging(vconfig.log_level, fmt=vconfig.log_format)
+    install_uvloop()
     asyncio.run(main())
@@ -7,8 +7,9 @@ from __future__ import annotations
 import asyncio
 
 from infrastructures.db.orm.orm_base import AsyncSessionFactory, init_db
+from infrastructures.event_loop import install_uvloop
 from infrastructures.vconfig import vconfig
-from infrastructures.vlogger import vlogger
+from infrastructures.vlogger import init_logging, vlogger
 from worker.voc_worker import VocWorker
 
 
@@ -28,4 +29,6 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    init_logging(vconfig.log_level, fmt=vconfig.log_format)
+    install_uvloop()
     asyncio.run(main())